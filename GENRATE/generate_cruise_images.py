@@ -1,72 +1,49 @@
-from openai import OpenAI
-import requests, os, re
+import asyncio
+import sys
+
+from image_cache import ImageCache
+from image_engine import OpenAIProvider, make_jobs, print_plan
+from job_queue import JobQueue, drain, enqueue_prompts, generate_kind, worker_name
+from prompts import prompts
 
 # ==========================
 #  CONFIGURATION
 # ==========================
 
-# Paste your API key from https://platform.openai.com/api-keys
-client = OpenAI(api_key="YOUR_API_KEY_HERE")
+# Uses the OPENAI_API_KEY environment variable (https://platform.openai.com/api-keys).
+# To paste your key instead: OpenAIProvider(MODEL, SIZE, api_key="YOUR_API_KEY_HERE")
+MODEL = "gpt-image-1"
+SIZE = "1024x1024"
 
 # Output folder
 output_folder = "cruise_images"
-os.makedirs(output_folder, exist_ok=True)
 
-# Your list of prompts
-prompts = [
-    "Cinematic shot of the Italian Adriatic coastline near Brindisi at golden hour, ancient stone fortifications overlooking deep azure waters, luxurious Explora Journeys cruise ship anchored offshore, warm sunlight, ultra-detailed 8k, photorealistic",
-    "Aerial view of Stockholm archipelago in summer, colorful Gamla Stan buildings reflecting in calm Baltic waters, Oceania Cruises ship navigating narrow channels, soft northern daylight, hyper-realistic, 8k resolution",
-    "Majestic view of Istanbul Bosphorus strait at sunset, silhouette of Hagia Sophia and Blue Mosque minarets against opulent orange sky, Regent Seven Seas ship sailing through, cinematic lighting, highly detailed",
-    "Breathtaking view of Table Mountain looming over Cape Town harbour, bright sunny day with clear blue sky, Azamara luxury cruise ship docked in foreground, vibrant colors, 8k photorealistic",
-    "Ancient stone walls of Dubrovnik Old Town meeting crystal clear Adriatic Sea, sunny midday light, Seabourn luxury yacht anchored off the Dalmatian coast, ultra-sharp details, 8k resolution",
-    "Vibrant colonial architecture of Old San Juan Puerto Rico, colorful streets leading down to the sea, Crystal Cruises ship docked in harbour, tropical bright lighting, photorealistic travel photography style",
-    "Sleek Explora Journeys luxury ship sailing the vast open Atlantic ocean at sunrise, calm waves reflecting orange and pink sky, transition from European coast to Caribbean horizon, cinematic wide shot, 8k",
-    "Lush green cliffs of Madeira island plunging into the deep blue Atlantic ocean, exotic flowers in foreground, Explora Journeys ship approaching Funchal harbour, dramatic natural lighting, ultra-realistic",
-    "Aerial drone shot of the Great Barrier Reef near Cairns, vibrant turquoise coral reefs visible through crystal clear water, Silversea luxury ship navigating the channel, bright tropical sun, 8k highly detailed",
-    "Glamorous French Riviera coastline near Nice, azure sea meeting pebble beaches and Belle Epoque buildings, Explora Journeys ship sailing parallel to coast, soft afternoon Mediterranean light, photorealistic",
-    "Montreal Old Port in peak autumn, vibrant red and orange foliage on trees surrounding historic stone buildings, Oceania cruise ship docked on St. Lawrence River, crisp fall atmosphere, 8k resolution",
-    "Pink sand beaches of Bermuda with jagged rock formations, turquoise clear water, Celebrity Beyond cruise ship anchored in the distance, sunny tropical vibe, hyper-realistic travel photo",
-    "Glitzy Monte Carlo harbour at twilight, hills lined with illuminated luxury villas and casinos, Seabourn cruise ship docked among superyachts, reflections on water, cinematic 8k shot",
-    "Stunning Amalfi Coast cliffside village with colorful houses stacked vertically, Silversea ship anchored in the deep blue Tyrrhenian sea below, warm golden hour sunshine, highly detailed landscape",
-    "Iconic white and blue domed churches of Santorini Greece overlooking the volcanic caldera, Emerald Azzurra luxury yacht anchored in the deep blue bay below, brilliant bright daylight, photorealistic 8k",
-    "Majestic view of the Acropolis in Athens at dusk, ancient Parthenon ruins illuminated against twilight sky, Emerald Azzurra yacht visible in distant Piraeus harbour, dramatic and historical atmosphere",
-    "Meeting of waters in the Amazon delta Brazil, lush dense rainforest shoreline, exotic wildlife, Seabourn expedition ship navigating the wide brown river, humid tropical atmosphere, hyper-realistic",
-    "Vibrant mosaic architecture of Park Güell overlooking Barcelona city and Mediterranean sea, Azamara cruise ship visible in the distant commercial port, sunny Spanish day, ultra-detailed 8k",
-    "Dramatic Chilean fjords with snow-capped mountains and massive blue glaciers meeting icy water, Viking ocean ship sailing through narrow misty passage, atmospheric cold lighting, cinematic shot",
-    "New York City Manhattan skyline with Statue of Liberty in foreground, Crystal Cruises ship sailing out of New York harbour at sunset, city lights beginning to turn on, cinematic cityscape 8k",
-    "Panoramic view of the Bay of Naples with Mount Vesuvius looming in background, Silversea cruise ship sailing across deep blue Italian waters, clear sunny day, photorealistic travel photography",
-    "Breathtaking Bay of Kotor Montenegro, dramatic steep rugged mountains surrounding medieval fortified town, calm fjord-like water reflecting scenery, Regent Seven Seas ship anchored, early morning mist, 8k",
-    "Neoclassical colorful mansions of Syros Greece cascading down hill to the sea, vibrant bougainvillea flowers, Silversea ship in the azure harbour, bright Mediterranean sun, highly detailed",
-    "Exotic Southeast Asian seascape features limestone karsts rising from emerald water, traditional junk boat sailing past a Viking ocean ship, warm humid sunset light, atmospheric and realistic",
-    "Miami South Beach art deco skyline and white sandy beach, turquoise Atlantic ocean, Celebrity Beyond cruise ship sailing out to sea, vibrant sunny tropical day, 8k ultra-realistic"
-]
+# Generated images are kept here, keyed by prompt and model, so unchanged
+# prompts are not paid for again (run with --plan to see what would be generated)
+cache = ImageCache()
 
-# ==========================
-#  GENERATION LOOP
-# ==========================
+# Progress is journaled here; an interrupted run resumes where it stopped
+QUEUE_FILE = "jobs.sqlite3"
 
-for i, prompt in enumerate(prompts, start=1):
-    print(f"🌅 Generating image {i}/{len(prompts)}")
-    
-    # Generate image using DALL·E 3 (ChatGPT)
-    result = client.images.generate(
-        model="gpt-image-1",
-        prompt=prompt,
-        size="1024x1024"
-    )
+# Requests in flight at once, and the account's images-per-minute limit
+CONCURRENCY = 4
+REQUESTS_PER_MINUTE = 5
 
-    # Extract image URL
-    image_url = result.data[0].url
+# ==========================
+#  GENERATION
+# ==========================
 
-    # Clean filename (safe for filesystem)
-    filename = re.sub(r"[^a-zA-Z0-9]+", "_", prompt[:50])
-    file_path = os.path.join(output_folder, f"{filename}.png")
+if __name__ == "__main__":
+    jobs = make_jobs(prompts, output_folder, "openai", MODEL, SIZE, name_length=50)
+    if "--plan" in sys.argv:
+        print_plan(jobs, cache)
+        sys.exit(0)
 
-    # Download the image
-    img_data = requests.get(image_url).content
-    with open(file_path, "wb") as f:
-        f.write(img_data)
-    
-    print(f"✅ Saved → {file_path}")
+    queue = JobQueue(QUEUE_FILE)
+    added = enqueue_prompts(queue, prompts, output_folder, "openai", MODEL, SIZE, name_length=50)
+    retried = queue.retry_failed(generate_kind("openai"))
+    print(f"🌅 Generating {len(jobs)} images ({added} new, {retried} failed last time, {CONCURRENCY} at a time)")
 
-print("\n🎉 All cruise destination images generated successfully!")
+    asyncio.run(drain(queue, OpenAIProvider(MODEL, SIZE), worker_name(), CONCURRENCY, REQUESTS_PER_MINUTE, cache=cache))
+    print("\n" + queue.report())
+    print(f"💾 Cache: {cache.stats}")
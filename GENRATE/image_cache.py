@@ -0,0 +1,190 @@
+"""
+Content-addressed cache of generated images.
+
+Every image is stored under the hash of what produced it (provider, model,
+prompt, size, seed), so an unchanged prompt is never paid for twice and two
+prompts that merely share a prefix can no longer overwrite each other.
+manifest.json records each entry's request, size and last use; when the
+cache grows past its size cap the least recently used images are evicted.
+
+    python image_cache.py stats
+    python image_cache.py evict --max-mb 500
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+from dataclasses import dataclass
+
+DEFAULT_CACHE_DIR = ".image_cache"
+MANIFEST_NAME = "manifest.json"
+
+
+def cache_key(provider, model, prompt, size=None, seed=None):
+    """Hash of everything that determines the generated image."""
+    payload = json.dumps([provider, model, prompt, size, seed], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stored: int = 0
+    evicted: int = 0
+    bytes_reused: int = 0
+
+    def __str__(self):
+        lookups = self.hits + self.misses
+        rate = f"{self.hits / lookups:.0%}" if lookups else "-"
+        return (f"{self.hits} hits, {self.misses} misses ({rate} hit rate), "
+                f"{self.stored} stored, {self.evicted} evicted, "
+                f"{self.bytes_reused / 1024 / 1024:.1f} MB reused")
+
+
+class ImageCache:
+    """Images stored as objects/<key[:2]>/<key>.png, indexed by manifest.json."""
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=None):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self.manifest_path = os.path.join(root, MANIFEST_NAME)
+        self.entries = self.load_manifest()
+        self.changed = set()
+        self.removed = set()
+
+    def load_manifest(self):
+        try:
+            with open(self.manifest_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def object_path(self, key):
+        return os.path.join(self.root, "objects", key[:2], f"{key}.png")
+
+    def total_bytes(self):
+        return sum(entry["bytes"] for entry in self.entries.values())
+
+    def contains(self, key):
+        """True if the image is cached (no stats, no LRU update).
+
+        The object file decides: another process may have stored it since
+        this cache read the manifest.
+        """
+        return os.path.exists(self.object_path(key))
+
+    def get(self, key):
+        """Path of the cached image, or None; counts a hit or miss."""
+        path = self.object_path(key)
+        if not os.path.exists(path):
+            self.stats.misses += 1
+            return None
+        now = time.time()
+        entry = self.entries.setdefault(key, {"bytes": os.path.getsize(path), "created": now})
+        entry["last_used"] = now
+        self.changed.add(key)
+        self.stats.hits += 1
+        self.stats.bytes_reused += entry["bytes"]
+        return self.object_path(key)
+
+    def put(self, key, data, **request):
+        """Store an image with the request that produced it; returns its path."""
+        path = self.object_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        self.entries[key] = dict(request, bytes=len(data), created=now, last_used=now)
+        self.changed.add(key)
+        self.removed.discard(key)
+        self.stats.stored += 1
+        if self.max_bytes is not None:
+            self.evict(self.max_bytes, keep=key)
+        self.save()
+        return path
+
+    def evict(self, max_bytes, keep=None):
+        """Drop least recently used images until the cache fits in max_bytes."""
+        total = self.total_bytes()
+        for key in sorted(self.entries, key=lambda k: self.entries[k]["last_used"]):
+            if total <= max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self.entries.pop(key)["bytes"]
+            self.removed.add(key)
+            self.changed.discard(key)
+            try:
+                os.remove(self.object_path(key))
+            except OSError:
+                pass
+            self.stats.evicted += 1
+        return total
+
+    def save(self):
+        """Write the manifest atomically, merged with what other processes saved."""
+        os.makedirs(self.root, exist_ok=True)
+        entries = self.load_manifest()
+        for key in self.removed:
+            entries.pop(key, None)
+        for key in self.changed:
+            entries[key] = self.entries[key]
+        self.entries = entries
+        self.changed.clear()
+        self.removed.clear()
+
+        tmp_path = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(entries, f, indent=1, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+
+def export(cached_path, path):
+    """Place a cached image at an output path (hard link, else copy)."""
+    if os.path.exists(path) and os.path.samefile(cached_path, path):
+        return  # already linked by an earlier run
+    tmp_path = path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        os.link(cached_path, tmp_path)
+    except OSError:
+        shutil.copyfile(cached_path, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the generated image cache")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("stats", help="entries and size per provider/model")
+    evict_parser = subparsers.add_parser("evict", help="drop least recently used images")
+    evict_parser.add_argument("--max-mb", type=float, required=True)
+    args = parser.parse_args()
+
+    cache = ImageCache(args.cache_dir)
+    if args.command == "stats":
+        groups = {}
+        for entry in cache.entries.values():
+            group = groups.setdefault((entry.get("provider"), entry.get("model")), [0, 0])
+            group[0] += 1
+            group[1] += entry["bytes"]
+        for (provider, model), (count, size) in sorted(groups.items()):
+            print(f"  {provider:<8} {model:<28} {count:>5} images {size / 1024 / 1024:>8.1f} MB")
+        print(f"📦 {len(cache.entries)} images, {cache.total_bytes() / 1024 / 1024:.1f} MB in {args.cache_dir}")
+    else:
+        total = cache.evict(int(args.max_mb * 1024 * 1024))
+        cache.save()
+        print(f"🧹 Evicted {cache.stats.evicted} images, {total / 1024 / 1024:.1f} MB left")
+
+
+if __name__ == "__main__":
+    main()
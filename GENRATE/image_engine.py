@@ -0,0 +1,348 @@
+"""
+Concurrent, rate-limited image generation engine.
+
+Runs prompts through an image provider (Gemini or OpenAI) with a bounded
+number of requests in flight, a token bucket holding the request rate
+under the account limit, and retry with exponential backoff for rate-limit
+and transient server errors. Every prompt is tracked as a Job with its own
+status, so one failure no longer aborts the batch. With an ImageCache,
+prompts generated before are served from the cache instead of the API, and
+--plan lists what a run would actually pay for.
+
+Point --base-url at stub_image_server.py to exercise the engine without
+paying for real generations:
+
+    python stub_image_server.py --port 8765 --fail-rate 0.2
+    python image_engine.py --provider openai --base-url http://127.0.0.1:8765/v1 --api-key stub
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import re
+import sys
+import time
+from dataclasses import dataclass
+
+import httpx
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+from image_cache import DEFAULT_CACHE_DIR, ImageCache, cache_key, export
+
+# =====================================================
+#  DEFAULTS
+# =====================================================
+
+DEFAULT_CONCURRENCY = 4
+DEFAULT_RPM = 20            # requests per minute allowed by the account tier
+DEFAULT_BURST = 2
+DEFAULT_RETRIES = 4
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+PROVIDER_DEFAULTS = {
+    "gemini": {"model": "gemini-2.5-flash-image", "output": "gemini_generated_images"},
+    "openai": {"model": "gpt-image-1", "output": "cruise_images"},
+}
+
+
+class NoImageError(Exception):
+    """The provider answered, but without an image (e.g. a text refusal)."""
+
+
+def safe_filename(text, length=60):
+    """Create a filesystem-safe filename from a prompt."""
+    return re.sub(r"[^a-zA-Z0-9]+", "_", text[:length]).strip("_")
+
+
+def is_retryable(exc):
+    """Rate limits, timeouts, 5xx and dropped connections are worth retrying."""
+    # httpx.HTTPStatusError (raise_for_status) keeps the status on its response
+    status = (getattr(exc, "status_code", None) or getattr(exc, "code", None)
+              or getattr(getattr(exc, "response", None), "status_code", None))
+    if isinstance(status, int):
+        return status in RETRYABLE_STATUS
+    if isinstance(exc, (httpx.TransportError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    # openai.APIConnectionError / APITimeoutError wrap the httpx error
+    return isinstance(exc.__cause__, httpx.TransportError)
+
+
+# =====================================================
+#  RATE LIMITING
+# =====================================================
+
+class TokenBucket:
+    """Allows `rate` acquisitions per second on average, bursting up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self.lock:  # waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+# =====================================================
+#  PROVIDERS
+# =====================================================
+
+class OpenAIProvider:
+    """OpenAI Images API (gpt-image-1 / dall-e-3)."""
+
+    name = "openai"
+
+    def __init__(self, model, size="1024x1024", seed=None, base_url=None, api_key=None, timeout=120):
+        from openai import AsyncOpenAI
+
+        # Retries are done by the engine so they share the rate limiter
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0, timeout=timeout)
+        self.http = httpx.AsyncClient(timeout=timeout, follow_redirects=True)
+        self.model = model
+        self.size = size
+        self.seed = seed  # the Images API has no seed; it only tells cache entries apart
+
+    async def generate(self, prompt):
+        result = await self.client.images.generate(model=self.model, prompt=prompt, size=self.size)
+        image = result.data[0]
+        if image.b64_json:
+            return base64.b64decode(image.b64_json)
+        if not image.url:
+            raise NoImageError("Response had neither b64_json nor url")
+        response = await self.http.get(image.url)
+        response.raise_for_status()
+        return response.content
+
+    async def aclose(self):
+        await self.client.close()
+        await self.http.aclose()
+
+
+class GeminiProvider:
+    """Gemini image models through google-genai."""
+
+    name = "gemini"
+
+    def __init__(self, model, size=None, seed=None, base_url=None, api_key=None, timeout=120):
+        from google import genai
+        from google.genai import types
+
+        http_options = types.HttpOptions(base_url=base_url, timeout=timeout * 1000)  # timeout in ms
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+        self.config = types.GenerateContentConfig(seed=seed) if seed is not None else None
+        self.model = model
+        self.size = None  # Gemini picks the image size
+        self.seed = seed
+
+    async def generate(self, prompt):
+        response = await self.client.aio.models.generate_content(
+            model=self.model, contents=[prompt], config=self.config
+        )
+        for part in response.parts or []:
+            if getattr(part, "inline_data", None):
+                return part.inline_data.data
+        text_reply = "".join(getattr(p, "text", "") or "" for p in response.parts or [])
+        raise NoImageError(f"No image returned (text response): {text_reply[:200]}")
+
+    async def aclose(self):
+        pass
+
+
+PROVIDERS = {"openai": OpenAIProvider, "gemini": GeminiProvider}
+
+
+# =====================================================
+#  JOBS
+# =====================================================
+
+@dataclass
+class Job:
+    """One prompt to generate and where its image goes."""
+    index: int
+    prompt: str
+    path: str
+    key: str = ""               # cache key of the request
+    status: str = "pending"     # pending, running, retrying, done, cached, failed
+    attempts: int = 0
+    error: str = ""
+    seconds: float = 0.0
+
+
+def make_jobs(prompts, output_folder, provider, model, size=None, seed=None, name_length=60):
+    """One Job per prompt, saved as <safe prompt prefix>_<key>.png in output_folder.
+
+    The key suffix keeps prompts that share their first characters apart.
+    """
+    jobs = []
+    for i, prompt in enumerate(prompts, start=1):
+        key = cache_key(provider, model, prompt, size, seed)
+        filename = f"{safe_filename(prompt, name_length)}_{key[:8]}.png"
+        jobs.append(Job(i, prompt, os.path.join(output_folder, filename), key))
+    return jobs
+
+
+def plan(jobs, cache):
+    """Jobs a run would actually send to the provider."""
+    return [job for job in jobs if cache is None or not cache.contains(job.key)]
+
+
+def print_plan(jobs, cache):
+    todo = plan(jobs, cache)
+    for job in todo:
+        print(f"  🆕 {job.index:>3}. {job.prompt[:70]}...")
+    print(f"\n📋 {len(todo)} to generate, {len(jobs) - len(todo)} already cached")
+
+
+def write_image(path, data):
+    """Write atomically so an interrupted run never leaves a half image."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+async def run_job(job, provider, limiter, bucket, retries, total, cache):
+    if cache is not None:
+        cached_path = cache.get(job.key)
+        if cached_path:
+            export(cached_path, job.path)
+            job.status = "cached"
+            print(f"💾 [{job.index}/{total}] Cached: {job.path}")
+            return
+
+    async with limiter:
+        job.status = "running"
+        start = time.monotonic()
+
+        def before_sleep(retry_state):
+            job.status = "retrying"
+            exc = retry_state.outcome.exception()
+            print(f"🔁 [{job.index}/{total}] attempt {job.attempts} failed ({exc.__class__.__name__}), "
+                  f"retrying in {retry_state.next_action.sleep:.1f}s")
+
+        try:
+            async for attempt in AsyncRetrying(
+                stop=stop_after_attempt(retries + 1),
+                wait=wait_exponential_jitter(initial=1, max=60),
+                retry=retry_if_exception(is_retryable),
+                before_sleep=before_sleep,
+                reraise=True,
+            ):
+                with attempt:
+                    await bucket.acquire()
+                    job.attempts += 1
+                    job.status = "running"
+                    data = await provider.generate(job.prompt)
+            if not data:
+                raise NoImageError("Empty image")
+            if cache is not None:
+                cached_path = cache.put(job.key, data, provider=provider.name, model=provider.model,
+                                        prompt=job.prompt, size=provider.size, seed=provider.seed)
+                export(cached_path, job.path)
+            else:
+                write_image(job.path, data)
+            job.status = "done"
+            print(f"✅ [{job.index}/{total}] Saved: {job.path}")
+        except Exception as e:
+            job.status = "failed"
+            job.error = f"{e.__class__.__name__}: {e}"
+            print(f"❌ [{job.index}/{total}] {job.error[:200]}")
+        finally:
+            job.seconds = time.monotonic() - start
+
+
+async def run_jobs(jobs, provider, concurrency=DEFAULT_CONCURRENCY, rpm=DEFAULT_RPM,
+                   burst=DEFAULT_BURST, retries=DEFAULT_RETRIES, cache=None):
+    """Run all jobs, serving cached images where possible; returns the jobs."""
+    limiter = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rpm / 60, burst)
+    for job in jobs:
+        os.makedirs(os.path.dirname(job.path) or ".", exist_ok=True)
+    try:
+        await asyncio.gather(*(run_job(job, provider, limiter, bucket, retries, len(jobs), cache) for job in jobs))
+    finally:
+        await provider.aclose()
+        if cache is not None:
+            cache.save()  # records last use of cache hits for LRU eviction
+    return jobs
+
+
+def print_summary(jobs, elapsed, cache=None):
+    done = [job for job in jobs if job.status in ("done", "cached")]
+    failed = [job for job in jobs if job.status == "failed"]
+    retried = sum(1 for job in jobs if job.attempts > 1)
+    print("\n" + "=" * 60)
+    print(f"🎉 {len(done)}/{len(jobs)} images in {elapsed:.1f}s "
+          f"({retried} needed retries, {len(failed)} failed)")
+    if cache is not None:
+        print(f"💾 Cache: {cache.stats}")
+    for job in failed:
+        print(f"   ❌ {job.index}: {job.prompt[:50]}... — {job.error[:120]}")
+
+
+# =====================================================
+#  COMMAND LINE
+# =====================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate destination images concurrently")
+    parser.add_argument("--provider", choices=sorted(PROVIDERS), default="gemini")
+    parser.add_argument("--model", help="model name (default depends on provider)")
+    parser.add_argument("--size", default="1024x1024", help="image size (OpenAI only)")
+    parser.add_argument("--seed", type=int, help="generation seed (Gemini only; part of the cache key)")
+    parser.add_argument("--output", help="output folder (default depends on provider)")
+    parser.add_argument("--prompts-file", help="one prompt per line (default: prompts.py)")
+    parser.add_argument("--limit", type=int, help="only the first N prompts")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--rpm", type=float, default=DEFAULT_RPM, help="requests per minute")
+    parser.add_argument("--burst", type=int, default=DEFAULT_BURST)
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    parser.add_argument("--base-url", help="provider API base URL (e.g. the stub server)")
+    parser.add_argument("--api-key", help="API key (default: provider environment variable)")
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--cache-max-mb", type=float, help="evict least recently used images past this size")
+    parser.add_argument("--no-cache", action="store_true", help="always call the provider")
+    parser.add_argument("--plan", action="store_true", help="list what would be generated, then stop")
+    args = parser.parse_args()
+
+    if args.prompts_file:
+        with open(args.prompts_file, encoding="utf-8") as f:
+            prompts = [line.strip() for line in f if line.strip()]
+    else:
+        from prompts import prompts
+    prompts = prompts[:args.limit] if args.limit else prompts
+
+    defaults = PROVIDER_DEFAULTS[args.provider]
+    model = args.model or defaults["model"]
+    size = args.size if args.provider == "openai" else None
+    jobs = make_jobs(prompts, args.output or defaults["output"], args.provider, model, size, args.seed)
+    max_bytes = int(args.cache_max_mb * 1024 * 1024) if args.cache_max_mb else None
+    cache = None if args.no_cache else ImageCache(args.cache_dir, max_bytes)
+
+    if args.plan:
+        print_plan(jobs, cache)
+        return
+
+    provider = PROVIDERS[args.provider](model, size=args.size, seed=args.seed,
+                                        base_url=args.base_url, api_key=args.api_key)
+    print(f"🌅 Generating {len(jobs)} images with {args.provider} "
+          f"({args.concurrency} at a time, {args.rpm:g}/min)")
+    start = time.monotonic()
+    asyncio.run(run_jobs(jobs, provider, args.concurrency, args.rpm, args.burst, args.retries, cache))
+    print_summary(jobs, time.monotonic() - start, cache)
+    sys.exit(1 if any(job.status == "failed" for job in jobs) else 0)
+
+
+if __name__ == "__main__":
+    main()
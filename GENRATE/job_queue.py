@@ -0,0 +1,438 @@
+"""
+Durable, resumable job queue for image generation batches.
+
+Jobs live in a SQLite journal (jobs.sqlite3) with a status of pending,
+running, done or failed, so a batch that dies at prompt 17 carries on from
+prompt 17: finished jobs are never repeated. Jobs that were running when
+a worker died go back to pending as soon as a worker on the same host
+starts and finds that process gone; jobs of workers on other hosts are
+handed out again once their lease (renewed by a heartbeat while the worker
+is alive) runs out. Several worker processes can drain the same queue;
+each claim is a single transaction, so no job is given to two workers.
+
+Besides generate/<provider> jobs the queue holds download jobs, fetched in
+batches by image_downloader.download_all.
+
+    python job_queue.py enqueue --provider openai
+    python job_queue.py work --provider openai --processes 2
+    python job_queue.py enqueue-downloads urls.txt --output ../images/deals
+    python job_queue.py download --processes 2
+    python job_queue.py report
+    python job_queue.py retry-failed
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+from image_cache import DEFAULT_CACHE_DIR, ImageCache
+from image_engine import (
+    DEFAULT_BURST, DEFAULT_CONCURRENCY, DEFAULT_RETRIES, DEFAULT_RPM,
+    PROVIDER_DEFAULTS, PROVIDERS, Job, TokenBucket, make_jobs, run_job,
+)
+
+# image_downloader.py lives with the site tools one folder up
+SITE_TOOLS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFAULT_QUEUE = "jobs.sqlite3"
+DEFAULT_LEASE = 90          # seconds without a heartbeat before a running job counts as abandoned
+MAX_CLAIMS = 3              # claims before an abandoned job is marked failed
+DOWNLOAD_KIND = "download"
+DOWNLOAD_CONCURRENCY = 16   # downloads in flight per worker process
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id          INTEGER PRIMARY KEY,
+    kind        TEXT NOT NULL,          -- e.g. generate/openai
+    key         TEXT NOT NULL UNIQUE,   -- cache key; enqueueing twice is a no-op
+    payload     TEXT NOT NULL,          -- JSON
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    worker      TEXT,
+    error       TEXT,
+    created_at  REAL NOT NULL,
+    started_at  REAL,
+    lease_until REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_claim ON jobs (kind, status, id);
+"""
+
+
+class JobQueue:
+    """SQLite-backed queue shared by any number of worker processes."""
+
+    def __init__(self, path=DEFAULT_QUEUE):
+        self.path = path
+        # Autocommit; claims open their own IMMEDIATE transaction
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def enqueue(self, kind, key, payload):
+        """Add a job unless one with the same key exists; returns True if added."""
+        cursor = self.db.execute(
+            "INSERT OR IGNORE INTO jobs (kind, key, payload, created_at) VALUES (?, ?, ?, ?)",
+            (kind, key, json.dumps(payload, ensure_ascii=False), time.time()),
+        )
+        return cursor.rowcount == 1
+
+    def claim(self, kind, worker, lease=DEFAULT_LEASE):
+        """Atomically take the next pending (or abandoned) job; None when drained."""
+        while True:
+            now = time.time()
+            self.db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self.db.execute(
+                    "SELECT * FROM jobs WHERE kind = ? AND (status = 'pending' "
+                    "OR (status = 'running' AND lease_until < ?)) ORDER BY id LIMIT 1",
+                    (kind, now),
+                ).fetchone()
+                if row is None:
+                    self.db.execute("COMMIT")
+                    return None
+                if row["attempts"] >= MAX_CLAIMS:
+                    self.db.execute(
+                        "UPDATE jobs SET status = 'failed', error = ?, finished_at = ? WHERE id = ?",
+                        (f"Abandoned: worker {row['worker']} stopped {row['attempts']} times", now, row["id"]),
+                    )
+                    self.db.execute("COMMIT")
+                    continue
+                self.db.execute(
+                    "UPDATE jobs SET status = 'running', worker = ?, attempts = attempts + 1, "
+                    "started_at = ?, lease_until = ?, error = NULL WHERE id = ?",
+                    (worker, now, now + lease, row["id"]),
+                )
+                self.db.execute("COMMIT")
+                return row
+            except BaseException:
+                self.db.execute("ROLLBACK")
+                raise
+
+    def requeue_orphans(self):
+        """Put jobs whose worker process has exited back to pending; returns how many.
+
+        Only workers on this host can be checked; the others keep their lease.
+        The claim count is kept, so a job that keeps killing its worker still
+        ends up failed after MAX_CLAIMS.
+        """
+        rows = self.db.execute("SELECT DISTINCT worker FROM jobs WHERE status = 'running'").fetchall()
+        requeued = 0
+        for (worker,) in rows:
+            if worker_alive(worker):
+                continue
+            requeued += self.db.execute(
+                "UPDATE jobs SET status = 'pending', lease_until = NULL, "
+                "error = 'Requeued: worker ' || worker || ' exited' WHERE worker = ? AND status = 'running'",
+                (worker,),
+            ).rowcount
+        return requeued
+
+    def renew(self, worker, lease=DEFAULT_LEASE):
+        """Extend the leases of every job this worker is running."""
+        self.db.execute(
+            "UPDATE jobs SET lease_until = ? WHERE worker = ? AND status = 'running'",
+            (time.time() + lease, worker),
+        )
+
+    def finish(self, job_id, worker, status, error=None):
+        """Record a job's outcome, unless its lease was handed to another worker."""
+        self.db.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished_at = ?, lease_until = NULL "
+            "WHERE id = ? AND worker = ? AND status = 'running'",
+            (status, error, time.time(), job_id, worker),
+        )
+
+    def retry_failed(self, kind=None):
+        """Put failed jobs back to pending; returns how many."""
+        query = "UPDATE jobs SET status = 'pending', attempts = 0 WHERE status = 'failed'"
+        params = ()
+        if kind:
+            query += " AND kind = ?"
+            params = (kind,)
+        return self.db.execute(query, params).rowcount
+
+    def counts(self, kind=None):
+        query = "SELECT status, COUNT(*) FROM jobs"
+        params = ()
+        if kind:
+            query += " WHERE kind = ?"
+            params = (kind,)
+        return dict(self.db.execute(query + " GROUP BY status", params).fetchall())
+
+    def report(self):
+        """Throughput, per-worker totals and failure causes."""
+        rows = self.db.execute("SELECT * FROM jobs").fetchall()
+        done = [row for row in rows if row["status"] == "done"]
+        failed = [row for row in rows if row["status"] == "failed"]
+
+        lines = [f"📊 {self.path}: " + ", ".join(f"{count} {status}" for status, count in sorted(self.counts().items()))]
+        if done:
+            window = max(row["finished_at"] for row in done) - min(row["started_at"] for row in done)
+            durations = sorted(row["finished_at"] - row["started_at"] for row in done)
+            rate = len(done) / window * 60 if window > 0 else float("inf")
+            lines.append(f"⏱️  {len(done)} done in {window:.0f}s ({rate:.1f}/min), "
+                         f"median {durations[len(durations) // 2]:.1f}s, max {durations[-1]:.1f}s per job")
+            retried = sum(1 for row in done if row["attempts"] > 1)
+            if retried:
+                lines.append(f"🔁 {retried} done jobs needed more than one claim")
+            for worker, count in Counter(row["worker"] for row in done).most_common():
+                lines.append(f"   👷 {worker}: {count} done")
+        if failed:
+            lines.append("❌ Failure causes:")
+            causes = Counter((row["error"] or "unknown").split(":")[0] for row in failed)
+            for cause, count in causes.most_common():
+                lines.append(f"   {count:>4} × {cause}")
+        return "\n".join(lines)
+
+
+# =====================================================
+#  GENERATION JOBS
+# =====================================================
+
+def generate_kind(provider):
+    return f"generate/{provider}"
+
+
+def enqueue_prompts(queue, prompts, output_folder, provider, model, size=None, seed=None, name_length=60):
+    """Queue one generation job per prompt; returns how many were new."""
+    added = 0
+    for job in make_jobs(prompts, output_folder, provider, model, size, seed, name_length):
+        payload = {"prompt": job.prompt, "path": job.path, "model": model, "size": size, "seed": seed}
+        added += queue.enqueue(generate_kind(provider), job.key, payload)
+    return added
+
+
+async def keep_leases(queue, worker):
+    """Heartbeat: renew this worker's leases until cancelled."""
+    while True:
+        await asyncio.sleep(DEFAULT_LEASE / 3)
+        queue.renew(worker)
+
+
+async def drain(queue, provider, worker, concurrency=DEFAULT_CONCURRENCY, rpm=DEFAULT_RPM,
+                burst=DEFAULT_BURST, retries=DEFAULT_RETRIES, cache=None):
+    """Claim and run generation jobs until the queue has none left for this provider."""
+    kind = generate_kind(provider.name)
+    requeued = queue.requeue_orphans()
+    if requeued:
+        print(f"🔁 {requeued} jobs of exited workers back in the queue")
+    limiter = asyncio.Semaphore(concurrency)
+    bucket = TokenBucket(rpm / 60, burst)
+    total = sum(queue.counts(kind).values())
+
+    async def lane():
+        while True:
+            row = queue.claim(kind, worker)
+            if row is None:
+                return
+            payload = json.loads(row["payload"])
+            if (payload["model"], payload["size"], payload["seed"]) != (provider.model, provider.size, provider.seed):
+                queue.finish(row["id"], worker, "failed", "ConfigMismatch: job was queued for "
+                             f"{payload['model']} {payload['size']} seed={payload['seed']}")
+                continue
+            os.makedirs(os.path.dirname(payload["path"]) or ".", exist_ok=True)
+            job = Job(row["id"], payload["prompt"], payload["path"], row["key"])
+            await run_job(job, provider, limiter, bucket, retries, total, cache)
+            status = "failed" if job.status == "failed" else "done"
+            queue.finish(row["id"], worker, status, job.error or None)
+
+    beat = asyncio.create_task(keep_leases(queue, worker))
+    try:
+        await asyncio.gather(*(lane() for _ in range(concurrency)))
+    finally:
+        beat.cancel()
+        await provider.aclose()
+        if cache is not None:
+            cache.save()
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def worker_alive(worker):
+    """False only for a worker on this host whose process no longer exists."""
+    host, _, pid = (worker or "").rpartition(":")
+    if host != socket.gethostname() or not pid.isdigit() or os.name == "nt":
+        return True  # can't tell (and os.kill(pid, 0) terminates processes on Windows)
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass  # exists, owned by another user
+    try:
+        # A killed worker nobody has reaped yet is a zombie, which os.kill can still signal
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as f:
+            return f.read().rpartition(")")[2].split()[0] != "Z"
+    except (OSError, IndexError):
+        return True
+
+
+def work_process(args):
+    """Entry point of one worker process."""
+    queue = JobQueue(args.queue)
+    defaults = PROVIDER_DEFAULTS[args.provider]
+    provider = PROVIDERS[args.provider](args.model or defaults["model"], size=args.size, seed=args.seed,
+                                        base_url=args.base_url, api_key=args.api_key)
+    cache = None if args.no_cache else ImageCache(args.cache_dir)
+    worker = worker_name()
+    print(f"👷 {worker} working on {generate_kind(args.provider)}")
+    asyncio.run(drain(queue, provider, worker, args.concurrency, args.rpm / args.processes,
+                      args.burst, args.retries, cache))
+    queue.close()
+
+
+# =====================================================
+#  DOWNLOAD JOBS
+# =====================================================
+
+def enqueue_downloads(queue, items):
+    """Queue one download job per image_downloader.Download; returns how many were new."""
+    added = 0
+    for item in items:
+        added += queue.enqueue(DOWNLOAD_KIND, f"download:{os.path.abspath(item.path)}",
+                               {"url": item.url, "path": item.path})
+    return added
+
+
+async def drain_downloads(queue, worker, concurrency=DOWNLOAD_CONCURRENCY):
+    """Claim download jobs a batch at a time and fetch them with download_all."""
+    sys.path.insert(0, SITE_TOOLS_DIR)
+    from image_downloader import Download, download_all
+
+    requeued = queue.requeue_orphans()
+    if requeued:
+        print(f"🔁 {requeued} jobs of exited workers back in the queue")
+    beat = asyncio.create_task(keep_leases(queue, worker))
+    try:
+        while True:
+            rows = []
+            while len(rows) < concurrency:
+                row = queue.claim(DOWNLOAD_KIND, worker)
+                if row is None:
+                    break
+                rows.append(row)
+            if not rows:
+                return
+            items = [Download(**json.loads(row["payload"])) for row in rows]
+            await download_all(items, concurrency)
+            for row, item in zip(rows, items):
+                failed = item.status == "failed"
+                queue.finish(row["id"], worker, "failed" if failed else "done", item.error if failed else None)
+            print(f"   👷 {worker}: {sum(item.status != 'failed' for item in items)}/{len(items)} downloaded")
+    finally:
+        beat.cancel()
+
+
+def download_process(args):
+    """Entry point of one download worker process."""
+    queue = JobQueue(args.queue)
+    worker = worker_name()
+    print(f"👷 {worker} working on {DOWNLOAD_KIND}")
+    asyncio.run(drain_downloads(queue, worker, args.concurrency))
+    queue.close()
+
+
+def run_processes(target, args):
+    if args.processes == 1:
+        target(args)
+        return
+    processes = [multiprocessing.Process(target=target, args=(args,)) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
+# =====================================================
+#  COMMAND LINE
+# =====================================================
+
+def main():
+    parser = argparse.ArgumentParser(description="Resumable image generation queue")
+    parser.add_argument("--queue", default=DEFAULT_QUEUE, help="SQLite journal file")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_request_options(sub):
+        sub.add_argument("--provider", choices=sorted(PROVIDERS), default="gemini")
+        sub.add_argument("--model", help="model name (default depends on provider)")
+        sub.add_argument("--size", default="1024x1024", help="image size (OpenAI only)")
+        sub.add_argument("--seed", type=int)
+
+    enqueue_parser = subparsers.add_parser("enqueue", help="queue one job per prompt")
+    add_request_options(enqueue_parser)
+    enqueue_parser.add_argument("--prompts-file", help="one prompt per line (default: prompts.py)")
+    enqueue_parser.add_argument("--output", help="output folder (default depends on provider)")
+
+    work_parser = subparsers.add_parser("work", help="run queued jobs until none are left")
+    add_request_options(work_parser)
+    work_parser.add_argument("--processes", type=int, default=1, help="worker processes to start")
+    work_parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="requests in flight per process")
+    work_parser.add_argument("--rpm", type=float, default=DEFAULT_RPM, help="requests per minute, shared by all processes")
+    work_parser.add_argument("--burst", type=int, default=DEFAULT_BURST)
+    work_parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES)
+    work_parser.add_argument("--base-url", help="provider API base URL (e.g. the stub server)")
+    work_parser.add_argument("--api-key")
+    work_parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    work_parser.add_argument("--no-cache", action="store_true")
+
+    downloads_parser = subparsers.add_parser("enqueue-downloads", help="queue one download job per URL")
+    downloads_parser.add_argument("urls", help='file with "url [filename]" per line')
+    downloads_parser.add_argument("--output", default=".", help="folder to save images in")
+
+    download_parser = subparsers.add_parser("download", help="run queued download jobs until none are left")
+    download_parser.add_argument("--processes", type=int, default=1, help="worker processes to start")
+    download_parser.add_argument("--concurrency", type=int, default=DOWNLOAD_CONCURRENCY,
+                                 help="downloads in flight per process")
+
+    subparsers.add_parser("report", help="progress, throughput and failure causes")
+    subparsers.add_parser("retry-failed", help="put failed jobs back in the queue")
+    args = parser.parse_args()
+
+    if args.command == "enqueue":
+        if args.prompts_file:
+            with open(args.prompts_file, encoding="utf-8") as f:
+                prompts = [line.strip() for line in f if line.strip()]
+        else:
+            from prompts import prompts
+        defaults = PROVIDER_DEFAULTS[args.provider]
+        size = args.size if args.provider == "openai" else None
+        queue = JobQueue(args.queue)
+        added = enqueue_prompts(queue, prompts, args.output or defaults["output"], args.provider,
+                                args.model or defaults["model"], size, args.seed)
+        print(f"📥 Queued {added} new jobs ({len(prompts) - added} already in the queue)")
+    elif args.command == "work":
+        if args.provider != "openai":
+            args.size = None
+        run_processes(work_process, args)
+        print("\n" + JobQueue(args.queue).report())
+    elif args.command == "enqueue-downloads":
+        sys.path.insert(0, SITE_TOOLS_DIR)
+        from image_downloader import read_url_list
+        items = read_url_list(args.urls, args.output)
+        added = enqueue_downloads(JobQueue(args.queue), items)
+        print(f"📥 Queued {added} new downloads ({len(items) - added} already in the queue)")
+    elif args.command == "download":
+        run_processes(download_process, args)
+        print("\n" + JobQueue(args.queue).report())
+    elif args.command == "report":
+        print(JobQueue(args.queue).report())
+    else:
+        print(f"🔁 {JobQueue(args.queue).retry_failed()} failed jobs back in the queue")
+
+
+if __name__ == "__main__":
+    main()
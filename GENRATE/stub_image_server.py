@@ -0,0 +1,129 @@
+"""
+Local stand-in for the image provider APIs, for testing image_engine.py.
+
+Answers the OpenAI images endpoint and the Gemini generateContent endpoint
+with a small PNG after an artificial delay, and can be told to return 429s
+and 500s at random. On Ctrl+C or SIGTERM it prints how many requests it
+saw and the most it had in flight at once, to check the engine's limits.
+
+    python stub_image_server.py --port 8765 --latency 1.0 --fail-rate 0.2
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import signal
+import struct
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def make_png(seed_text, size=64):
+    """A solid-colour PNG whose colour depends on the prompt."""
+    r, g, b = hashlib.md5(seed_text.encode()).digest()[:3]
+    row = b"\x00" + bytes([r, g, b]) * size
+    raw = zlib.compress(row * size)
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", raw) + chunk(b"IEND", b"")
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.failures = 0
+
+    def enter(self):
+        with self.lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def leave(self):
+        with self.lock:
+            self.in_flight -= 1
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    options = None
+    stats = Stats()
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_json(self, status, payload, headers=None):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.stats.enter()
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            time.sleep(self.options.latency * random.uniform(0.5, 1.5))
+
+            roll = random.random()
+            if roll < self.options.fail_rate:
+                self.stats.failures += 1
+                error = {"error": {"code": 429, "message": "Rate limit exceeded", "status": "RESOURCE_EXHAUSTED"}}
+                return self.send_json(429, error, {"Retry-After": "1"})
+            if roll < self.options.fail_rate + self.options.error_rate:
+                self.stats.failures += 1
+                return self.send_json(500, {"error": {"code": 500, "message": "Internal error", "status": "INTERNAL"}})
+
+            if self.path.endswith("/images/generations"):
+                image = base64.b64encode(make_png(request.get("prompt", ""))).decode()
+                return self.send_json(200, {"created": int(time.time()), "data": [{"b64_json": image}]})
+
+            if ":generateContent" in self.path:
+                prompt = "".join(part.get("text", "") for content in request.get("contents", [])
+                                 for part in content.get("parts", []))
+                image = base64.b64encode(make_png(prompt)).decode()
+                part = {"inlineData": {"mimeType": "image/png", "data": image}}
+                return self.send_json(200, {"candidates": [{"content": {"role": "model", "parts": [part]}}]})
+
+            self.send_json(404, {"error": {"code": 404, "message": f"Unknown path {self.path}"}})
+        finally:
+            self.stats.leave()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub image provider for testing")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=1.0, help="seconds per request (±50%%)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 500")
+    StubHandler.options = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", StubHandler.options.port), StubHandler)
+    signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+    print(f"🧪 Stub image provider on http://127.0.0.1:{StubHandler.options.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stats = StubHandler.stats
+        print(f"\n{stats.requests} requests, {stats.failures} failed on purpose, "
+              f"max {stats.max_in_flight} in flight")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,19 +4,26 @@ Add pricing sections to the 10 cards that are missing them.
 """
 
 import re
-
-PRICING_DATA = {
-    "A Grand Journey from Barcelona to Miami": {"old": "8900", "new": "8450", "discount": "-5% OFF"},
-    "A Grand Journey from Andalusian Shores to Coral-La": {"old": "7200", "new": "6899", "discount": "-4% OFF"},
-    "Cairns to Darwin": {"old": "5890", "new": "5249", "discount": "-11% OFF"},
-    "A Journey from Cliffs to Cathedrals": {"old": "6300", "new": "5799", "discount": "-8% OFF"},
-    "10-Day Mediterranean Overture": {"old": "5300", "new": "4823", "discount": "-9% OFF"},
-    "Greece, Italy & France Cruise: Athens, Amalfi Coas": {"old": "6800", "new": "6249", "discount": "-8% OFF"},
-    "Chilean Fjords & Scenic Shores": {"old": "8900", "new": "7999", "discount": "-10% OFF"},
-    "Spotlight With Ancestry": {"old": "7200", "new": "6599", "discount": "-8% OFF"},
-    "Athens to Civitavecchia": {"old": "5400", "new": "4949", "discount": "-8% OFF"},
-    "Bangkok, Bali & Beyond": {"old": "8900", "new": "7999", "discount": "-10% OFF"},
-}
+import sys
+
+from card_index import CardIndex
+from deal_pricing import pricing_data_for
+
+CTA_PATTERN = r'<div style="display: grid; grid-template-columns: 1fr auto; gap: \d+px;">\s*<!-- Primary CTA'
+
+# Prices come from deal_pricing.csv
+PRICED_TITLES = [
+    "A Grand Journey from Barcelona to Miami",
+    "A Grand Journey from Andalusian Shores to Coral-La",
+    "Cairns to Darwin",
+    "A Journey from Cliffs to Cathedrals",
+    "10-Day Mediterranean Overture",
+    "Greece, Italy & France Cruise: Athens, Amalfi Coas",
+    "Chilean Fjords & Scenic Shores",
+    "Spotlight With Ancestry",
+    "Athens to Civitavecchia",
+    "Bangkok, Bali & Beyond",
+]
 
 def create_pricing_section(old_price: str, new_price: str, discount: str) -> str:
     """Create the pricing section HTML."""
@@ -57,8 +64,7 @@ def add_pricing_before_cta(content: str, card_title: str, pricing_data: dict) ->
 
     # Find the CTA buttons section after this title
     search_start = title_match.end()
-    cta_pattern = r'<div style="display: grid; grid-template-columns: 1fr auto; gap: \d+px;">\s*<!-- Primary CTA'
-    cta_match = re.search(cta_pattern, content[search_start:search_start+5000])
+    cta_match = re.search(CTA_PATTERN, content[search_start:search_start+5000])
 
     if cta_match:
         insert_pos = search_start + cta_match.start()
@@ -76,23 +82,47 @@ def add_pricing_before_cta(content: str, card_title: str, pricing_data: dict) ->
 
     return content, False
 
+def add_pricing_to_card(card_html: str, pricing_data: dict):
+    """Insert a pricing section before the card's CTA buttons; None if it has none."""
+    cta_match = re.search(CTA_PATTERN, card_html)
+    if not cta_match:
+        return None
+
+    pricing_html = create_pricing_section(
+        pricing_data['old'],
+        pricing_data['new'],
+        pricing_data['discount']
+    )
+    return card_html[:cta_match.start()] + pricing_html + card_html[cta_match.start():]
+
 def main():
     filepath = '/mnt/d/Websites/travel/deals.html'
 
     print("Adding pricing sections to cards...\n")
-    content = read_file(filepath)
+    # Cards are located through the sidecar index and edited in place,
+    # so the page is never rescanned per title
+    cards = CardIndex(filepath)
 
     added_count = 0
     failed_cards = []
 
-    for card_title, pricing_data in PRICING_DATA.items():
-        content, success = add_pricing_before_cta(content, card_title, pricing_data)
-        if success:
+    for card_title, pricing_data in pricing_data_for(PRICED_TITLES).items():
+        entries = cards.find_title(card_title)
+        new_html = None
+        if len(entries) == 1:
+            new_html = add_pricing_to_card(cards.read_card(entries[0]), pricing_data)
+        if new_html is not None:
+            try:
+                cards.replace_card(entries[0], new_html)
+            except ValueError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
             added_count += 1
             print(f"  ✓ Added pricing to: {card_title}")
         else:
             failed_cards.append(card_title)
-            print(f"  ⚠️  Failed to add pricing to: {card_title}")
+            reason = f" ({len(entries)} matching cards)" if len(entries) != 1 else ''
+            print(f"  ⚠️  Failed to add pricing to: {card_title}{reason}")
 
     print(f"\n✓ Successfully added pricing to {added_count} cards")
     if failed_cards:
@@ -100,8 +130,6 @@ def main():
         for card in failed_cards:
             print(f"   - {card}")
 
-    print("\nWriting file...")
-    write_file(filepath, content)
     print("✓ Done!")
 
 if __name__ == '__main__':
@@ -5,13 +5,7 @@ Add full voyage title to the info box for better visibility of long titles
 
 import re
 
-with open('/mnt/d/Websites/travel/deals.html', 'r', encoding='utf-8') as f:
-    html = f.read()
-
-print("🔧 Adding 'Voyage' field to info boxes...")
-
-# Pattern to match h3 with title attribute and subsequent info box
-pattern = r'(<h3[^>]*title="([^"]+)"[^>]*>.*?</h3>.*?<!-- Rich Info Box -->.*?<div style="display: grid; grid-template-columns: repeat\(2, 1fr\); gap: 18px;">)'
+VOYAGE_LABEL_PATTERN = r'<div style="color: #d4af37; font-size: 9px; font-weight: 600; text-transform: uppercase; letter-spacing: 2px; margin-bottom: 8px; opacity: 0\.85; font-family: \'Inter\', sans-serif;">Voyage</div>'
 
 def add_voyage_field(match):
     """Add voyage field to info box"""
@@ -27,13 +21,26 @@ def add_voyage_field(match):
 
     return new_content
 
-updated_html = re.sub(pattern, add_voyage_field, html, flags=re.DOTALL)
+def add_voyage_to_infobox(html):
+    """Add a Voyage row to every info box that follows a titled h3"""
+    # Pattern to match h3 with title attribute and subsequent info box
+    pattern = r'(<h3[^>]*title="([^"]+)"[^>]*>.*?</h3>.*?<!-- Rich Info Box -->.*?<div style="display: grid; grid-template-columns: repeat\(2, 1fr\); gap: 18px;">)'
+
+    return re.sub(pattern, add_voyage_field, html, flags=re.DOTALL)
+
+if __name__ == '__main__':
+    with open('/mnt/d/Websites/travel/deals.html', 'r', encoding='utf-8') as f:
+        html = f.read()
+
+    print("🔧 Adding 'Voyage' field to info boxes...")
+
+    updated_html = add_voyage_to_infobox(html)
 
-# Count how many were updated
-count = len(re.findall(r'<div style="color: #d4af37; font-size: 9px; font-weight: 600; text-transform: uppercase; letter-spacing: 2px; margin-bottom: 8px; opacity: 0.85; font-family: \'Inter\', sans-serif;">Voyage</div>', updated_html))
+    # Count how many were updated
+    count = len(re.findall(VOYAGE_LABEL_PATTERN, updated_html))
 
-with open('/mnt/d/Websites/travel/deals.html', 'w', encoding='utf-8') as f:
-    f.write(updated_html)
+    with open('/mnt/d/Websites/travel/deals.html', 'w', encoding='utf-8') as f:
+        f.write(updated_html)
 
-print(f"✅ Added 'Voyage' field to {count} info boxes!")
-print(f"✅ Full titles now visible in info box below truncated heading")
+    print(f"✅ Added 'Voyage' field to {count} info boxes!")
+    print(f"✅ Full titles now visible in info box below truncated heading")
@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Atomic CSS compaction of inline style attributes
+
+The card generators write every declaration into style="..." on every
+element, so deals.html repeats the same few hundred declarations thousands
+of times. `compact` moves each distinct declaration into one short class
+(._0, ._1, ... most used first) in a <style id="atomic-css"> block at the
+end of <head>, and rewrites the elements to use the classes.
+
+Inline styles outrank every selector, so the extracted rules get that
+precedence back with :not(#_) repeated until their id count beats any
+selector on the page. !important author rules still win, as they did over
+inline styles. Some declarations have to stay inline:
+
+  - !important ones (inline !important beats every author rule)
+  - ones the page's CSS or JS selects on with [style*="..."]
+  - properties the page's scripts read back through element.style
+  - all of an element's declarations when two of them overlap
+    (margin / margin-top, duplicated properties), where their order matters
+
+`verify` recomputes the declarations that reach each element through
+style attributes and atomic classes, before and after, and checks they are
+identical, along with every [style*=...] match. `compact` runs it and
+refuses to write on any difference. `expand` turns a compacted page back
+into inline styles, so the other passes can keep editing cards; compacting
+again starts by expanding.
+
+Usage:
+    python3 atomic_css.py compact deals.html [--output out.html] [--dry-run]
+    python3 atomic_css.py expand deals.html
+    python3 atomic_css.py verify original.html compacted.html
+"""
+
+import argparse
+import html
+import re
+import sys
+import time
+
+from deal_cards import DEALS_FILE
+
+STYLE_BLOCK_ID = 'atomic-css'
+CLASS_PREFIX = '_'
+BUMP = ':not(#_)'  # adds one id to a selector's specificity, matches any element
+
+# A comment, a raw-text element (left alone), or a start tag with its attributes
+TAG_RE = re.compile(
+    r'<!--.*?-->'
+    r'|<(script|style)\b[^>]*>.*?</\1\s*>'
+    r'|<([a-zA-Z][a-zA-Z0-9-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.DOTALL | re.IGNORECASE
+)
+STYLE_ATTR_RE = re.compile(r'(\s)style\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+CLASS_ATTR_RE = re.compile(r'(\s)class\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+RAW_TEXT_RE = re.compile(r'<(script|style)\b[^>]*>(.*?)</\1\s*>', re.DOTALL | re.IGNORECASE)
+ATOMIC_BLOCK_RE = re.compile(r'\n?\s*<style id="' + STYLE_BLOCK_ID + r'">.*?</style>', re.DOTALL)
+ATOMIC_RULE_RE = re.compile(r'\.(' + CLASS_PREFIX + r'[0-9a-z]+)(?::not\(#_\))*\{(.*?)\}(?=\n|$)')
+STYLE_SELECTOR_RE = re.compile(r'\[\s*style\s*([*^$~|]?=)\s*(["\'])(.*?)\2\s*(?:[is]\s*)?\]', re.IGNORECASE)
+# A run of [style...] tests on one compound selector, with its type selector if any
+STYLE_COMPOUND_RE = re.compile(
+    r'(?<![\w.#:-])([a-zA-Z][\w-]*)?((?:\[\s*style\s*[*^$~|]?=\s*(["\']).*?\3\s*(?:[is]\s*)?\])+)',
+    re.IGNORECASE
+)
+JS_STYLE_READ_RE = re.compile(r'\.style\.([a-zA-Z]+)\b(?!\s*=(?!=))')
+IMPORTANT_RE = re.compile(r'\s*!\s*important\s*$', re.IGNORECASE)
+
+# Shorthands whose longhands do not share their name as a prefix
+SHORTHAND_EXTRAS = {
+    'inset': {'top', 'right', 'bottom', 'left'},
+    'gap': {'row-gap', 'column-gap'},
+    'place-items': {'align-items', 'justify-items'},
+    'place-content': {'align-content', 'justify-content'},
+    'place-self': {'align-self', 'justify-self'},
+    'font': {'line-height'},
+    'columns': {'column-width', 'column-count'},
+    'all': None,  # resets everything
+}
+# Name-prefix pairs that do not actually share a longhand
+INDEPENDENT = {
+    ('border', 'border-radius'),
+    ('outline', 'outline-offset'),
+    ('transform', 'transform-origin'),
+    ('transform', 'transform-style'),
+    ('transform', 'transform-box'),
+}
+
+
+def split_declarations(style: str) -> list:
+    """Raw declaration strings of a style attribute (';' inside url() or quotes kept)."""
+    parts = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, char in enumerate(style):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth = max(0, depth - 1)
+        elif char == ';' and depth == 0:
+            parts.append(style[start:i])
+            start = i + 1
+    parts.append(style[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_declaration(raw: str):
+    """(property, value, important) of 'prop: value', or None if malformed."""
+    prop, sep, value = raw.partition(':')
+    prop = prop.strip()
+    if not sep or not prop or not value.strip():
+        return None
+    if not prop.startswith('--'):
+        prop = prop.lower()
+    important = bool(IMPORTANT_RE.search(value))
+    value = IMPORTANT_RE.sub('', value).strip()
+    return prop, ' '.join(value.split()), important
+
+
+def overlaps(a: str, b: str) -> bool:
+    """True if two properties can set the same longhand."""
+    if a == b:
+        return True
+    for short, long in ((a, b), (b, a)):
+        if (short, long) in INDEPENDENT:
+            return False
+        if long.startswith(short + '-') and not short.startswith('--'):
+            return True
+        if short in SHORTHAND_EXTRAS and (SHORTHAND_EXTRAS[short] is None or long in SHORTHAND_EXTRAS[short]):
+            return True
+    return False
+
+
+def camel_to_kebab(name: str) -> str:
+    return re.sub(r'[A-Z]', lambda m: '-' + m.group(0).lower(), name)
+
+
+def attr_value(match) -> str:
+    return match.group(2) if match.group(2) is not None else match.group(3)
+
+
+def base36(n: int) -> str:
+    digits = '0123456789abcdefghijklmnopqrstuvwxyz'
+    out = ''
+    while True:
+        n, r = divmod(n, 36)
+        out = digits[r] + out
+        if not n:
+            return out
+
+
+class PageRules:
+    """What the page's own CSS and JS assume about inline styles."""
+
+    def __init__(self, content: str):
+        raw_text = ''.join(m.group(2) for m in RAW_TEXT_RE.finditer(content)
+                           if 'id="' + STYLE_BLOCK_ID + '"' not in m.group(0)[:40])
+        # Inline handlers (onmouseover="this.style...") count as scripts too
+        handlers = ' '.join(re.findall(r'\son[a-z]+\s*=\s*"([^"]*)"', content))
+        compounds = set()
+        for match in STYLE_COMPOUND_RE.finditer(raw_text + ' ' + handlers):
+            tests = tuple((op, needle) for op, _, needle in STYLE_SELECTOR_RE.findall(match.group(2)))
+            compounds.add(((match.group(1) or '').lower() or None, tests))
+        self.compounds = sorted(compounds, key=lambda c: (c[0] or '', c[1]))
+        self.read_props = {camel_to_kebab(name) for name in JS_STYLE_READ_RE.findall(raw_text + ' ' + handlers)}
+        self.read_props.discard('css-text')
+        self.read_props.discard('set-property')
+        self.max_ids = max_id_specificity(
+            ''.join(m.group(2) for m in RAW_TEXT_RE.finditer(content)
+                    if m.group(1).lower() == 'style' and 'id="' + STYLE_BLOCK_ID + '"' not in m.group(0)[:40]))
+
+    def matches(self, tag: str, style: str) -> tuple:
+        """Which [style...] compounds an element's raw style attribute satisfies."""
+        return tuple((compound_tag is None or compound_tag == tag) and all(test(op, needle, style)
+                                                                           for op, needle in tests)
+                     for compound_tag, tests in self.compounds)
+
+
+def test(op: str, needle: str, style: str) -> bool:
+    """One CSS attribute selector test against a style attribute value."""
+    if op == '*=':
+        return needle in style
+    if op == '^=':
+        return style.startswith(needle)
+    if op == '$=':
+        return style.endswith(needle)
+    if op == '~=':
+        return needle in style.split()
+    if op == '|=':
+        return style == needle or style.startswith(needle + '-')
+    return style == needle
+
+
+def max_id_specificity(css: str) -> int:
+    """Most ids in any selector of a stylesheet."""
+    css = re.sub(r'/\*.*?\*/', '', css, flags=re.DOTALL)
+    css = re.sub(r'"[^"]*"|\'[^\']*\'', '""', css)
+    most = 0
+    for selector in re.findall(r'([^{}]+)\{', css):
+        if selector.strip().startswith('@'):
+            continue
+        for part in selector.split(','):
+            part = re.sub(r'\[[^\]]*\]', '', part)
+            most = max(most, len(re.findall(r'#-?[_a-zA-Z][-\w]*', part)))
+    return most
+
+
+def split_style(tag: str, raw_style: str, rules: PageRules) -> tuple:
+    """(declarations to extract, raw declarations to keep inline) for one element."""
+    raws = split_declarations(raw_style)
+    parsed = [parse_declaration(html.unescape(raw)) for raw in raws]
+    if any(p is None for p in parsed):
+        return [], raws
+
+    keep = set()
+    props = [p[0] for p in parsed]
+    for i, a in enumerate(props):
+        for j in range(i + 1, len(props)):
+            if overlaps(a, props[j]):
+                keep.update((i, j))  # their order matters, so both stay inline, in order
+    for i, (prop, value, important) in enumerate(parsed):
+        if important or prop in rules.read_props:
+            keep.add(i)
+    for (_, tests), matched in zip(rules.compounds, rules.matches(tag, raw_style)):
+        if not matched:
+            continue
+        for op, needle in tests:
+            holders = [i for i, raw in enumerate(raws) if needle in raw]
+            if op != '*=' or not holders:
+                return [], raws  # the selector needs the attribute as written
+            keep.update(holders)
+
+    extract = [(parsed[i][0], parsed[i][1]) for i in range(len(raws)) if i not in keep]
+    return extract, [raws[i] for i in range(len(raws)) if i in keep]
+
+
+def expand(content: str) -> tuple:
+    """Inline the declarations of atomic classes again; returns (content, elements)."""
+    block = ATOMIC_BLOCK_RE.search(content)
+    if not block:
+        return content, 0
+    declarations = {name: body for name, body in ATOMIC_RULE_RE.findall(block.group(0))}
+    content = content[:block.start()] + content[block.end():]
+    expanded = 0
+
+    def replace(match):
+        nonlocal expanded
+        if not match.group(2):
+            return match.group(0)
+        tag = match.group(0)
+        class_match = CLASS_ATTR_RE.search(tag)
+        if not class_match:
+            return tag
+        classes = attr_value(class_match).split()
+        atomic = [c for c in classes if c in declarations]
+        if not atomic:
+            return tag
+        expanded += 1
+        restored = '; '.join(declarations[c] for c in atomic)
+        restored = restored.replace('&', '&amp;').replace('"', '&quot;')
+        rest = ' '.join(c for c in classes if c not in declarations)
+        class_attr = f'{class_match.group(1)}class="{rest}"' if rest else ''
+        if not STYLE_ATTR_RE.search(tag):
+            # The style attribute goes where compact took it from, so
+            # expanding and compacting again gives back the same markup
+            style_attr = f'{" " if rest else class_match.group(1)}style="{restored};"'
+            return tag[:class_match.start()] + class_attr + style_attr + tag[class_match.end():]
+        tag = tag[:class_match.start()] + class_attr + tag[class_match.end():]
+        style_match = STYLE_ATTR_RE.search(tag)
+        inline = attr_value(style_match).strip()
+        value = f"{restored}; {inline}" if inline else f"{restored};"
+        return tag[:style_match.start()] + f'{style_match.group(1)}style="{value}"' + tag[style_match.end():]
+
+    return TAG_RE.sub(replace, content), expanded
+
+
+def compact(content: str) -> tuple:
+    """Returns (compacted content, stats dict)."""
+    if 'data-deferred-css' in content:
+        raise ValueError("page CSS is split into critical/deferred sheets; run critical_css.py join first")
+    content, _ = expand(content)
+    rules = PageRules(content)
+
+    existing = set()
+    for match in CLASS_ATTR_RE.finditer(content):
+        existing.update(c for c in attr_value(match).split() if re.fullmatch(CLASS_PREFIX + r'[0-9a-z]+', c))
+    if existing:
+        raise ValueError(f"page already uses classes like {sorted(existing)[0]}; pick another CLASS_PREFIX")
+
+    # First pass: decide per element, count declarations
+    plans = {}
+    counts = {}
+    stats = {'elements': 0, 'extracted': 0, 'kept': 0}
+    for match in TAG_RE.finditer(content):
+        if not match.group(2):
+            continue
+        style_match = STYLE_ATTR_RE.search(match.group(0))
+        if not style_match:
+            continue
+        extract, keep = split_style(match.group(2).lower(), attr_value(style_match), rules)
+        plans[match.start()] = (extract, keep)
+        stats['elements'] += 1
+        stats['extracted'] += len(extract)
+        stats['kept'] += len(keep)
+        for declaration in extract:
+            counts[declaration] = counts.get(declaration, 0) + 1
+
+    ordered = sorted(counts, key=lambda d: (-counts[d], d))
+    names = {declaration: CLASS_PREFIX + base36(i) for i, declaration in enumerate(ordered)}
+    bump = BUMP * (rules.max_ids + 1)
+
+    def replace(match):
+        plan = plans.get(match.start())
+        if not plan or not plan[0]:
+            return match.group(0)
+        extract, keep = plan
+        tag = match.group(0)
+        style_match = STYLE_ATTR_RE.search(tag)
+        style_attr = f'{style_match.group(1)}style="{"; ".join(keep)};"' if keep else ''
+        new_classes = ' '.join(names[d] for d in extract)
+        if not CLASS_ATTR_RE.search(tag):
+            # The classes take the style attribute's place (see expand)
+            class_attr = f'{" " if keep else style_match.group(1)}class="{new_classes}"'
+            return tag[:style_match.start()] + style_attr + class_attr + tag[style_match.end():]
+        tag = tag[:style_match.start()] + style_attr + tag[style_match.end():]
+        class_match = CLASS_ATTR_RE.search(tag)
+        value = f"{attr_value(class_match).strip()} {new_classes}".strip()
+        return tag[:class_match.start()] + f'{class_match.group(1)}class="{value}"' + tag[class_match.end():]
+
+    compacted = TAG_RE.sub(replace, content)
+    css = '\n'.join(f".{names[d]}{bump}{{{d[0]}: {d[1]}}}" for d in ordered)
+    block = f'\n    <style id="{STYLE_BLOCK_ID}">\n{css}\n    </style>\n'
+    head_end = compacted.find('</head>')
+    if head_end < 0:
+        raise ValueError("no </head> to put the atomic stylesheet in")
+    compacted = compacted[:head_end].rstrip() + block + compacted[head_end:]
+    stats['classes'] = len(ordered)
+    return compacted, stats
+
+
+def effective_styles(content: str) -> list:
+    """(tag, declarations, style-selector matches) per start tag, through inline + atomic rules."""
+    rules = PageRules(content)
+    block = ATOMIC_BLOCK_RE.search(content)
+    atomic = {}
+    bump_ids = None
+    if block:
+        for order, (name, body) in enumerate(ATOMIC_RULE_RE.findall(block.group(0))):
+            atomic[name] = (order, parse_declaration(body))
+        bump_ids = min((rule.count(BUMP) for rule in block.group(0).splitlines() if rule.startswith('.')),
+                       default=None)
+        content = content[:block.start()] + content[block.end():]
+
+    elements = []
+    for match in TAG_RE.finditer(content):
+        if not match.group(2):
+            continue
+        tag = match.group(0)
+        declared = {}
+        class_match = CLASS_ATTR_RE.search(tag)
+        classes = attr_value(class_match).split() if class_match else []
+        for order, (prop, value, important) in sorted(atomic[c] for c in classes if c in atomic):
+            declared[prop] = (value, important)
+        style_match = STYLE_ATTR_RE.search(tag)
+        raw_style = attr_value(style_match) if style_match else ''
+        for raw in split_declarations(raw_style):
+            parsed = parse_declaration(html.unescape(raw))
+            if parsed is None:
+                continue
+            prop, value, important = parsed
+            if prop in declared and declared[prop][1] and not important:
+                continue  # an earlier !important wins
+            declared[prop] = (value, important)
+        elements.append((match.group(2).lower(), declared, rules.matches(match.group(2).lower(), raw_style)))
+    return elements, bump_ids, rules.max_ids
+
+
+def verify(original: str, compacted: str) -> list:
+    """Differences between what reaches each element before and after."""
+    before, _, _ = effective_styles(original)
+    after, bump_ids, max_ids = effective_styles(compacted)
+    problems = []
+    if bump_ids is not None and bump_ids <= max_ids:
+        problems.append(f"atomic rules carry {bump_ids} ids, page selectors up to {max_ids}")
+    if len(before) != len(after):
+        return problems + [f"element count changed: {len(before)} -> {len(after)}"]
+    for index, ((tag_a, decl_a, match_a), (tag_b, decl_b, match_b)) in enumerate(zip(before, after)):
+        if tag_a != tag_b:
+            problems.append(f"element {index}: <{tag_a}> became <{tag_b}>")
+            break
+        if decl_a != decl_b:
+            diff = sorted(set(decl_a.items()) ^ set(decl_b.items()))
+            problems.append(f"element {index} <{tag_a}>: {diff[:3]}")
+        if match_a != match_b:
+            problems.append(f"element {index} <{tag_a}>: [style*=...] matches changed")
+    return problems
+
+
+def read(path: str) -> str:
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    compact_parser = subparsers.add_parser('compact', help='move inline declarations into atomic classes')
+    compact_parser.add_argument('html', nargs='?', default=DEALS_FILE)
+    compact_parser.add_argument('--output', help='write here instead of overwriting the page')
+    compact_parser.add_argument('--dry-run', action='store_true')
+    expand_parser = subparsers.add_parser('expand', help='inline atomic classes again')
+    expand_parser.add_argument('html', nargs='?', default=DEALS_FILE)
+    expand_parser.add_argument('--output')
+    verify_parser = subparsers.add_parser('verify', help='compare effective inline styles of two pages')
+    verify_parser.add_argument('original')
+    verify_parser.add_argument('compacted')
+    args = parser.parse_args()
+
+    if args.command == 'verify':
+        problems = verify(read(args.original), read(args.compacted))
+        for problem in problems[:20]:
+            print(f"  ❌ {problem}")
+        print("✅ Styles identical" if not problems else f"❌ {len(problems)} differences")
+        sys.exit(1 if problems else 0)
+
+    content = read(args.html)
+    if args.command == 'expand':
+        new_content, count = expand(content)
+        print(f"✅ {count} elements back to inline styles")
+    else:
+        start = time.perf_counter()
+        new_content, stats = compact(content)
+        elapsed = time.perf_counter() - start
+        problems = verify(content, new_content)
+        if problems:
+            for problem in problems[:20]:
+                print(f"  ❌ {problem}")
+            print(f"❌ {len(problems)} differences in computed styles - nothing written")
+            sys.exit(1)
+        before, after = len(content.encode()), len(new_content.encode())
+        print(f"🎨 {stats['elements']} styled elements: {stats['extracted']} declarations -> "
+              f"{stats['classes']} classes, {stats['kept']} kept inline")
+        print(f"✅ {before / 1024:.0f} KB -> {after / 1024:.0f} KB ({before / after:.1f}x) "
+              f"in {elapsed * 1000:.0f}ms, styles verified")
+        if args.dry_run:
+            return
+
+    with open(args.output or args.html, 'w', encoding='utf-8') as f:
+        f.write(new_content)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark card extraction: single-pass deal_cards vs the legacy per-field regexes
+
+Runs both extractors on deals.html and on a synthetic page of N cards
+(default 10,000) built by cycling the real cards with fresh deal ids.
+A "merged" variant drops every 10th </article> to show what each approach
+does with broken markup.
+"""
+
+import re
+import sys
+import time
+
+from deal_cards import DEALS_FILE, extract_cards
+from generate_all_vertical_cards import parse_deal_card
+
+LEGACY_ARTICLE_RE = re.compile(r'<article[^>]*data-deal-id="([^"]*)"[^>]*>(.*?)</article>', re.DOTALL)
+
+
+def legacy_extract(content: str) -> list:
+    """The extraction loop the apply_*/generate_* scripts run today."""
+    return [parse_deal_card(body, deal_id) for deal_id, body in LEGACY_ARTICLE_RE.findall(content)]
+
+
+def build_synthetic_page(content: str, count: int, drop_every: int = 0) -> str:
+    """Build a page holding count cards cycled from the real ones."""
+    articles = re.findall(r'<article data-deal-id="[^"]*".*?</article>', content, re.DOTALL)
+    parts = ['<html><body><div style="display: grid; gap: 32px;">\n']
+    for i in range(count):
+        article = re.sub(r'data-deal-id="[^"]*"', f'data-deal-id="{i}"', articles[i % len(articles)], count=1)
+        if drop_every and i % drop_every == drop_every - 1:
+            article = article[:-len('</article>')]
+        parts.append(article)
+        parts.append('\n')
+    parts.append('</div></body></html>\n')
+    return ''.join(parts)
+
+
+def timed(func, *args, repeat: int = 1):
+    """Return (best seconds, result) over repeat runs."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def report(label: str, content: str, repeat: int):
+    """Time both extractors on one page and print a comparison line."""
+    new_time, new_cards = timed(extract_cards, content, repeat=repeat)
+    old_time, old_cards = timed(legacy_extract, content, repeat=repeat)
+    size_mb = len(content.encode('utf-8')) / 1024 / 1024
+    print(f"  {label:<28} {size_mb:7.1f} MB | single-pass {new_time * 1000:9.1f} ms "
+          f"({len(new_cards)} cards) | legacy regex {old_time * 1000:9.1f} ms ({len(old_cards)} cards)")
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else DEALS_FILE
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    print("⏱️  Card extraction benchmark\n")
+    report('deals.html', content, repeat=5)
+    report(f'synthetic {count} cards', build_synthetic_page(content, count), repeat=1)
+    report(f'synthetic {count} (merged)', build_synthetic_page(content, count, drop_every=10), repeat=1)
+    print("\nMerged pages: single-pass closes an unclosed card at the next <article>;")
+    print("the legacy pattern folds it into its neighbour, so its card count drops.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Benchmark page for deals pagination: the old showPage() vs deal_pagination.py
+
+Writes a standalone HTML page that loads N synthetic cards (default 5,000)
+into two iframes. One runs the old requery-everything showPage() with its
+console logging, the other the cached, frame-batched script
+(deal_pagination.py). Each iframe goes through the same steps: the first
+page, 20 page changes, a filter that keeps every other card, and 5
+showPage() calls in one task. The page reports the time from each call to
+the next rendered frame, the number of style.display writes, and the long
+tasks (over 50 ms) seen. Open it in a browser; nothing here runs headless.
+
+Usage:
+    python3 benchmark_pagination.py                       # pagination_benchmark.html
+    python3 benchmark_pagination.py --cards 20000 --output /tmp/bench.html
+"""
+
+import argparse
+import json
+from html import escape
+
+from deal_pagination import render_pagination_js
+
+REGIONS = ['Mediterranean', 'Caribbean', 'Scandinavia', 'Asia & Indian Ocean', 'South America', 'Africa']
+LINES = ['Seabourn', 'Silversea', 'Explora Journeys', 'Regent Seven Seas', 'Oceania Cruises', 'Azamara Cruises']
+
+# showPage() and updateButtonStyles() as deals.html had them before deal_pagination.py
+LEGACY_JS = r'''
+        let currentPage = 1;
+        const dealsPerPage = 10;
+
+        function showPage(pageNum) {
+            console.log('=== showPage called ===');
+            console.log('Page number:', pageNum);
+            currentPage = pageNum;
+            const allDeals = document.querySelectorAll('article[data-deal-id]');
+            console.log('Total deals found:', allDeals.length);
+            const visibleDeals = Array.from(allDeals).filter(deal => {
+                return deal.getAttribute('data-filtered') !== 'true';
+            });
+            console.log('Visible deals after filtering:', visibleDeals.length);
+            const startIndex = (pageNum - 1) * dealsPerPage;
+            const endIndex = startIndex + dealsPerPage;
+            console.log('Showing deals from index', startIndex, 'to', endIndex - 1);
+            allDeals.forEach(deal => {
+                deal.style.display = 'none';
+            });
+            visibleDeals.forEach((deal, index) => {
+                if (index >= startIndex && index < endIndex) {
+                    deal.style.display = 'grid';
+                    console.log('Showing deal', index);
+                } else {
+                    deal.style.display = 'none';
+                }
+            });
+            updateButtonStyles(pageNum);
+            window.scrollTo({ top: 0, behavior: 'smooth' });
+        }
+
+        function updateButtonStyles(activePage) {
+            const buttons = document.querySelectorAll('.pagination-container button');
+            buttons.forEach(btn => {
+                const btnText = btn.textContent.trim();
+                if (btnText === String(activePage)) {
+                    btn.style.cssText = 'width: 40px; height: 40px; background: linear-gradient(135deg, #0a1929 0%, #1e3a52 100%) !important; color: white !important; border: none !important; border-radius: 8px; font-weight: 600; cursor: pointer; transition: all 0.3s;';
+                } else if (!isNaN(btnText) && btnText !== '') {
+                    btn.style.cssText = 'width: 40px; height: 40px; background: white !important; color: #0a1929 !important; border: 1px solid rgba(10,25,41,0.1) !important; border-radius: 8px; font-weight: 600; cursor: pointer; transition: all 0.3s;';
+                }
+            });
+        }
+
+        showPage(1);
+'''
+
+HARNESS_JS = r'''
+const VARIANTS = __VARIANTS__;
+const CARDS_HTML = __CARDS__;
+
+// Counts style.display writes (cards, plus a few pagination buttons)
+const WRITE_COUNTER = `<script>
+    window.displayWrites = 0;
+    let proto = Object.getPrototypeOf(document.documentElement.style);
+    while (proto && !Object.getOwnPropertyDescriptor(proto, 'display')) proto = Object.getPrototypeOf(proto);
+    if (proto) {
+        const descriptor = Object.getOwnPropertyDescriptor(proto, 'display');
+        Object.defineProperty(proto, 'display', {
+            get() { return descriptor.get.call(this); },
+            set(value) { window.displayWrites++; descriptor.set.call(this, value); },
+        });
+    }
+    window.longTasks = [];
+    if (window.PerformanceObserver && PerformanceObserver.supportedEntryTypes.includes('longtask')) {
+        new PerformanceObserver(list => list.getEntries().forEach(e => window.longTasks.push(e.duration)))
+            .observe({ entryTypes: ['longtask'] });
+    }
+<\/script>`;
+
+function nextFrame(win) {
+    return new Promise(resolve => win.requestAnimationFrame(() => win.setTimeout(resolve, 0)));
+}
+
+function loadVariant(script) {
+    return new Promise(resolve => {
+        const frame = document.createElement('iframe');
+        frame.style.cssText = 'width: 1200px; height: 600px; border: 1px solid #ccc;';
+        frame.srcdoc = '<!DOCTYPE html><html><head>' + WRITE_COUNTER + '</head><body>' + CARDS_HTML +
+            '<script>' + script + '<\/script></body></html>';
+        frame.onload = () => resolve(frame);
+        document.getElementById('frames').appendChild(frame);
+    });
+}
+
+async function measure(win, label, action) {
+    await nextFrame(win);
+    win.displayWrites = 0;
+    win.longTasks.length = 0;
+    const start = win.performance.now();
+    action();
+    await nextFrame(win);
+    return { label, ms: win.performance.now() - start, writes: win.displayWrites, longTasks: win.longTasks.length };
+}
+
+async function runVariant(name, script) {
+    const frame = await loadVariant(script);
+    const win = frame.contentWindow;
+    const doc = frame.contentDocument;
+    const cards = Array.from(doc.querySelectorAll('article[data-deal-id]'));
+    const rows = [];
+
+    rows.push(await measure(win, 'showPage(1)', () => win.showPage(1)));
+    let pageChanges = { label: '20 page changes', ms: 0, writes: 0, longTasks: 0 };
+    for (let page = 2; page <= 21; page++) {
+        const row = await measure(win, '', () => win.showPage(page));
+        pageChanges.ms += row.ms;
+        pageChanges.writes += row.writes;
+        pageChanges.longTasks += row.longTasks;
+    }
+    rows.push(pageChanges);
+    rows.push(await measure(win, 'filter to every other card', () => {
+        const matches = [];
+        cards.forEach((card, i) => {
+            card.setAttribute('data-filtered', i % 2 ? 'true' : 'false');
+            if (!(i % 2)) matches.push(i);
+        });
+        if (typeof win.setDealFilter === 'function') win.setDealFilter(matches);
+        win.showPage(1);
+    }));
+    rows.push(await measure(win, '5 showPage() calls in one task', () => {
+        for (let page = 2; page <= 6; page++) win.showPage(page);
+    }));
+    frame.remove();
+    return rows.map(row => Object.assign({ variant: name }, row));
+}
+
+async function run() {
+    const button = document.getElementById('run');
+    button.disabled = true;
+    const results = [];
+    for (const [name, script] of Object.entries(VARIANTS)) {
+        results.push(...await runVariant(name, script));
+    }
+    const body = document.querySelector('#results tbody');
+    body.innerHTML = '';
+    results.forEach(row => {
+        const tr = document.createElement('tr');
+        [row.variant, row.label, row.ms.toFixed(1) + ' ms', row.writes, row.longTasks].forEach(value => {
+            const td = document.createElement('td');
+            td.textContent = value;
+            tr.appendChild(td);
+        });
+        body.appendChild(tr);
+    });
+    button.disabled = false;
+}
+'''
+
+
+def synthetic_card(i: int) -> str:
+    """A card with roughly the element count of a real one, without images."""
+    region = REGIONS[i % len(REGIONS)]
+    line = LINES[(i // 3) % len(LINES)]
+    return (f'<article data-deal-id="{i}" style="display: grid; grid-template-columns: 400px 1fr; '
+            f'border-radius: 20px; margin-bottom: 32px; background: #faf8f5;">'
+            f'<div style="height: 240px; background: #d8cfc0;"></div>'
+            f'<div style="padding: 32px;"><p style="text-transform: uppercase;">{escape(line)}</p>'
+            f'<h3 style="font-size: 28px;">Voyage {i} through the {escape(region)}</h3>'
+            f'<div style="display: grid; grid-template-columns: repeat(2, 1fr);">'
+            f'<div>Region</div><div>{escape(region)}</div><div>Duration</div><div>{7 + i % 8} Nights</div></div>'
+            f'<button>View Details</button><button>Inquire</button></div></article>')
+
+
+def pagination_buttons() -> str:
+    """The deals.html button row: previous, 1-4, '...', last, next."""
+    buttons = ['<button>&lsaquo;</button>']
+    buttons += [f'<button>{page}</button>' for page in (1, 2, 3, 4)]
+    buttons.append('<span>...</span><button>12</button><button>&rsaquo;</button>')
+    return f'<div class="pagination-container" style="display: flex; gap: 8px;">{"".join(buttons)}</div>'
+
+
+def build_page(count: int, debug: bool = False) -> str:
+    cards_html = ''.join(synthetic_card(i) for i in range(count)) + pagination_buttons()
+    variants = {'old showPage()': LEGACY_JS, 'deal_pagination.py': render_pagination_js(debug)}
+    harness = (HARNESS_JS.replace('__VARIANTS__', json.dumps(variants).replace('</', '<\\/'))
+               .replace('__CARDS__', json.dumps(cards_html).replace('</', '<\\/')))
+    return f'''<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <title>Pagination benchmark ({count:,} cards)</title>
+    <style>
+        body {{ font-family: sans-serif; margin: 32px; }}
+        table {{ border-collapse: collapse; margin: 16px 0; }}
+        td, th {{ border: 1px solid #ddd; padding: 6px 12px; text-align: left; }}
+    </style>
+</head>
+<body>
+    <h1>Pagination benchmark: {count:,} cards</h1>
+    <p>Time is from the call to the next rendered frame. Writes are <code>style.display</code> assignments.</p>
+    <button id="run" onclick="run()">Run</button>
+    <table id="results">
+        <thead><tr><th>Variant</th><th>Step</th><th>Time</th><th>display writes</th><th>Long tasks</th></tr></thead>
+        <tbody></tbody>
+    </table>
+    <div id="frames"></div>
+    <script>{harness}</script>
+</body>
+</html>
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cards', type=int, default=5000, help='number of synthetic cards (default 5000)')
+    parser.add_argument('--output', default='pagination_benchmark.html')
+    parser.add_argument('--debug', action='store_true', help='benchmark the debug build of the new script')
+    args = parser.parse_args()
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write(build_page(args.cards, args.debug))
+    print(f"✅ Wrote {args.output} ({args.cards:,} cards); open it in a browser and press Run")
+
+
+if __name__ == '__main__':
+    main()
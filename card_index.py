@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Byte-offset sidecar index of deal cards for random access into large pages
+
+Writes <page>.idx.json next to a page, mapping each card's deal id and
+normalized title to its byte range and a content hash. Reads and spot edits
+then mmap the page and seek straight to the card instead of rescanning the
+file. The index is rebuilt automatically when the page's mtime/size change
+and its content hash no longer matches. A spot edit checks the card's own
+hash before writing, and leaves the page hash unset rather than rehashing
+the whole file, so the next mtime change rebuilds the index.
+
+Usage:
+    python3 card_index.py build deals.html list.html
+    python3 card_index.py list deals.html
+    python3 card_index.py show deals.html <deal-id | title>
+"""
+
+import argparse
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import sys
+
+from deal_cards import DEALS_FILE, extract_cards, normalize_title
+
+INDEX_VERSION = 1
+INDEX_SUFFIX = '.idx.json'
+
+
+def index_path(page: str) -> str:
+    """Sidecar index file for a page."""
+    return page + INDEX_SUFFIX
+
+
+def file_hash(data: bytes) -> str:
+    """Short content hash used for pages and cards."""
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def build_index(page: str) -> dict:
+    """Scan a page once and return its index."""
+    with open(page, 'rb') as f:
+        data = f.read()
+    stat = os.stat(page)
+    content = data.decode('utf-8')
+
+    cards = []
+    char_pos = 0
+    byte_pos = 0
+    for card in extract_cards(content):
+        # Card offsets are character offsets; walk forward converting to bytes
+        start = byte_pos + len(content[char_pos:card.start].encode('utf-8'))
+        end = start + len(content[card.start:card.end].encode('utf-8'))
+        char_pos, byte_pos = card.end, end
+        cards.append({
+            'deal_id': card.deal_id,
+            'title': card.title,
+            'key': normalize_title(card.title),
+            'start': start,
+            'end': end,
+            'hash': file_hash(data[start:end]),
+        })
+
+    return {
+        'version': INDEX_VERSION,
+        'page': os.path.basename(page),
+        'mtime_ns': stat.st_mtime_ns,
+        'size': stat.st_size,
+        'hash': file_hash(data),
+        'cards': cards,
+    }
+
+
+def save_index(page: str, index: dict):
+    """Write the sidecar index atomically."""
+    path = index_path(page)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def index_is_current(page: str, index: dict) -> bool:
+    """True if the index still describes the page.
+
+    mtime and size are checked first; if only the mtime moved (a touch or
+    an identical rewrite) the content hash decides.
+    """
+    if index.get('version') != INDEX_VERSION:
+        return False
+    stat = os.stat(page)
+    if stat.st_size != index['size']:
+        return False
+    if stat.st_mtime_ns == index['mtime_ns']:
+        return True
+    if index['hash'] is None:
+        return False  # not hashed since the last spot edit
+    with open(page, 'rb') as f:
+        if file_hash(f.read()) != index['hash']:
+            return False
+    index['mtime_ns'] = stat.st_mtime_ns
+    return True
+
+
+def load_index(page: str) -> dict:
+    """Load a page's index, rebuilding and saving it if missing or stale."""
+    try:
+        with open(index_path(page), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        mtime_ns = index.get('mtime_ns')
+        if index_is_current(page, index):
+            if index['mtime_ns'] != mtime_ns:
+                save_index(page, index)  # keep the refreshed mtime
+            return index
+    except (OSError, ValueError, KeyError):
+        pass
+    index = build_index(page)
+    save_index(page, index)
+    return index
+
+
+class CardIndex:
+    """Lookups, reads and in-place edits of cards through the sidecar index."""
+
+    def __init__(self, page: str):
+        self.page = page
+        self.index = load_index(page)
+        self._reindex()
+
+    def _reindex(self):
+        self.by_id = {}
+        for i, entry in enumerate(self.index['cards']):
+            self.by_id.setdefault(entry['deal_id'], []).append(i)
+        self.keys = sorted((entry['key'], i) for i, entry in enumerate(self.index['cards']))
+
+    def find(self, deal_id: str) -> dict:
+        """Entry for a deal id; raises KeyError if missing, ValueError if ambiguous."""
+        matches = self.by_id.get(deal_id, [])
+        if not matches:
+            raise KeyError(f"No card with data-deal-id={deal_id!r}")
+        if len(matches) > 1:
+            raise ValueError(f"data-deal-id={deal_id!r} is used by {len(matches)} cards")
+        return self.index['cards'][matches[0]]
+
+    def find_title(self, title: str, prefix: bool = True) -> list:
+        """Entries whose normalized title equals (or starts with) the given title."""
+        key = normalize_title(title)
+        i = bisect.bisect_left(self.keys, (key, -1))
+        matches = []
+        while i < len(self.keys):
+            entry_key, position = self.keys[i]
+            if entry_key != key and not (prefix and entry_key.startswith(key)):
+                break
+            matches.append(self.index['cards'][position])
+            i += 1
+        return matches
+
+    def read_card(self, entry: dict) -> str:
+        """Read one card's HTML by seeking straight to its byte range."""
+        with open(self.page, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm[entry['start']:entry['end']].decode('utf-8')
+
+    def replace_card(self, entry: dict, new_html: str):
+        """Overwrite one card and shift the offsets of the cards after it.
+
+        Same-length edits are written in place through mmap; otherwise only
+        the bytes from the card onwards are rewritten. Raises ValueError,
+        without writing, if the card's bytes no longer match the index.
+        """
+        new_bytes = new_html.encode('utf-8')
+        old_length = entry['end'] - entry['start']
+        delta = len(new_bytes) - old_length
+
+        with open(self.page, 'r+b') as f:
+            f.seek(entry['start'])
+            if file_hash(f.read(old_length)) != entry['hash']:
+                raise ValueError(f"card {entry['deal_id']} in {self.page} changed since it was indexed; "
+                                 f"rebuild the index and retry")
+            if delta == 0:
+                with mmap.mmap(f.fileno(), 0) as mm:
+                    mm[entry['start']:entry['end']] = new_bytes
+                    mm.flush()
+            else:
+                f.seek(entry['end'])
+                tail = f.read()
+                f.seek(entry['start'])
+                f.write(new_bytes)
+                f.write(tail)
+                f.truncate()
+
+        entry['end'] = entry['start'] + len(new_bytes)
+        entry['hash'] = file_hash(new_bytes)
+        edited = extract_cards(new_html)
+        if edited:
+            entry['deal_id'] = edited[0].deal_id
+            entry['title'] = edited[0].title
+            entry['key'] = normalize_title(edited[0].title)
+        for other in self.index['cards']:
+            if other['start'] > entry['start']:
+                other['start'] += delta
+                other['end'] += delta
+
+        self.index['hash'] = None
+        stat = os.stat(self.page)
+        self.index['mtime_ns'] = stat.st_mtime_ns
+        self.index['size'] = stat.st_size
+        save_index(self.page, self.index)
+        self._reindex()
+
+
+def cmd_build(args):
+    for page in args.pages:
+        index = build_index(page)
+        save_index(page, index)
+        print(f"✓ {index_path(page)}: {len(index['cards'])} cards, {index['size']} bytes")
+
+
+def cmd_list(args):
+    index = load_index(args.page)
+    for entry in index['cards']:
+        print(f"  [{entry['deal_id']:>4}] {entry['start']:>9}-{entry['end']:<9} {entry['hash']}  {entry['title']}")
+
+
+def cmd_show(args):
+    cards = CardIndex(args.page)
+    try:
+        entries = [cards.find(args.card)]
+    except KeyError:
+        entries = cards.find_title(args.card)
+    if not entries:
+        print(f"❌ No card matches {args.card!r}")
+        sys.exit(1)
+    for entry in entries:
+        print(f"<!-- {entry['deal_id']} @ bytes {entry['start']}-{entry['end']} -->")
+        print(cards.read_card(entry))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='(re)build the index for pages')
+    build_parser.add_argument('pages', nargs='*', default=[DEALS_FILE])
+    build_parser.set_defaults(func=cmd_build)
+
+    list_parser = subparsers.add_parser('list', help='list indexed cards')
+    list_parser.add_argument('page', nargs='?', default=DEALS_FILE)
+    list_parser.set_defaults(func=cmd_list)
+
+    show_parser = subparsers.add_parser('show', help='print one card by deal id or title')
+    show_parser.add_argument('page')
+    show_parser.add_argument('card')
+    show_parser.set_defaults(func=cmd_show)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Card templates for rendering deal catalog records into deals.html markup
+
+Each theme is a function taking one catalog record (a dict) and returning
+the <article> HTML. Bump a theme's version whenever its markup changes so
+cached renders are invalidated.
+"""
+
+from html import escape
+
+from deal_facets import facet_attrs
+
+# Badge colours: (background, border, shadow)
+BADGE_COLOURS = {
+    'TOP DEAL': ('rgba(156, 17, 52, 0.25)', 'rgba(156, 17, 52, 0.4)', 'rgba(0, 0, 0, 0.2)'),
+    'UK DEPARTURE': ('rgba(10, 25, 41, 0.3)', 'rgba(10, 25, 41, 0.5)', 'rgba(0, 0, 0, 0.2)'),
+}
+DEFAULT_BADGE_COLOUR = ('rgba(212, 175, 55, 0.3)', 'rgba(212, 175, 55, 0.5)', 'rgba(212, 175, 55, 0.3)')
+
+DEFAULT_FEATURES = [
+    'Premium all-inclusive amenities',
+    'Curated shore experiences',
+    'Limited availability',
+]
+
+
+def format_price(value) -> str:
+    """Format a price for display, e.g. 5300 -> '£5300'."""
+    return f"£{value}" if value is not None else ''
+
+
+def render_badges(badges: list) -> str:
+    """Render the stacked badges over the card image."""
+    parts = []
+    for i, badge in enumerate(badges):
+        background, border, shadow = BADGE_COLOURS.get(badge.upper(), DEFAULT_BADGE_COLOUR)
+        parts.append(f'''
+                                <div
+                                    style="position: absolute; top: {16 + i * 40}px; left: 16px; background: {background}; backdrop-filter: blur(20px) !important; -webkit-backdrop-filter: blur(20px) !important; border: 1px solid {border}; box-shadow: 0 4px 16px {shadow}, inset 0 0 0 1px rgba(255, 255, 255, 0.2); padding: 8px 16px; border-radius: 8px; font-size: 12px; font-weight: 700; color: white; text-transform: uppercase; letter-spacing: 0.5px;">
+                                    {escape(badge)}</div>''')
+    return ''.join(parts)
+
+
+def render_price_card(deal: dict) -> str:
+    """Render the floating glass price card, or nothing if the deal has no price."""
+    if deal.get('new_price') is None:
+        return ''
+
+    old_price = ''
+    if deal.get('old_price') is not None:
+        old_price = f'''
+                                                <span
+                                                    style="font-size: 14px; color: rgba(255, 255, 255, 0.6); text-decoration: line-through; text-shadow: 0 1px 2px rgba(0, 0, 0, 0.1);">{format_price(deal['old_price'])}</span>'''
+
+    discount = ''
+    if deal.get('discount'):
+        discount = f'''
+                                        <div
+                                            style="background: linear-gradient(135deg, rgba(212, 175, 55, 0.95) 0%, rgba(232, 194, 150, 0.95) 100%); backdrop-filter: blur(10px); -webkit-backdrop-filter: blur(10px); color: white; padding: 10px 18px; border-radius: 50px; font-size: 12px; font-weight: 700; text-transform: uppercase; letter-spacing: 0.8px; box-shadow: 0 4px 16px rgba(212, 175, 55, 0.4), inset 0 1px 0 rgba(255, 255, 255, 0.4); border: 1px solid rgba(255, 255, 255, 0.3);">
+                                            {escape(deal['discount'])}
+                                        </div>'''
+
+    return f'''
+
+                                <!-- Floating Price Card (iOS 26 Glassmorphism) -->
+                                <div
+                                    style="position: absolute; bottom: 20px; left: 20px; right: 20px; background: rgba(255, 255, 255, 0.15); backdrop-filter: blur(40px) saturate(180%); -webkit-backdrop-filter: blur(40px) saturate(180%); border-radius: 20px; padding: 18px 22px; box-shadow: 0 8px 32px rgba(0, 0, 0, 0.1), 0 1px 0 0 rgba(255, 255, 255, 0.5) inset, 0 -1px 0 0 rgba(0, 0, 0, 0.05) inset; border: 1px solid rgba(255, 255, 255, 0.3);">
+                                    <div style="display: flex; justify-content: space-between; align-items: center;">
+                                        <div>
+                                            <p
+                                                style="font-size: 12px; color: rgba(255, 255, 255, 0.8); margin-bottom: 6px; text-transform: uppercase; letter-spacing: 0.8px; font-weight: 600; text-shadow: 0 1px 2px rgba(0, 0, 0, 0.1);">
+                                                {escape(deal.get('price_label') or 'From')}</p>
+                                            <div style="display: flex; align-items: baseline; gap: 10px;">{old_price}
+                                                <span
+                                                    style="font-size: 30px; font-weight: 800; color: white; font-family: 'Playfair Display', serif; text-shadow: 0 2px 8px rgba(0, 0, 0, 0.15);">{format_price(deal['new_price'])}</span>
+                                                <span
+                                                    style="font-size: 15px; color: rgba(255, 255, 255, 0.9); font-weight: 600;">pp</span>
+                                            </div>
+                                        </div>{discount}
+                                    </div>
+                                </div>'''
+
+
+def render_info_item(label: str, value: str, full_width: bool = False) -> str:
+    """Render one label/value pair of the info box."""
+    opening = '<div style="grid-column: 1 / -1;">' if full_width else '<div>'
+    return f'''
+                                            {opening}
+                                                <div style="color: #d4af37; font-size: 12px; font-weight: 600; text-transform: uppercase; letter-spacing: 2px; margin-bottom: 8px; opacity: 0.85; font-family: 'Inter', sans-serif;">{label}</div>
+                                                <div style="color: #1a2332; font-size: 16px; font-weight: 400; font-family: 'Cormorant Garamond', serif;">{escape(value)}</div>
+                                            </div>'''
+
+
+def render_features(features: list) -> str:
+    """Render the feature bullets shown when the card expands."""
+    return ''.join(f'''
+                                                <div style="display: flex; align-items: center; gap: 12px;">
+                                                    <div style="width: 6px; height: 6px; background: #d4af37; border-radius: 50%; box-shadow: 0 0 8px rgba(212, 175, 55, 0.6);"></div>
+                                                    <span style="font-size: 14px; color: #555; font-weight: 400; letter-spacing: 0.3px; font-family: 'Inter', sans-serif;">{escape(feature)}</span>
+                                                </div>''' for feature in features)
+
+
+def render_opulent_card(deal: dict) -> str:
+    """Render one deal in the Opulent Classic style used by deals.html."""
+    nights = deal.get('nights')
+    duration = f"{nights} Night{'s' if nights != 1 else ''}" if nights is not None else ''
+    cruise_line = deal.get('cruise_line') or ''
+
+    return f'''<!-- Deal Card {deal.get('position', '')} - {escape(cruise_line)} -->
+                        <article data-deal-id="{escape(str(deal['deal_id']))}"
+                            style="background: white; border-radius: 20px; overflow: hidden; box-shadow: 0 8px 32px rgba(0,0,0,0.08); transition: all 0.5s cubic-bezier(0.4, 0, 0.2, 1); display: grid; grid-template-columns: 400px 1fr; border: 1px solid rgba(255,255,255,0.8);"
+                            onmouseover="this.style.transform='translateY(-8px) scale(1.01)'; this.style.boxShadow='0 24px 64px rgba(0,0,0,0.15)'; this.style.borderColor='rgba(212, 175, 55, 0.3)'; this.querySelectorAll('.expand-on-hover').forEach(el => {{el.style.gridTemplateRows='1fr'; el.style.opacity='1'}});"
+                            onmouseout="this.style.transform='translateY(0) scale(1)'; this.style.boxShadow='0 8px 32px rgba(0,0,0,0.08)'; this.style.borderColor='rgba(255,255,255,0.8)'; this.querySelectorAll('.expand-on-hover').forEach(el => {{el.style.gridTemplateRows='0fr'; el.style.opacity='0'}})"{facet_attrs(deal)}>
+                            <div style="position: relative; overflow: hidden;">
+                                <img src="{escape(deal.get('image') or '')}"
+                                    alt="{escape(deal.get('image_alt') or deal.get('title') or '')}"
+                                    style="width: 100%; height: 100%; object-fit: cover;">
+
+                                <!-- Save/Compare Heart Button -->
+                                <button class="heart-button" onclick="toggleSave(this)" aria-label="Save cruise">
+                                    <svg class="heart-icon" viewBox="0 0 24 24">
+                                        <path
+                                            d="M20.84 4.61a5.5 5.5 0 0 0-7.78 0L12 5.67l-1.06-1.06a5.5 5.5 0 0 0-7.78 7.78l1.06 1.06L12 21.23l7.78-7.78 1.06-1.06a5.5 5.5 0 0 0 0-7.78z" />
+                                    </svg>
+                                </button>
+{render_badges(deal.get('badges') or [])}{render_price_card(deal)}
+                            </div>
+
+                            <!-- Opulent Classic Luxury -->
+                            <div style="padding: 58px 64px 56px; display: flex; flex-direction: column; position: relative; background: linear-gradient(135deg, #faf8f5 0%, #f5f3ee 100%);">
+
+                                <!-- Decorative Gold Double Frame -->
+                                <div style="position: absolute; top: 24px; left: 24px; right: 24px; bottom: 24px; border: 1px solid rgba(212, 175, 55, 0.25); pointer-events: none;"></div>
+                                <div style="position: absolute; top: 28px; left: 28px; right: 28px; bottom: 28px; border: 1px solid rgba(212, 175, 55, 0.15); pointer-events: none;"></div>
+
+                                <!-- Header with Logo & Duration Badge -->
+                                <div style="display: flex; justify-content: space-between; align-items: flex-start; margin-bottom: 42px; position: relative; z-index: 1;">
+                                    <div>
+                                        <img src="{escape(deal.get('logo') or '')}" alt="{escape(cruise_line)}"
+                                            style="max-height: 48px; width: auto; max-width: 200px; object-fit: contain; opacity: 0.92;">
+                                        <!-- Gold Decorative Underline -->
+                                        <div style="display: flex; gap: 4px; margin-top: 12px;">
+                                            <div style="width: 50px; height: 2px; background: linear-gradient(90deg, #d4af37, transparent);"></div>
+                                            <div style="width: 25px; height: 2px; background: linear-gradient(90deg, #d4af37, transparent); opacity: 0.5;"></div>
+                                        </div>
+                                    </div>
+
+                                    <!-- Ornate Duration Badge -->
+                                    <div style="position: relative; padding: 16px 28px; background: linear-gradient(135deg, rgba(212, 175, 55, 0.15), rgba(212, 175, 55, 0.05)); border: 2px solid rgba(212, 175, 55, 0.3); border-radius: 8px; box-shadow: inset 0 1px 2px rgba(255,255,255,0.5), 0 4px 12px rgba(212, 175, 55, 0.1);">
+                                        <div style="text-align: center;">
+                                            <div style="color: #d4af37; font-size: 12px; font-weight: 600; text-transform: uppercase; letter-spacing: 2.5px; margin-bottom: 6px; font-family: 'Inter', sans-serif;">Duration</div>
+                                            <div style="color: #1a2332; font-size: 22px; font-weight: 500; font-family: 'Cormorant Garamond', serif; letter-spacing: 0.5px;">{duration}</div>
+                                        </div>
+                                    </div>
+                                </div>
+
+                                <!-- Title with Gold Accent Border -->
+                                <div style="border-left: 3px solid rgba(212, 175, 55, 0.4); padding-left: 26px; margin-bottom: 38px; position: relative; z-index: 1;">
+                                    <!-- Gold Accent Dot -->
+                                    <div style="position: absolute; left: -7px; top: 0; width: 10px; height: 10px; background: #d4af37; border-radius: 50%; box-shadow: 0 0 12px rgba(212, 175, 55, 0.5);"></div>
+
+                                    <h3 style="font-size: 34px; font-family: 'TheSeasons', serif; color: #1a2332; line-height: 1.35; font-weight: 400; margin-bottom: 28px; letter-spacing: 0.6px;">
+                                        {escape(deal.get('title') or '')}
+                                    </h3>
+
+                                    <!-- Rich Info Box -->
+                                    <div style="background: linear-gradient(135deg, rgba(212, 175, 55, 0.08), rgba(212, 175, 55, 0.03)); padding: 22px 26px; border-radius: 10px; border: 1px solid rgba(212, 175, 55, 0.2);">
+                                        <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 18px;">{render_info_item('Vessel', deal.get('ship') or 'Luxury Vessel')}{render_info_item('Region', deal.get('region') or '')}{render_info_item('Departure', deal.get('departure') or '', full_width=True)}
+                                        </div>
+                                    </div>
+                                </div>
+
+                                <!-- Premium Features (EXPANDS on hover) -->
+                                <div class="expand-on-hover" style="display: grid; grid-template-rows: 0fr; opacity: 0; transition: grid-template-rows 0.4s cubic-bezier(0.4, 0, 0.2, 1), opacity 0.4s; position: relative; z-index: 1;">
+                                    <div style="overflow: hidden;">
+                                        <div style="margin-bottom: 32px; padding: 20px 24px; background: linear-gradient(135deg, rgba(26, 35, 50, 0.04), transparent); border-radius: 10px; border-left: 3px solid #d4af37;">
+                                            <div style="display: flex; flex-direction: column; gap: 12px;">{render_features(deal.get('features') or DEFAULT_FEATURES)}
+                                            </div>
+                                        </div>
+                                    </div>
+                                </div>
+
+                                <!-- Opulent Squircle Buttons -->
+                                <div style="display: flex; gap: 14px; position: relative; z-index: 1;">
+                                    <button
+                                        onmouseover="this.style.background='linear-gradient(135deg, #c9a961, #d4af37)'; this.style.boxShadow='0 8px 24px rgba(212, 175, 55, 0.35)'; this.style.transform='translateY(-2px)'"
+                                        onmouseout="this.style.background='linear-gradient(135deg, #1a2332, #2a3442)'; this.style.boxShadow='0 4px 16px rgba(26, 35, 50, 0.25)'; this.style.transform='translateY(0)'"
+                                        style="flex: 1; padding: 20px 36px; background: linear-gradient(135deg, #1a2332, #2a3442); color: white; border: none; border-radius: 12px; font-size: 12px; font-weight: 600; text-transform: uppercase; letter-spacing: 2.8px; cursor: pointer; transition: all 0.35s; box-shadow: 0 4px 16px rgba(26, 35, 50, 0.25); font-family: 'Inter', sans-serif;">
+                                        View Details
+                                    </button>
+                                    <button
+                                        onmouseover="this.style.background='rgba(212, 175, 55, 0.15)'; this.style.borderColor='#d4af37'; this.style.transform='translateY(-2px)'"
+                                        onmouseout="this.style.background='transparent'; this.style.borderColor='rgba(26, 35, 50, 0.2)'; this.style.transform='translateY(0)'"
+                                        style="padding: 20px 32px; background: transparent; color: #1a2332; border: 2px solid rgba(26, 35, 50, 0.2); border-radius: 12px; font-size: 12px; font-weight: 600; text-transform: uppercase; letter-spacing: 2.8px; cursor: pointer; transition: all 0.35s; font-family: 'Inter', sans-serif;">
+                                        Inquire
+                                    </button>
+                                </div>
+
+                                <!-- Secondary Actions (EXPANDS on hover) -->
+                                <div class="expand-on-hover" style="display: grid; grid-template-rows: 0fr; opacity: 0; transition: grid-template-rows 0.4s cubic-bezier(0.4, 0, 0.2, 1), opacity 0.4s; position: relative; z-index: 1;">
+                                    <div style="overflow: hidden;">
+                                        <div style="display: flex; justify-content: center; gap: 28px; padding-top: 24px; margin-top: 20px; border-top: 1px solid rgba(212, 175, 55, 0.2);">
+                                            <button
+                                                onmouseover="this.style.color='#d4af37'"
+                                                onmouseout="this.style.color='#888'"
+                                                style="background: none; border: none; color: #888; font-size: 10px; font-weight: 500; cursor: pointer; transition: color 0.25s; text-transform: uppercase; letter-spacing: 1.5px; padding: 0; font-family: 'Inter', sans-serif;">
+                                                Request Callback
+                                            </button>
+                                            <button
+                                                onmouseover="this.style.color='#d4af37'"
+                                                onmouseout="this.style.color='#888'"
+                                                style="background: none; border: none; color: #888; font-size: 10px; font-weight: 500; cursor: pointer; transition: color 0.25s; text-transform: uppercase; letter-spacing: 1.5px; padding: 0; font-family: 'Inter', sans-serif;">
+                                                Download Brochure
+                                            </button>
+                                        </div>
+                                    </div>
+                                </div>
+                            </div>
+                        </article>'''
+
+
+# theme name -> (template version, render function)
+THEMES = {
+    'opulent': (2, render_opulent_card),
+}
+DEFAULT_THEME = 'opulent'
+
+
+def render_card(deal: dict, theme: str = DEFAULT_THEME) -> str:
+    """Render one catalog record with the given theme."""
+    return THEMES[theme][1](deal)
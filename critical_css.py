@@ -0,0 +1,679 @@
+#!/usr/bin/env python3
+"""
+Critical-CSS split: inline what the first viewport needs, defer the rest
+
+Each page's own <style> blocks (170 KB on deals.html) block first paint.
+`split` finds the elements of the first viewport - everything up to the end
+of the hero section and the first row of deal cards, plus position: fixed
+elements - and keeps only the rules whose selectors match one of them in a
+<style id="critical-css"> block. The remaining rules go into
+css/<page>.<hash>.css, loaded with media="print" and swapped to all on load
+so it never blocks rendering.
+
+Matching is deliberately generous: pseudo-classes and pseudo-elements are
+ignored (a:hover counts as a) and classes the page's scripts add
+(classList.add('active'), el.className = ...) are assumed present, so a
+rule is only deferred when no element up front could ever use it. @keyframes and @font-face follow the critical
+rules that name them.
+
+Moving rules into a later stylesheet changes their order, so a critical
+rule is also repeated in the deferred sheet whenever an earlier deferred
+rule of equal specificity sets the same property - once the sheet loads,
+the cascade is the original one. `join` puts the page back to a single
+<style> block (the pipeline does this before other passes touch the page)
+and `split` joins first, so re-running is safe.
+
+Third-party stylesheets and <style> blocks with attributes (generated
+atomic/hover classes, injected widget styles) are left where they are.
+
+Usage:
+    python3 critical_css.py split deals.html index.html itinerary.html [--dry-run]
+    python3 critical_css.py join deals.html
+"""
+
+import argparse
+import glob
+import hashlib
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+from atomic_css import ATOMIC_BLOCK_RE, ATOMIC_RULE_RE, overlaps, parse_declaration, split_declarations
+from deal_cards import DEALS_FILE, VOID_TAGS, extract_cards
+
+STYLE_BLOCK_ID = 'critical-css'
+CSS_DIR = 'css'
+# Cards in the first row of the widest card grid (repeat(3, 1fr)). Larger
+# than lazy_images.ABOVE_FOLD_CARDS on purpose: an extra critical rule only
+# costs bytes, a missing one shows unstyled cards until the sheet loads.
+FIRST_ROW_CARDS = 3
+
+PLAIN_STYLE_RE = re.compile(r'[ \t]*<style>(.*?)</style>[ \t]*\n?', re.DOTALL | re.IGNORECASE)
+CRITICAL_BLOCK_RE = re.compile(
+    r'<style id="' + STYLE_BLOCK_ID + r'">(.*?)</style>\s*'
+    r'<link rel="stylesheet" href="([^"]+)" media="print" onload="this.media=\'all\'" data-deferred-css>\s*'
+    r'<noscript><link rel="stylesheet" href="[^"]+"></noscript>',
+    re.DOTALL
+)
+COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+URL_RE = re.compile(r'url\(\s*([\'"]?)(?!(?:[a-z][a-z0-9+.-]*:|/|#))([^)\'"]+)\1\s*\)', re.IGNORECASE)
+FIXED_RE = re.compile(r'position\s*:\s*fixed', re.IGNORECASE)
+SELECTOR_TOKEN_RE = re.compile(
+    r'(?P<combinator>\s*[>+~]\s*|\s+)'
+    r'|(?P<id>#(?:\\.|[-\w])+)'
+    r'|(?P<cls>\.(?:\\.|[-\w])+)'
+    r'|(?P<attr>\[\s*(?P<name>[-\w]+)\s*(?:(?P<op>[~|^$*]?=)\s*(?P<value>"[^"]*"|\'[^\']*\'|[^\]\s]+)\s*[iIsS]?\s*)?\])'
+    r'|(?P<pseudo>::?[-\w]+(?:\((?:[^()]|\([^()]*\))*\))?)'
+    r'|(?P<tag>\*|[-\w]+)'
+)
+SCRIPT_RE = re.compile(r'<script\b[^>]*>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+# Class names scripts put on elements: classList.add('x'), addClass('x'), el.className = 'x'
+CLASS_WRITE_RE = re.compile(
+    r'classList\.(?:add|toggle|replace)\(([^)]*)\)'
+    r'|(?:add|toggle)Class\(([^)]*)\)'
+    r'|className\s*\+?=\s*([^;\n]*)'
+    r'|setAttribute\(\s*[\'"]class[\'"]\s*,([^)]*)\)'
+)
+# Markup built in scripts: '<div class="card-badge">' / innerHTML templates
+TEMPLATE_CLASS_RE = re.compile(r'\bclass\s*=\s*\\?["\']([^"\'\\]+)')
+STRING_RE = re.compile(r'\'([^\'\\]*)\'|"([^"\\]*)"|`([^`$\\]*)`')
+GROUP_AT_RULES = ('@media', '@supports', '@layer', '@container')
+
+
+@dataclass
+class CssRule:
+    """One rule of a stylesheet, with the conditional at-rules around it."""
+    prelude: str  # selector list or at-rule prelude
+    body: str = None  # None for statements like @import
+    context: tuple = ()  # enclosing @media/@supports preludes, outermost first
+    critical: bool = False
+    repeat: bool = False  # also emitted in the deferred sheet to keep the cascade
+    props: set = field(default_factory=set)
+
+    @property
+    def text(self) -> str:
+        if self.body is None:
+            return f"{self.prelude};"
+        return f"{self.prelude}{{{self.body}}}"
+
+
+def minify(text: str) -> str:
+    text = ' '.join(text.split())
+    return re.sub(r'\s*([{};,>])\s*', r'\1', text) if '{' in text else text
+
+
+def parse_css(css: str, context: tuple = ()) -> list:
+    """Flat list of CssRules, descending into @media/@supports blocks."""
+    css = COMMENT_RE.sub('', css)
+    rules = []
+    pos = 0
+    length = len(css)
+    while pos < length:
+        while pos < length and (css[pos].isspace() or css[pos] == '}'):
+            pos += 1  # stray closing braces are dropped, as browsers do
+        if pos >= length:
+            break
+        start = pos
+        depth = 0
+        quote = None
+        while pos < length:
+            char = css[pos]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '(':
+                depth += 1
+            elif char == ')':
+                depth = max(0, depth - 1)
+            elif char in '{;' and depth == 0:
+                break
+            pos += 1
+        prelude = ' '.join(css[start:pos].split())
+        if pos >= length or css[pos] == ';':
+            if prelude.startswith('@'):
+                rules.append(CssRule(prelude, None, context))
+            pos += 1
+            continue
+        body_start = pos + 1
+        depth = 1
+        quote = None
+        pos = body_start
+        while pos < length and depth:
+            char = css[pos]
+            if quote:
+                if char == quote:
+                    quote = None
+            elif char in '"\'':
+                quote = char
+            elif char == '{':
+                depth += 1
+            elif char == '}':
+                depth -= 1
+            pos += 1
+        body = css[body_start:pos - 1 if not depth else pos]
+        if prelude.lower().startswith(GROUP_AT_RULES):
+            rules.extend(parse_css(body, context + (prelude,)))
+        elif prelude:
+            rule = CssRule(prelude, minify(body), context)
+            if not prelude.startswith('@'):
+                for raw in split_declarations(rule.body):
+                    parsed = parse_declaration(raw)
+                    if parsed:
+                        rule.props.add((parsed[0], parsed[2]))
+            rules.append(rule)
+    return rules
+
+
+def serialize(rules: list) -> str:
+    """Stylesheet text for rules, re-opening their @media wrappers as needed."""
+    lines = []
+    open_context = ()
+    for rule in rules:
+        shared = 0
+        while (shared < min(len(open_context), len(rule.context))
+               and open_context[shared] == rule.context[shared]):
+            shared += 1
+        lines.extend('}' for _ in open_context[shared:])
+        lines.extend(f"{prelude}{{" for prelude in rule.context[shared:])
+        open_context = rule.context
+        lines.append(rule.text)
+    lines.extend('}' for _ in open_context)
+    return '\n'.join(lines)
+
+
+def script_classes(content: str) -> set:
+    """Class names the page's inline scripts add to elements at runtime."""
+    classes = set()
+    for script in SCRIPT_RE.findall(content):
+        for match in CLASS_WRITE_RE.finditer(script):
+            args = next(group for group in match.groups() if group is not None)
+            for literal in STRING_RE.findall(args):
+                classes.update(''.join(literal).split())
+        for value in TEMPLATE_CLASS_RE.findall(script):
+            classes.update(name for name in value.split() if '${' not in name)
+    return classes
+
+
+# --- Page model ---------------------------------------------------------------
+
+class Element:
+    __slots__ = ('tag', 'id', 'classes', 'attrs', 'parent', 'previous', 'pinned', 'fold')
+
+    def __init__(self, tag, attrs, parent, previous):
+        self.tag = tag
+        self.attrs = {name: value or '' for name, value in attrs}
+        self.id = self.attrs.get('id')
+        self.classes = set(self.attrs.get('class', '').split())
+        self.parent = parent
+        self.previous = previous  # previous element sibling
+        self.pinned = False  # position: fixed, or inside such an element
+        self.fold = False
+
+
+class PageParser(HTMLParser):
+    """Element tree of a page; fold marks elements in the first viewport.
+
+    That is everything starting before fold_end or before the first <section>
+    (the hero) closes, and anything pinned with an inline position: fixed.
+    """
+
+    def __init__(self, fold_end: int, atomic_fixed: set):
+        super().__init__(convert_charrefs=True)
+        self.fold_end = fold_end
+        self.atomic_fixed = atomic_fixed
+        self.elements = []
+        self.stack = []
+        self.last_child = [None]
+        self.line_starts = [0]
+        self.first_section = None  # (element, depth) of the first <section> in <body>
+        self.fold_closed = False
+
+    def position(self) -> int:
+        line, column = self.getpos()
+        return self.line_starts[line - 1] + column
+
+    def handle_starttag(self, tag, attrs):
+        parent = self.stack[-1] if self.stack else None
+        element = Element(tag, attrs, parent, self.last_child[-1])
+        self.last_child[-1] = element
+        element.pinned = ((parent is not None and parent.pinned)
+                          or bool(FIXED_RE.search(element.attrs.get('style', '')))
+                          or bool(element.classes & self.atomic_fixed))
+        element.fold = element.pinned or not self.fold_closed or self.position() < self.fold_end
+        self.elements.append(element)
+        if tag == 'section' and self.first_section is None:
+            self.first_section = (element, len(self.stack))
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+            self.last_child.append(None)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+            self.last_child.pop()
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self.stack) - 1, -1, -1):
+            if self.stack[depth].tag == tag:
+                closed = self.stack[depth]
+                del self.stack[depth:]
+                del self.last_child[depth + 1:]
+                if self.first_section and closed is self.first_section[0]:
+                    self.fold_closed = True
+                return
+
+
+def parse_page(content: str, fold_end: int, atomic_fixed: set) -> list:
+    parser = PageParser(fold_end, atomic_fixed)
+    parser.line_starts = [0] + [m.end() for m in re.finditer('\n', content)]
+    parser.feed(content)
+    parser.close()
+    if parser.first_section is None:
+        parser.fold_closed = True
+    return parser.elements
+
+
+# --- Selectors ----------------------------------------------------------------
+
+def parse_selector(selector: str):
+    """[(combinator, compound)] right to left, compound = (tag, id, classes, attrs); None if unparseable."""
+    parts = []
+    compound = [None, None, set(), []]
+    combinator = ' '
+    pos = 0
+    selector = selector.strip()
+    while pos < len(selector):
+        match = SELECTOR_TOKEN_RE.match(selector, pos)
+        if not match:
+            return None
+        pos = match.end()
+        if match.group('combinator') is not None:
+            parts.append((combinator, compound))
+            combinator = match.group('combinator').strip() or ' '
+            compound = [None, None, set(), []]
+        elif match.group('id'):
+            compound[1] = match.group('id')[1:].replace('\\', '')
+        elif match.group('cls'):
+            compound[2].add(match.group('cls')[1:].replace('\\', ''))
+        elif match.group('attr'):
+            value = match.group('value')
+            if value and value[0] in '"\'':
+                value = value[1:-1]
+            compound[3].append((match.group('name').lower(), match.group('op'), value))
+        elif match.group('tag') and match.group('tag') != '*':
+            compound[0] = match.group('tag').lower()
+        # pseudo-classes and pseudo-elements are ignored: a:hover counts as a
+    parts.append((combinator, compound))
+    # parts[i] = (combinator joining it to the previous compound, compound)
+    chain = []
+    for i in range(len(parts) - 1, -1, -1):
+        chain.append((parts[i][0] if i else None, parts[i][1]))
+    return chain
+
+
+def attr_test(element: Element, name: str, op: str, value: str) -> bool:
+    actual = element.attrs.get(name)
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if op == '=':
+        return actual == value
+    if op == '~=':
+        return value in actual.split()
+    if op == '|=':
+        return actual == value or actual.startswith(value + '-')
+    if op == '^=':
+        return actual.startswith(value)
+    if op == '$=':
+        return actual.endswith(value)
+    return value in actual
+
+
+def compound_matches(element: Element, compound) -> bool:
+    tag, element_id, classes, attrs = compound
+    return ((tag is None or element.tag == tag)
+            and (element_id is None or element.id == element_id)
+            and classes <= element.classes
+            and all(attr_test(element, *attr) for attr in attrs))
+
+
+def chain_matches(element: Element, chain, index: int = 0) -> bool:
+    combinator, compound = chain[index]
+    if not compound_matches(element, compound):
+        return False
+    if index + 1 == len(chain):
+        return True
+    if combinator == '>':
+        return element.parent is not None and chain_matches(element.parent, chain, index + 1)
+    if combinator == ' ':
+        ancestor = element.parent
+        while ancestor is not None:
+            if chain_matches(ancestor, chain, index + 1):
+                return True
+            ancestor = ancestor.parent
+        return False
+    if combinator == '+':
+        return element.previous is not None and chain_matches(element.previous, chain, index + 1)
+    sibling = element.previous
+    while sibling is not None:
+        if chain_matches(sibling, chain, index + 1):
+            return True
+        sibling = sibling.previous
+    return False
+
+
+class ElementIndex:
+    """Elements bucketed by id, class and tag for selector lookups.
+
+    Classes in optional (added by scripts) are assumed present when needed.
+    """
+
+    def __init__(self, elements: list, optional: set = frozenset()):
+        self.elements = elements
+        self.optional = optional
+        self.by_id = {}
+        self.by_class = {}
+        self.by_tag = {}
+        for element in elements:
+            if element.id:
+                self.by_id.setdefault(element.id, []).append(element)
+            for name in element.classes:
+                self.by_class.setdefault(name, []).append(element)
+            self.by_tag.setdefault(element.tag, []).append(element)
+
+    def candidates(self, compound) -> list:
+        tag, element_id, classes, _ = compound
+        if element_id:
+            return self.by_id.get(element_id, [])
+        if classes:
+            return min((self.by_class.get(name, []) for name in classes), key=len)
+        if tag:
+            return self.by_tag.get(tag, [])
+        return self.elements
+
+    def chain(self, selector: str):
+        chain = parse_selector(selector)
+        if chain is None or not self.optional:
+            return chain
+        return [(combinator, (tag, element_id, classes - self.optional, attrs))
+                for combinator, (tag, element_id, classes, attrs) in chain]
+
+    def any_match(self, selector_list: str) -> bool:
+        for selector in split_selector_list(selector_list):
+            chain = self.chain(selector)
+            if chain is None:
+                return True  # unknown syntax: keep the rule up front
+            if any(chain_matches(element, chain) for element in self.candidates(chain[0][1])):
+                return True
+        return False
+
+    def matching(self, selector_list: str) -> list:
+        found = []
+        for selector in split_selector_list(selector_list):
+            chain = self.chain(selector)
+            if chain is not None:
+                found.extend(e for e in self.candidates(chain[0][1]) if chain_matches(e, chain))
+        return found
+
+
+def split_selector_list(selectors: str) -> list:
+    parts = []
+    depth = 0
+    start = 0
+    for i, char in enumerate(selectors):
+        if char in '([':
+            depth += 1
+        elif char in ')]':
+            depth -= 1
+        elif char == ',' and depth == 0:
+            parts.append(selectors[start:i])
+            start = i + 1
+    parts.append(selectors[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+def specificity(selector: str) -> tuple:
+    """(ids, classes, types) of one selector; :where() counts zero, :not/:is/:has their argument."""
+    selector = re.sub(r':where\((?:[^()]|\([^()]*\))*\)', '', selector)
+    selector = re.sub(r':(?:not|is|has|matches)\(((?:[^()]|\([^()]*\))*)\)', r' \1', selector)
+    selector = re.sub(r'\[[^\]]*\]', '.a', selector)
+    selector = re.sub(r'(?<!:):(before|after|first-line|first-letter)\b', r'::\1', selector)
+    ids = len(re.findall(r'#[-\w\\]+', selector))
+    pseudo_elements = len(re.findall(r'::[-\w]+', selector))
+    selector = re.sub(r'::[-\w]+', '', selector)
+    classes = len(re.findall(r'\.[-\w\\]+|:[-\w]+', selector))
+    types = len(re.findall(r'(?:^|[\s>+~(])([a-zA-Z][-\w]*)', selector)) + pseudo_elements
+    return ids, classes, types
+
+
+# --- Split / join ---------------------------------------------------------------
+
+def fold_end_of(content: str) -> int:
+    """Offset where the first viewport ends: after the first row of deal cards, if any."""
+    cards = extract_cards(content)
+    return cards[min(FIRST_ROW_CARDS, len(cards)) - 1].end if cards else 0
+
+
+def atomic_fixed_classes(content: str) -> set:
+    block = ATOMIC_BLOCK_RE.search(content)
+    if not block:
+        return set()
+    return {name for name, body in ATOMIC_RULE_RE.findall(block.group(0)) if FIXED_RE.search(body)}
+
+
+def mark_critical(rules: list, content: str):
+    """Set .critical and .repeat on rules for this page."""
+    elements = parse_page(content, fold_end_of(content), atomic_fixed_classes(content))
+    everything = ElementIndex(elements)
+    fixed = set()
+    for rule in rules:
+        if rule.body is not None and not rule.prelude.startswith('@') and FIXED_RE.search(rule.body):
+            fixed.update(id(e) for e in everything.matching(rule.prelude))
+    for element in elements:
+        ancestor = element
+        while ancestor is not None and not element.fold:
+            element.fold = id(ancestor) in fixed
+            ancestor = ancestor.parent
+    fold = ElementIndex([e for e in elements if e.fold], script_classes(content))
+
+    for rule in rules:
+        if rule.body is None:
+            rule.critical = True  # @import / @charset must stay first
+        elif not rule.prelude.startswith('@'):
+            rule.critical = fold.any_match(rule.prelude)
+
+    critical_text = ' '.join(rule.body for rule in rules if rule.critical and rule.body).lower()
+    for rule in rules:
+        prelude = rule.prelude.lower()
+        if prelude.startswith('@') and rule.body is not None:
+            if prelude.startswith(('@keyframes', '@-webkit-keyframes')):
+                name = rule.prelude.split(None, 1)[-1].strip().lower()
+                rule.critical = bool(re.search(r'(?<![-\w])' + re.escape(name) + r'(?![-\w])', critical_text))
+            elif prelude.startswith('@font-face'):
+                family = re.search(r'font-family\s*:\s*([\'"]?)([^;\'"]+)\1', rule.body, re.IGNORECASE)
+                rule.critical = not family or family.group(2).strip().lower() in critical_text
+            else:
+                rule.critical = True
+
+    # Deferred rules land after every critical one; repeat a critical rule in
+    # the deferred sheet when an earlier deferred (or repeated) rule could now
+    # beat it
+    earlier = {}
+    for rule in rules:
+        if rule.body is None or rule.prelude.startswith('@'):
+            continue
+        specs = {specificity(s) for s in split_selector_list(rule.prelude)}
+        if rule.critical:
+            rule.repeat = any(
+                important == mine_important and overlaps(prop, mine)
+                for spec in specs for prop, important in earlier.get(spec, ())
+                for mine, mine_important in rule.props)
+        if not rule.critical or rule.repeat:  # a repeated rule moves later too
+            for spec in specs:
+                earlier.setdefault(spec, set()).update(rule.props)
+
+
+def rebase_urls(css: str, prefix: str) -> str:
+    """Prefix relative url()s, for a sheet one directory below the page."""
+    return URL_RE.sub(lambda m: f"url({m.group(1)}{prefix}{m.group(2)}{m.group(1)})", css)
+
+
+def unbase_urls(css: str, prefix: str) -> str:
+    """Undo rebase_urls."""
+    def replace(match):
+        url = match.group(2)
+        if url.startswith(prefix):
+            url = url[len(prefix):]
+        return f"url({match.group(1)}{url}{match.group(1)})"
+    return URL_RE.sub(replace, css)
+
+
+def dedupe(rules: list) -> list:
+    """Drop rules repeated later in the same context (the later copy already wins)."""
+    seen = set()
+    kept = []
+    for rule in reversed(rules):
+        key = (rule.context, rule.prelude, rule.body)
+        if rule.body is not None and key in seen:
+            continue
+        seen.add(key)
+        kept.append(rule)
+    return kept[::-1]
+
+
+def join(content: str, page_dir: str, pending: dict = None) -> str:
+    """Put a split page's CSS back into one <style> block.
+
+    pending maps paths relative to the page to stylesheets not written yet,
+    which are read in place of the files on disk.
+    """
+    block = CRITICAL_BLOCK_RE.search(content)
+    if not block:
+        return content
+    if pending and pending.get(block.group(2)) is not None:
+        deferred = unbase_urls(pending[block.group(2)], '../')
+    else:
+        path = os.path.join(page_dir, block.group(2))
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                deferred = unbase_urls(f.read(), '../')
+        except OSError:
+            raise ValueError(f"deferred stylesheet {block.group(2)} is missing; cannot join")
+    css = serialize(dedupe(parse_css(block.group(1) + '\n' + deferred)))
+    return content[:block.start()] + f'<style>\n{css}\n    </style>' + content[block.end():]
+
+
+def split(content: str, page_path: str) -> tuple:
+    """Returns (content, {relative path: css or None to delete}, stats dict)."""
+    page_dir = os.path.dirname(os.path.abspath(page_path))
+    stem = os.path.splitext(os.path.basename(page_path))[0]
+    content = join(content, page_dir)
+    blocks = list(PLAIN_STYLE_RE.finditer(content))
+    stale = {os.path.relpath(p, page_dir): None
+             for p in glob.glob(os.path.join(page_dir, CSS_DIR, f'{glob.escape(stem)}.*.css'))
+             if re.fullmatch(re.escape(stem) + r'\.[0-9a-f]{8}\.css', os.path.basename(p))}
+    if not blocks:
+        return content, stale, {'original': 0, 'critical': 0, 'deferred': 0, 'rules': 0, 'duplicates': 0,
+                                'inlined': 0, 'repeated': 0}
+
+    original = '\n'.join(block.group(1) for block in blocks)
+    rules = dedupe(parse_css(original))
+    mark_critical(rules, content)
+    # Repeated rules go last, where join will leave them: a rule that is not
+    # repeated never competes with an earlier repeated one, so this keeps the
+    # cascade and makes split(join(split(page))) == split(page)
+    critical_css = serialize([rule for rule in rules if rule.critical and not rule.repeat]
+                             + [rule for rule in rules if rule.repeat])
+    deferred_css = rebase_urls(serialize([rule for rule in rules if not rule.critical or rule.repeat]), '../')
+    digest = hashlib.sha1(deferred_css.encode()).hexdigest()[:8]
+    href = f"{CSS_DIR}/{stem}.{digest}.css"
+
+    indent = re.match(r'[ \t]*', blocks[0].group(0)).group(0)
+    markup = (f'{indent}<style id="{STYLE_BLOCK_ID}">\n{critical_css}\n{indent}</style>\n'
+              f'{indent}<link rel="stylesheet" href="{href}" media="print" onload="this.media=\'all\'" data-deferred-css>\n'
+              f'{indent}<noscript><link rel="stylesheet" href="{href}"></noscript>\n')
+    pieces = [content[:blocks[0].start()], markup]
+    for previous, block in zip(blocks, blocks[1:]):
+        pieces.append(content[previous.end():block.start()])
+    pieces.append(content[blocks[-1].end():])
+
+    assets = dict(stale)
+    assets[href] = deferred_css
+    stats = {
+        'original': len(original.encode()),
+        'critical': len(critical_css.encode()),
+        'deferred': len(deferred_css.encode()),
+        'rules': len(rules),
+        'duplicates': len(parse_css(original)) - len(rules),
+        'inlined': sum(rule.critical for rule in rules),
+        'repeated': sum(rule.repeat for rule in rules),
+    }
+    return ''.join(pieces), assets, stats
+
+
+def write_assets(page_dir: str, assets: dict):
+    """Write (or, for None, delete) stylesheets relative to the page."""
+    for rel_path, text in assets.items():
+        path = os.path.join(page_dir, rel_path)
+        if text is None:
+            if os.path.exists(path):
+                os.remove(path)
+            continue
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    split_parser = subparsers.add_parser('split', help='inline first-viewport CSS, defer the rest')
+    split_parser.add_argument('pages', nargs='*', default=[DEALS_FILE])
+    split_parser.add_argument('--dry-run', action='store_true', help='report only, do not write')
+    join_parser = subparsers.add_parser('join', help='put the CSS back into one <style> block')
+    join_parser.add_argument('pages', nargs='*', default=[DEALS_FILE])
+    args = parser.parse_args()
+
+    for path in args.pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        page_dir = os.path.dirname(os.path.abspath(path))
+        try:
+            if args.command == 'join':
+                new_content, assets = join(content, page_dir), {}
+                print(f"✅ {path}: CSS joined" if new_content != content else f"⏭️  {path}: not split")
+            else:
+                new_content, assets, stats = split(content, path)
+        except ValueError as e:
+            print(f"❌ {path}: {e}")
+            sys.exit(1)
+
+        if args.command == 'split':
+            if not stats['rules']:
+                print(f"⏭️  {path}: no page <style> blocks")
+            else:
+                print(f"\n📄 {path}: {stats['original'] / 1024:.0f} KB of render-blocking CSS, {stats['rules']} rules "
+                      f"({stats['duplicates']} exact duplicates dropped)")
+                print(f"   inlined   {stats['critical'] / 1024:>7.1f} KB  {stats['inlined']} rules")
+                print(f"   deferred  {stats['deferred'] / 1024:>7.1f} KB  "
+                      f"{stats['rules'] - stats['inlined'] + stats['repeated']} rules "
+                      f"({stats['repeated']} repeated for cascade order)")
+                for rel_path, text in assets.items():
+                    if text is not None:
+                        print(f"   -> {rel_path}")
+            if args.dry_run:
+                continue
+        if new_content != content:
+            write_assets(page_dir, assets)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+
+
+if __name__ == '__main__':
+    main()
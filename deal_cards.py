@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+Single-pass deal card extractor for deals.html
+
+Tokenizes the page once, left to right, and yields a DealCard record for
+every <article data-deal-id="..."> it meets. Replaces the 8-12 separate
+re.search calls per card that every apply_*/fix_* script used to run.
+
+A page compacted by atomic_css.py keeps its declarations in ._N classes;
+the checks that read inline styles (badges, struck-through prices) see
+those declarations too, and card offsets still point into the page as it
+is on disk.
+"""
+
+import html
+import re
+import sys
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+
+DEALS_FILE = '/mnt/d/Websites/travel/deals.html'
+
+# One token per match: a comment, a start/end tag (attribute values may
+# contain '>' - the inline handlers use arrow functions), or a text run.
+# Leading whitespace is swallowed so indentation never reaches Python.
+TOKEN_RE = re.compile(
+    r'\s*(?:'
+    r'<!--.*?-->'
+    r'|<(/?)([a-zA-Z][a-zA-Z0-9]*)([^>"\']*(?:(?:"[^"]*"|\'[^\']*\')[^>"\']*)*)>'
+    r'|([^<]+)'
+    r'|<)',
+    re.DOTALL
+)
+ATTR_RE = re.compile(r'([a-zA-Z_:][-a-zA-Z0-9_:.]*)(?:\s*=\s*("[^"]*"|\'[^\']*\'|[^\s"\'>]+))?')
+NIGHTS_RE = re.compile(r'^(\d+)\s*Nights?$', re.IGNORECASE)
+PRICE_RE = re.compile(r'£\s*([0-9][0-9,]*)')
+DISCOUNT_RE = re.compile(r'^-\d+%\s*OFF$', re.IGNORECASE)
+CLASS_RE = re.compile(r'\sclass\s*=\s*(?:"([^"]*)"|\'([^\']*)\')', re.IGNORECASE)
+
+VOID_TAGS = {'img', 'br', 'hr', 'input', 'meta', 'link', 'source', 'wbr', 'path', 'circle', 'polyline'}
+
+# Info box labels and the DealCard field they fill
+LABELS = {
+    'vessel': 'ship',
+    'ship': 'ship',
+    'region': 'region',
+    'departure': 'departure',
+    'departs': 'departure',
+}
+
+
+@dataclass
+class DealCard:
+    """One deal card as it appears on the page"""
+    deal_id: str
+    position: int
+    title: str = ''
+    image: str = ''
+    image_alt: str = ''
+    logo: str = ''
+    cruise_line: str = ''
+    nights: Optional[int] = None
+    departure: str = ''
+    ship: str = ''
+    region: str = ''
+    price_label: str = ''
+    old_price: Optional[int] = None
+    new_price: Optional[int] = None
+    discount: str = ''
+    badges: List[str] = field(default_factory=list)
+    start: int = 0
+    end: int = 0
+    closed: bool = True
+
+    @property
+    def duration(self) -> str:
+        """Duration as printed on the card, e.g. '7 Nights'"""
+        if self.nights is None:
+            return ''
+        return f"{self.nights} Night{'s' if self.nights != 1 else ''}"
+
+
+def parse_attrs(attr_text: str) -> dict:
+    """Parse the attribute part of a start tag into a dict."""
+    attrs = {}
+    for name, value in ATTR_RE.findall(attr_text):
+        if value[:1] in ('"', "'"):
+            value = value[1:-1]
+        attrs[name.lower()] = html.unescape(value)
+    return attrs
+
+
+def atomic_styles(content: str) -> dict:
+    """{class: 'property: value'} of the page's atomic_css.py stylesheet, if it has one."""
+    if 'id="atomic-css"' not in content:
+        return {}
+    from atomic_css import ATOMIC_BLOCK_RE, ATOMIC_RULE_RE
+    block = ATOMIC_BLOCK_RE.search(content)
+    return dict(ATOMIC_RULE_RE.findall(block.group(0))) if block else {}
+
+
+def normalize_title(title: str) -> str:
+    """Normalize a title for matching: lower case, '&' as 'and', punctuation dropped."""
+    title = html.unescape(title).lower().replace('&', ' and ')
+    return ' '.join(re.sub(r'[^a-z0-9]+', ' ', title).split())
+
+
+def parse_price(text: str) -> Optional[int]:
+    """Turn '£5,300' into 5300."""
+    match = PRICE_RE.search(text)
+    return int(match.group(1).replace(',', '')) if match else None
+
+
+class _CardBuilder:
+    """Collects one card's fields while the tokenizer walks its article."""
+
+    def __init__(self, card: DealCard, atomic: dict = None):
+        self.card = card
+        self.atomic = atomic  # class -> declaration on compacted pages
+        self.stack = []  # (tag, raw attributes) of open elements inside the article
+        self.pending_label = None
+        self.title_parts = None
+        self.images = []
+        self.in_price_label = False
+
+    def start_tag(self, tag: str, attr_text: str):
+        if tag == 'img':
+            attrs = parse_attrs(attr_text)
+            self.images.append((attrs.get('src', ''), attrs.get('alt', '')))
+            return
+        if tag in ('h2', 'h3') and not self.card.title:
+            self.title_parts = []
+        if tag == 'p' and not self.card.price_label:
+            self.in_price_label = True
+        if tag not in VOID_TAGS and not attr_text.endswith('/'):
+            # Raw attribute text is enough for the style checks below, so
+            # only <img> and <article> tags pay for a full attribute parse
+            if self.atomic and 'class' in attr_text:
+                attr_text = self.with_atomic_styles(attr_text)
+            self.stack.append((tag, attr_text))
+
+    def with_atomic_styles(self, attr_text: str) -> str:
+        """Attribute text with the declarations of its atomic classes appended."""
+        match = CLASS_RE.search(' ' + attr_text)
+        if not match:
+            return attr_text
+        classes = (match.group(1) if match.group(1) is not None else match.group(2)).split()
+        declarations = [self.atomic[name] for name in classes if name in self.atomic]
+        return attr_text + ' ' + '; '.join(declarations) if declarations else attr_text
+
+    def end_tag(self, tag: str):
+        if tag in ('h2', 'h3') and self.title_parts is not None:
+            self.card.title = ' '.join(' '.join(self.title_parts).split())
+            self.title_parts = None
+        if tag == 'p':
+            self.in_price_label = False
+        # Pop back to the matching element; tolerate stray close tags
+        for i in range(len(self.stack) - 1, -1, -1):
+            if self.stack[i][0] == tag:
+                del self.stack[i:]
+                break
+
+    def text(self, raw: str):
+        text = ' '.join(html.unescape(raw).split())
+        card = self.card
+
+        if self.title_parts is not None:
+            self.title_parts.append(text)
+            return
+
+        if self.in_price_label:
+            card.price_label = text
+            return
+
+        if self.pending_label:
+            setattr(card, self.pending_label, text)
+            self.pending_label = None
+            return
+
+        label = LABELS.get(text.lower())
+        if label and not getattr(card, label):
+            self.pending_label = label
+            return
+
+        nights = NIGHTS_RE.match(text)
+        if nights and card.nights is None:
+            card.nights = int(nights.group(1))
+            return
+
+        if DISCOUNT_RE.match(text):
+            card.discount = text.upper().replace('  ', ' ')
+            return
+
+        tag, attr_text = self.stack[-1] if self.stack else ('', '')
+        if tag == 'span' and '£' in text:
+            if 'line-through' in attr_text:
+                card.old_price = parse_price(text)
+            elif card.new_price is None:
+                card.new_price = parse_price(text)
+            return
+
+        if 'position: absolute' in attr_text and 'left: 16px' in attr_text:
+            card.badges.append(text)
+
+    def finish(self, end: int, closed: bool = True) -> DealCard:
+        card = self.card
+        card.end = end
+        card.closed = closed
+        if self.title_parts is not None:
+            card.title = ' '.join(' '.join(self.title_parts).split())
+        if self.images:
+            card.image, card.image_alt = self.images[0]
+            logos = [img for img in self.images[1:] if 'logo' in img[0].lower()]
+            if logos:
+                card.logo, card.cruise_line = logos[0]
+            elif len(self.images) > 1:
+                card.logo, card.cruise_line = self.images[1]
+        if not card.title:
+            card.title = card.image_alt
+        return card
+
+
+def iter_cards(content: str, atomic: dict = None) -> Iterator[DealCard]:
+    """Yield every deal card in page order in a single pass over content.
+
+    Text between cards is skipped with str.find rather than tokenized. A
+    card whose </article> is missing is closed at the next <article>
+    (closed=False) instead of swallowing its neighbours. atomic defaults to
+    the page's own atomic classes; pass it when content is only part of a
+    compacted page.
+    """
+    if atomic is None:
+        atomic = atomic_styles(content)
+    builder = None
+    position = 0
+    pos = content.find('<article')
+
+    while pos != -1:
+        for match in TOKEN_RE.finditer(content, pos):
+            closing, tag, attr_text, text = match.groups()
+
+            if text is not None:
+                if builder is not None:
+                    builder.text(text)
+                continue
+            if tag is None:
+                continue  # comment or stray '<'
+
+            tag = tag.lower()
+            if tag == 'article':
+                if closing:
+                    if builder is not None:
+                        yield builder.finish(match.end())
+                        builder = None
+                        pos = content.find('<article', match.end())
+                        break
+                    continue
+                attrs = parse_attrs(attr_text)
+                if 'data-deal-id' not in attrs:
+                    continue
+                if builder is not None:
+                    yield builder.finish(match.start(), closed=False)
+                position += 1
+                builder = _CardBuilder(DealCard(
+                    deal_id=attrs['data-deal-id'],
+                    position=position,
+                    start=match.start(),
+                ), atomic)
+                continue
+
+            if builder is None:
+                # An <article> without data-deal-id; look for the next one
+                pos = content.find('<article', match.end())
+                break
+            if closing:
+                builder.end_tag(tag)
+            else:
+                builder.start_tag(tag, attr_text.rstrip())
+        else:
+            pos = -1
+
+    if builder is not None:
+        yield builder.finish(len(content), closed=False)
+
+
+def extract_cards(content: str, atomic: dict = None) -> List[DealCard]:
+    """Extract all deal cards from a page."""
+    return list(iter_cards(content, atomic))
+
+
+def read_cards(filepath: str = DEALS_FILE) -> List[DealCard]:
+    """Read a page from disk and extract its deal cards."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return extract_cards(f.read())
+
+
+def main():
+    filepath = sys.argv[1] if len(sys.argv) > 1 else DEALS_FILE
+
+    cards = read_cards(filepath)
+    print(f"📊 Extracted {len(cards)} cards from {filepath}\n")
+    for card in cards:
+        flag = '' if card.closed else '  ⚠️  UNCLOSED'
+        print(f"  [{card.deal_id:>4}] {card.title[:55]:<55} {card.duration:<10} "
+              f"£{card.new_price or '-'}{flag}")
+
+
+if __name__ == '__main__':
+    main()
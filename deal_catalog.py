@@ -0,0 +1,322 @@
+#!/usr/bin/env python3
+"""
+Canonical deal catalog for deals.html
+
+The catalog (deal_catalog.json) is the single source of truth for deal data.
+It is populated once from the existing page and the card grid is rendered
+from it, so re-theming is a pure render step instead of another round of
+regex-extract-and-substitute on deals.html. Each render also refreshes the
+filter facet index after the grid (deal_facets.py). Prices, discounts and the
+"Save £" badge are taken from deal_pricing.csv when it exists.
+
+Usage:
+    python3 deal_catalog.py import [deals.html]     # page -> catalog
+    python3 deal_catalog.py render [--theme opulent] [--output out.html]
+    python3 deal_catalog.py build [--theme opulent] [--force]  # incremental
+    python3 deal_catalog.py list
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict
+
+from card_templates import DEFAULT_FEATURES, DEFAULT_THEME, THEMES, render_card
+from deal_cards import DEALS_FILE, extract_cards
+from deal_facets import splice_facet_index
+from deal_pricing import PRICING_FILE, apply_pricing, load_pricing
+
+CATALOG_FILE = os.path.join(os.path.dirname(DEALS_FILE), 'deal_catalog.json')
+MANIFEST_FILE = os.path.join(os.path.dirname(DEALS_FILE), 'deal_build_manifest.json')
+CATALOG_VERSION = 1
+
+GRID_START = '<!-- DEAL GRID START -->'
+GRID_END = '<!-- DEAL GRID END -->'
+GRID_INDENT = '\n                        '
+
+# DealCard fields that describe the page, not the deal
+PAGE_FIELDS = ('position', 'start', 'end', 'closed')
+
+
+def read_file(filepath: str) -> str:
+    """Read the entire file."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def write_file(filepath: str, content: str):
+    """Write content to file."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(content)
+
+
+def load_catalog(filepath: str = CATALOG_FILE) -> dict:
+    """Load the catalog; deals are kept in page order."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        catalog = json.load(f)
+    if catalog.get('version') != CATALOG_VERSION:
+        raise ValueError(f"Unsupported catalog version {catalog.get('version')} in {filepath}")
+    return catalog
+
+
+def save_catalog(catalog: dict, filepath: str = CATALOG_FILE):
+    """Write the catalog atomically so an interrupted run never truncates it."""
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp_path, filepath)
+
+
+def card_to_record(card) -> dict:
+    """Convert an extracted DealCard into a catalog record."""
+    record = asdict(card)
+    for name in PAGE_FIELDS:
+        record.pop(name)
+    record['features'] = list(DEFAULT_FEATURES)
+    return record
+
+
+def find_duplicate_ids(deals: list) -> list:
+    """Return deal ids that appear more than once."""
+    seen = set()
+    duplicates = []
+    for deal in deals:
+        if deal['deal_id'] in seen and deal['deal_id'] not in duplicates:
+            duplicates.append(deal['deal_id'])
+        seen.add(deal['deal_id'])
+    return duplicates
+
+
+def import_from_html(html_path: str) -> dict:
+    """Build a catalog from the cards currently on a page."""
+    cards = extract_cards(read_file(html_path))
+    for card in cards:
+        if not card.closed:
+            print(f"  ⚠️  Card {card.deal_id} ({card.title}) has no </article>")
+    return {
+        'version': CATALOG_VERSION,
+        'source': os.path.basename(html_path),
+        'deals': [card_to_record(card) for card in cards],
+    }
+
+
+def render_grid(deals: list, theme: str = DEFAULT_THEME) -> str:
+    """Render the whole card grid, wrapped in the grid markers."""
+    cards = []
+    for position, deal in enumerate(deals, 1):
+        cards.append(render_card(dict(deal, position=position), theme))
+    return GRID_START + GRID_INDENT + ('\n' + GRID_INDENT).join(cards) + GRID_INDENT + GRID_END
+
+
+def priced_deals(deals: list, pricing_path: str) -> list:
+    """Catalog deals with prices from the shared pricing table, if there is one."""
+    if not os.path.exists(pricing_path):
+        return deals
+    return apply_pricing(deals, load_pricing(pricing_path))
+
+
+def card_span(content: str, card) -> tuple:
+    """(start, end) of a card, including its '<!-- Deal Card ... -->' comment."""
+    start = card.start
+    comment = content.rfind('<!-- Deal Card', 0, start)
+    if comment != -1 and not content[content.find('-->', comment) + 3:start].strip():
+        start = comment
+    return start, card.end
+
+
+def find_grid_span(content: str) -> tuple:
+    """Locate the card grid in a page as (start, end) offsets.
+
+    Uses the grid markers when a previous render left them; otherwise spans
+    the first to last card, including the first card's comment line.
+    """
+    start = content.find(GRID_START)
+    if start != -1:
+        end = content.find(GRID_END, start)
+        if end == -1:
+            raise ValueError(f"{GRID_START} found without {GRID_END}")
+        return start, end + len(GRID_END)
+
+    cards = extract_cards(content)
+    if not cards:
+        raise ValueError("No deal cards found to replace")
+    return card_span(content, cards[0])[0], cards[-1].end
+
+
+def splice_grid(content: str, grid_html: str) -> str:
+    """Replace the card grid in a page with freshly rendered markup."""
+    start, end = find_grid_span(content)
+    return content[:start] + grid_html + content[end:]
+
+
+def deal_keys(deal_ids: list) -> list:
+    """Unique build keys for deal ids; repeats of an id get '#2', '#3'..."""
+    counts = {}
+    keys = []
+    for deal_id in deal_ids:
+        counts[deal_id] = counts.get(deal_id, 0) + 1
+        keys.append(deal_id if counts[deal_id] == 1 else f"{deal_id}#{counts[deal_id]}")
+    return keys
+
+
+def card_hash(deal: dict, position: int, theme: str) -> str:
+    """Hash of everything a rendered card depends on: data, position and template."""
+    version = THEMES[theme][0]
+    payload = json.dumps([deal, position, theme, version], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def markup_hashes(content: str) -> dict:
+    """Hash of each card's markup as it stands in the grid, by build key."""
+    grid_start = content.find(GRID_START)
+    grid_end = content.find(GRID_END, grid_start)
+    if grid_start == -1 or grid_end == -1:
+        return {}
+    grid = content[grid_start:grid_end]
+    cards = extract_cards(grid)
+    keys = deal_keys([card.deal_id for card in cards])
+    hashes = {}
+    for key, card in zip(keys, cards):
+        start, end = card_span(grid, card)
+        hashes[key] = hashlib.sha256(grid[start:end].encode('utf-8')).hexdigest()[:16]
+    return hashes
+
+
+def load_manifest(filepath: str = MANIFEST_FILE) -> dict:
+    """Load the hashes recorded by the previous build, if any."""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_incremental(content: str, deals: list, theme: str, manifest: dict) -> tuple:
+    """Re-render only the cards whose hash changed since the last build.
+
+    A card is also re-rendered when its markup on the page no longer
+    matches what the last build wrote (a hand edit to deals.html). Falls
+    back to a full grid render when the page has no grid markers or its
+    cards no longer line up one-to-one with the catalog.
+    Returns (new content, new manifest, rendered count, skipped count).
+    """
+    keys = deal_keys([deal['deal_id'] for deal in deals])
+    hashes = {key: card_hash(deal, position, theme)
+              for position, (key, deal) in enumerate(zip(keys, deals), 1)}
+
+    grid_start = content.find(GRID_START)
+    grid_end = content.find(GRID_END, grid_start)
+    cards = extract_cards(content[grid_start:grid_end]) if grid_start != -1 and grid_end != -1 else []
+    page_keys = deal_keys([card.deal_id for card in cards])
+
+    if page_keys != keys or manifest.get('theme') != theme:
+        content = splice_facet_index(splice_grid(content, render_grid(deals, theme)), deals)
+        return content, {'theme': theme, 'cards': hashes, 'markup': markup_hashes(content)}, len(deals), 0
+
+    old_hashes = manifest.get('cards', {})
+    old_markup = manifest.get('markup', {})
+    page_markup = markup_hashes(content)
+    pieces = []
+    last = 0
+    rendered = 0
+    grid = content[grid_start:grid_end]
+    for position, (key, deal, card) in enumerate(zip(keys, deals, cards), 1):
+        if old_hashes.get(key) == hashes[key] and old_markup.get(key) == page_markup.get(key):
+            continue
+        start, end = card_span(grid, card)
+        pieces.append(grid[last:start])
+        pieces.append(render_card(dict(deal, position=position), theme))
+        last = end
+        rendered += 1
+    pieces.append(grid[last:])
+
+    content = content[:grid_start] + ''.join(pieces) + content[grid_end:]
+    if rendered:
+        content = splice_facet_index(content, deals)
+        page_markup = markup_hashes(content)
+    return content, {'theme': theme, 'cards': hashes, 'markup': page_markup}, rendered, len(deals) - rendered
+
+
+def cmd_import(args):
+    print(f"📊 Importing deals from {args.html}...")
+    catalog = import_from_html(args.html)
+    duplicates = find_duplicate_ids(catalog['deals'])
+    if duplicates:
+        print(f"  ⚠️  Duplicate deal ids: {', '.join(duplicates)}")
+    save_catalog(catalog, args.catalog)
+    print(f"✅ Wrote {len(catalog['deals'])} deals to {args.catalog}")
+
+
+def cmd_render(args):
+    catalog = load_catalog(args.catalog)
+    deals = priced_deals(catalog['deals'], args.pricing)
+    print(f"🎨 Rendering {len(deals)} deals with the '{args.theme}' theme...")
+
+    content = splice_grid(read_file(args.html), render_grid(deals, args.theme))
+    content = splice_facet_index(content, deals)
+    output = args.output or args.html
+    write_file(output, content)
+    print(f"✅ Wrote {output}")
+
+
+def cmd_build(args):
+    catalog = load_catalog(args.catalog)
+    deals = priced_deals(catalog['deals'], args.pricing)
+    manifest = {} if args.force else load_manifest(args.manifest)
+    print(f"🔨 Building {len(deals)} deals with the '{args.theme}' theme...")
+
+    content, manifest, rendered, skipped = build_incremental(read_file(args.html), deals, args.theme, manifest)
+    if rendered:
+        write_file(args.html, content)
+    with open(args.manifest, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"✅ Rendered {rendered} cards, skipped {skipped} unchanged")
+
+
+def cmd_list(args):
+    catalog = load_catalog(args.catalog)
+    for deal in catalog['deals']:
+        price = f"£{deal['new_price']}" if deal.get('new_price') is not None else '-'
+        print(f"  [{deal['deal_id']:>4}] {deal['title'][:55]:<55} {price}")
+    print(f"\n{len(catalog['deals'])} deals")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--catalog', default=CATALOG_FILE, help='catalog JSON file')
+    parser.add_argument('--pricing', default=PRICING_FILE, help='pricing CSV (deal_pricing.py)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='populate the catalog from a page')
+    import_parser.add_argument('html', nargs='?', default=DEALS_FILE)
+    import_parser.set_defaults(func=cmd_import)
+
+    render_parser = subparsers.add_parser('render', help='render the card grid into a page')
+    render_parser.add_argument('--html', default=DEALS_FILE, help='page holding the card grid')
+    render_parser.add_argument('--output', help='write here instead of overwriting --html')
+    render_parser.add_argument('--theme', default=DEFAULT_THEME, choices=sorted(THEMES))
+    render_parser.set_defaults(func=cmd_render)
+
+    build_parser = subparsers.add_parser('build', help='re-render only cards whose data changed')
+    build_parser.add_argument('--html', default=DEALS_FILE, help='page holding the card grid')
+    build_parser.add_argument('--manifest', default=MANIFEST_FILE, help='per-card hash manifest')
+    build_parser.add_argument('--theme', default=DEFAULT_THEME, choices=sorted(THEMES))
+    build_parser.add_argument('--force', action='store_true', help='ignore the manifest and render every card')
+    build_parser.set_defaults(func=cmd_build)
+
+    list_parser = subparsers.add_parser('list', help='list catalog deals')
+    list_parser.set_defaults(func=cmd_list)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
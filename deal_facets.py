@@ -0,0 +1,445 @@
+#!/usr/bin/env python3
+"""
+Facet attributes and a bitset filter index for the deals grid
+
+applyFilters() used to lowercase every card's textContent on each filter
+change and guess durations with regexes such as /1[1-4]\\s+nights?/, so
+"11 Nights" also matched the 1-5 range via "1 Nights", and cruise lines were
+substring-matched against label text. Instead, each <article> carries
+normalized data-nights, data-line, data-region, data-departure and
+data-price attributes, and the page embeds a facet index:
+
+    <script type="application/json" id="deal-facets">
+    {"version": 1, "count": 27, "ids": [...], "price": [4549, ...],
+     "facets": {"line": {"seabourn": "<base64 bitset>", ...}, ...}}
+
+Each bitset has bit i set when card i (document order) has that value,
+little-endian, padded to whole 32-bit words. Filtering is then an OR of the
+checked values within a facet and an AND across facets, with no DOM text
+read at all. The filter checkboxes get data-facet / data-key attributes
+computed with the same normalization, and applyFilters() is replaced by the
+bitset version (FILTER_JS). If the index is missing or does not match the
+cards on the page, the script rebuilds the bitsets from the data-*
+attributes once.
+
+Usage:
+    python3 deal_facets.py                   # annotate deals.html in place
+    python3 deal_facets.py page.html --dry-run
+"""
+
+import argparse
+import base64
+import json
+import re
+import sys
+from dataclasses import asdict
+from html import escape, unescape
+
+from deal_cards import DEALS_FILE, extract_cards
+
+INDEX_VERSION = 1
+INDEX_ID = 'deal-facets'
+FACETS = ('nights', 'line', 'region', 'departure')  # bitset facets; price is kept as a plain array
+FACET_ATTRS = FACETS + ('price',)
+
+# Trailing words cruise lines are written with or without ("Azamara Cruises"
+# on a card, "Azamara" in the filter; "Viking" vs "Viking Ocean Cruises")
+GENERIC_LINE_WORDS = {'cruises', 'cruise', 'ocean', 'voyages', 'line'}
+PLACEHOLDER_LINES = {'cruise line'}
+MONTHS = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec']
+
+# Sidebar groups (by their '<!-- ... Filter -->' comment) -> facet
+FILTER_GROUPS = {'Duration': 'nights', 'Cruise Line': 'line', 'Destination': 'region'}
+
+INDEX_RE = re.compile(r'[ \t]*<script type="application/json" id="' + INDEX_ID + r'">.*?</script>\n?', re.DOTALL)
+ARTICLE_TAG_RE = re.compile(r'<article\b(?:[^>"\']|"[^"]*"|\'[^\']*\')*>')
+FACET_ATTR_RE = re.compile(r'\s+data-(?:' + '|'.join(FACET_ATTRS) + r')="[^"]*"')
+FILTER_COMMENT_RE = re.compile(r'<!--\s*([^>]*?)\s+Filter\s*-->')
+CHECKBOX_RE = re.compile(r'(<input\b[^>]*?type="checkbox")([^>]*>\s*<span>([^<]*)</span>)')
+INPUT_FACET_RE = re.compile(r'\s+data-(?:facet|key)="[^"]*"')
+DEPARTURE_INPUT_RE = re.compile(r'<input\b[^>]*?type="text"[^>]*>')
+YEAR_RE = re.compile(r'\b(\d{4})\b')
+MONTH_RE = re.compile(r'\b(' + '|'.join(MONTHS) + r')[a-z]*\b', re.IGNORECASE)
+APPLY_FILTERS_RE = re.compile(r'function applyFilters\(\)\s*\{')
+FILTER_JS_START = '// DEAL FACETS START'
+FILTER_JS_END = '// DEAL FACETS END'
+
+FILTER_JS = FILTER_JS_START + r'''
+        // Filtering over the build-time facet index (deal_facets.py): one
+        // bitset per facet value, OR within a facet, AND across facets
+        let dealFacets = null;
+
+        function loadDealFacets() {
+            const cards = Array.from(document.querySelectorAll('article[data-deal-id]'));
+            const words = Math.ceil(cards.length / 32);
+            const facets = {};
+            let index = null;
+            const script = document.getElementById('deal-facets');
+            try {
+                index = script ? JSON.parse(script.textContent) : null;
+            } catch (e) {
+                index = null;
+            }
+
+            if (index && index.ids.join('\n') === cards.map(card => card.getAttribute('data-deal-id')).join('\n')) {
+                Object.keys(index.facets).forEach(facet => {
+                    facets[facet] = {};
+                    Object.keys(index.facets[facet]).forEach(value => {
+                        const bytes = atob(index.facets[facet][value]);
+                        const bits = new Uint32Array(words);
+                        for (let i = 0; i < bytes.length; i++) {
+                            bits[i >> 2] |= bytes.charCodeAt(i) << ((i & 3) * 8);
+                        }
+                        facets[facet][value] = bits;
+                    });
+                });
+            } else {
+                // No index, or the grid changed after the build: use the card attributes
+                cards.forEach((card, i) => {
+                    ['nights', 'line', 'region', 'departure'].forEach(facet => {
+                        const value = card.getAttribute('data-' + facet);
+                        if (!value) return;
+                        const values = facets[facet] || (facets[facet] = {});
+                        const bits = values[value] || (values[value] = new Uint32Array(words));
+                        bits[i >> 5] |= 1 << (i & 31);
+                    });
+                });
+            }
+            return { cards: cards, words: words, facets: facets };
+        }
+
+        // OR of the bitsets of the given values of one facet
+        function facetUnion(facet, values) {
+            const result = new Uint32Array(dealFacets.words);
+            const bitsets = dealFacets.facets[facet] || {};
+            values.forEach(value => {
+                const bits = bitsets[value];
+                if (!bits) return;
+                for (let w = 0; w < result.length; w++) {
+                    result[w] |= bits[w];
+                }
+            });
+            return result;
+        }
+
+        // 'May 2026', '2026-05-14', '14/05/2026', '2026', 'may' -> { year, month }
+        function parseDepartureQuery(text) {
+            text = text.trim().toLowerCase();
+            let match = text.match(/(\d{4})-(\d{1,2})/);
+            if (match) return { year: match[1], month: match[2].padStart(2, '0') };
+            match = text.match(/(\d{1,2})\/(\d{4})/);
+            if (match) return { year: match[2], month: match[1].padStart(2, '0') };
+
+            const months = ['jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'];
+            const year = (text.match(/\b(\d{4})\b/) || [])[1] || '';
+            const monthIndex = months.findIndex(name => new RegExp('\\b' + name).test(text));
+            const month = monthIndex === -1 ? '' : String(monthIndex + 1).padStart(2, '0');
+            return year || month ? { year: year, month: month } : null;
+        }
+
+        function applyFilters() {
+            if (!dealFacets) dealFacets = loadDealFacets();
+            const facets = dealFacets.facets;
+            const checked = facet => Array.from(
+                document.querySelectorAll('aside input[data-facet="' + facet + '"]:checked'));
+            const selections = [];
+
+            // Duration checkboxes carry 'min-max' night ranges
+            const ranges = checked('nights').map(cb => cb.value.split('-').map(Number));
+            if (ranges.length) {
+                selections.push(facetUnion('nights', Object.keys(facets.nights || {}).filter(
+                    nights => ranges.some(range => Number(nights) >= range[0] && Number(nights) <= range[1]))));
+            }
+
+            ['line', 'region'].forEach(facet => {
+                const keys = checked(facet).map(cb => cb.getAttribute('data-key'));
+                if (keys.length) selections.push(facetUnion(facet, keys));
+            });
+
+            // Departures are 'YYYY-MM', or 'YYYY' when the card gives no month
+            const departureInput = document.querySelector('aside input[data-facet="departure"]');
+            const query = parseDepartureQuery(departureInput ? departureInput.value : '');
+            if (query) {
+                selections.push(facetUnion('departure', Object.keys(facets.departure || {}).filter(key => {
+                    const parts = key.split('-');
+                    return (!query.year || parts[0] === query.year) &&
+                        (!query.month || !parts[1] || parts[1] === query.month);
+                })));
+            }
+
+            const shown = new Uint32Array(dealFacets.words).fill(0xFFFFFFFF);
+            selections.forEach(bits => {
+                for (let w = 0; w < shown.length; w++) {
+                    shown[w] &= bits[w];
+                }
+            });
+
+            // Only touch cards whose state changed; showPage() sets display
+            const matches = [];
+            dealFacets.cards.forEach((card, i) => {
+                const pass = shown[i >> 5] & (1 << (i & 31));
+                if (pass) matches.push(i);
+                const filtered = pass ? 'false' : 'true';
+                if (card.getAttribute('data-filtered') !== filtered) {
+                    card.setAttribute('data-filtered', filtered);
+                }
+            });
+
+            // Hand the matching indexes to the pagination script (deal_pagination.py)
+            if (typeof setDealFilter === 'function') setDealFilter(matches);
+            showPage(1); // Go back to first page after filtering
+        }
+        ''' + FILTER_JS_END
+
+
+def slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', unescape(text).lower()).strip('-')
+
+
+def line_key(name: str) -> str:
+    """'Azamara Cruises' and 'Azamara' -> 'azamara'; the 'Cruise Line' placeholder -> ''."""
+    if not name or name.strip().lower() in PLACEHOLDER_LINES:
+        return ''
+    words = slug(name).split('-')
+    while len(words) > 1 and words[-1] in GENERIC_LINE_WORDS:
+        words.pop()
+    return '-'.join(words)
+
+
+def departure_key(departure: str) -> str:
+    """'May 2026' -> '2026-05', '2026' -> '2026', anything without a year -> ''."""
+    year = YEAR_RE.search(departure or '')
+    if not year:
+        return ''
+    month = MONTH_RE.search(departure)
+    if not month:
+        return year.group(1)
+    return f"{year.group(1)}-{MONTHS.index(month.group(1).lower()) + 1:02d}"
+
+
+def facet_values(deal: dict) -> dict:
+    """Normalized facet values of a catalog record or DealCard dict; '' when unknown."""
+    nights = deal.get('nights')
+    price = deal.get('new_price')
+    return {
+        'nights': str(nights) if nights is not None else '',
+        'line': line_key(deal.get('cruise_line') or ''),
+        'region': slug(deal.get('region') or ''),
+        'departure': departure_key(deal.get('departure') or ''),
+        'price': str(price) if price is not None else '',
+    }
+
+
+def facet_attrs(deal: dict) -> str:
+    """The data-* attributes for a card's <article> tag, each with a leading space."""
+    return ''.join(f' data-{name}="{escape(value)}"' for name, value in facet_values(deal).items() if value)
+
+
+def encode_bitset(positions: list, count: int) -> str:
+    mask = 0
+    for position in positions:
+        mask |= 1 << position
+    return base64.b64encode(mask.to_bytes((count + 31) // 32 * 4, 'little')).decode('ascii')
+
+
+def build_facet_index(deals: list) -> dict:
+    """Facet index over deals in page order."""
+    positions = {facet: {} for facet in FACETS}
+    prices = []
+    for i, deal in enumerate(deals):
+        values = facet_values(deal)
+        for facet in FACETS:
+            if values[facet]:
+                positions[facet].setdefault(values[facet], []).append(i)
+        prices.append(int(values['price']) if values['price'] else None)
+    return {
+        'version': INDEX_VERSION,
+        'count': len(deals),
+        'ids': [str(deal['deal_id']) for deal in deals],
+        'price': prices,
+        'facets': {facet: {value: encode_bitset(found, len(deals)) for value, found in sorted(values.items())}
+                   for facet, values in positions.items()},
+    }
+
+
+def render_facet_index(deals: list) -> str:
+    data = json.dumps(build_facet_index(deals), separators=(',', ':'), ensure_ascii=False).replace('</', '<\\/')
+    return f'<script type="application/json" id="{INDEX_ID}">{data}</script>'
+
+
+def splice_facet_index(content: str, deals: list) -> str:
+    """Put the index right after the card grid, replacing any previous one."""
+    from deal_catalog import GRID_END
+
+    content = INDEX_RE.sub('', content)
+    grid_end = content.find(GRID_END)
+    if grid_end != -1:
+        at = grid_end + len(GRID_END)
+    else:
+        cards = extract_cards(content)
+        if not cards:
+            return content
+        at = cards[-1].end
+    return content[:at] + '\n                        ' + render_facet_index(deals) + content[at:]
+
+
+def annotate_cards(content: str, cards: list) -> tuple:
+    """Write the facet attributes into each card's opening tag; returns (content, cards changed)."""
+    pieces = []
+    last = 0
+    changed = 0
+    for card in cards:
+        tag = ARTICLE_TAG_RE.match(content, card.start)
+        if not tag:
+            continue
+        old_tag = tag.group(0)
+        new_tag = FACET_ATTR_RE.sub('', old_tag[:-1]) + facet_attrs(asdict(card)) + '>'
+        if new_tag == old_tag:
+            continue
+        pieces.append(content[last:tag.start()])
+        pieces.append(new_tag)
+        last = tag.end()
+        changed += 1
+    pieces.append(content[last:])
+    return ''.join(pieces), changed
+
+
+def annotate_filters(content: str) -> tuple:
+    """Tag the sidebar filter inputs with their facet; returns (content, inputs changed)."""
+    aside_start = content.find('<aside')
+    aside_end = content.find('</aside>', aside_start)
+    if aside_start == -1 or aside_end == -1:
+        return content, 0
+    aside = content[aside_start:aside_end]
+    tagged = 0
+
+    def tag_checkbox(facet):
+        def replace(match):
+            nonlocal tagged
+            attrs = f' data-facet="{facet}"'
+            if facet != 'nights':
+                key = line_key(match.group(3)) if facet == 'line' else slug(match.group(3))
+                attrs += f' data-key="{key}"'
+            new_html = INPUT_FACET_RE.sub('', match.group(1)) + attrs + INPUT_FACET_RE.sub('', match.group(2))
+            if new_html != match.group(0):
+                tagged += 1
+            return new_html
+        return replace
+
+    comments = list(FILTER_COMMENT_RE.finditer(aside))
+    pieces = []
+    last = 0
+    for i, comment in enumerate(comments):
+        facet = FILTER_GROUPS.get(comment.group(1))
+        if not facet:
+            continue
+        group_end = comments[i + 1].start() if i + 1 < len(comments) else len(aside)
+        pieces.append(aside[last:comment.end()])
+        pieces.append(CHECKBOX_RE.sub(tag_checkbox(facet), aside[comment.end():group_end]))
+        last = group_end
+    pieces.append(aside[last:])
+    aside = ''.join(pieces)
+
+    # The 'Departure Date' text box
+    departure = DEPARTURE_INPUT_RE.search(aside)
+    if departure:
+        old_input = departure.group(0)
+        new_input = old_input.replace('type="text"', 'type="text" data-facet="departure"', 1) \
+            if 'data-facet=' not in old_input else old_input
+        if new_input != old_input:
+            aside = aside[:departure.start()] + new_input + aside[departure.end():]
+            tagged += 1
+
+    return content[:aside_start] + aside + content[aside_end:], tagged
+
+
+def function_end(content: str, open_brace: int) -> int:
+    """Offset just past the '}' closing the brace at open_brace, skipping strings and comments."""
+    depth = 0
+    i = open_brace
+    while i < len(content):
+        char = content[i]
+        if content.startswith('//', i):
+            i = content.find('\n', i)
+            if i == -1:
+                break
+        elif content.startswith('/*', i):
+            i = content.find('*/', i) + 1
+            if i == 0:
+                break
+        elif char in '\'"`':
+            i += 1
+            while i < len(content) and content[i] != char:
+                i += 2 if content[i] == '\\' else 1
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    raise ValueError("Unbalanced braces in applyFilters()")
+
+
+def replace_filter_js(content: str) -> tuple:
+    """Swap applyFilters() for FILTER_JS; returns (content, replaced)."""
+    start = content.find(FILTER_JS_START)
+    if start != -1:
+        end = content.find(FILTER_JS_END, start)
+        if end == -1:
+            raise ValueError(f"{FILTER_JS_START} found without {FILTER_JS_END}")
+        end += len(FILTER_JS_END)
+    else:
+        match = APPLY_FILTERS_RE.search(content)
+        if not match:
+            return content, False
+        start, end = match.start(), function_end(content, match.end() - 1)
+    if content[start:end] == FILTER_JS:
+        return content, False
+    return content[:start] + FILTER_JS + content[end:], True
+
+
+def add_facets(content: str) -> tuple:
+    """Facet attributes, index, filter annotations and filter script for an existing page.
+
+    Returns (content, stats dict).
+    """
+    cards = extract_cards(content)
+    content, changed = annotate_cards(content, cards)
+    cards = extract_cards(content)
+    content = splice_facet_index(content, [asdict(card) for card in cards])
+    content, inputs = annotate_filters(content)
+    content, replaced = replace_filter_js(content)
+    return content, {'cards': len(cards), 'changed': changed, 'inputs': inputs, 'script': replaced}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('html', nargs='?', default=DEALS_FILE)
+    parser.add_argument('--dry-run', action='store_true', help='report only, do not write')
+    args = parser.parse_args()
+
+    try:
+        with open(args.html, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content, stats = add_facets(content)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"🏷️  {stats['changed']}/{stats['cards']} cards given facet attributes, "
+          f"{stats['inputs']} filter inputs tagged")
+    if stats['script']:
+        print("🔁 applyFilters() replaced with the bitset filter")
+    if new_content == content:
+        print("✅ Already up to date")
+    elif args.dry_run:
+        print("(dry run - nothing written)")
+    else:
+        with open(args.html, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        print(f"✅ Wrote {args.html}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Fuzzy title index for resolving deal records to cards
+
+Scripts and feeds name deals by title, and those titles arrive truncated
+("... to Coral-La"), re-cased or shared by two sailings ("Athens to
+Civitavecchia"). TitleIndex resolves a title, optionally narrowed by ship
+and departure, to exactly one card through an exact key, a prefix, or
+trigram similarity, and reports every candidate when it cannot decide
+instead of silently picking the first.
+
+Usage:
+    python3 deal_match.py find "Athens to Civitavecchia" --ship "Silver Muse"
+    python3 deal_match.py audit          # check the titles the fix scripts use
+    python3 deal_match.py bench [cards]
+"""
+
+import argparse
+import ast
+import bisect
+import os
+import random
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+from deal_cards import extract_cards, normalize_title
+
+# Fuzzy matches need this Dice similarity, and must beat the runner-up by
+# the margin, to count as unique
+MIN_SCORE = 0.5
+AMBIGUITY_MARGIN = 0.1
+# Shorter queries are too vague to match as a prefix
+MIN_PREFIX_LENGTH = 8
+
+
+def trigrams(key: str) -> set:
+    """Character trigrams of a normalized title, padded at the word edges."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def tokens_match(query: str, value: str) -> bool:
+    """True if every word of the query appears in the value ('muse' in 'Silver Muse')."""
+    return set(normalize_title(query).split()) <= set(normalize_title(value or '').split())
+
+
+@dataclass
+class Match:
+    """Outcome of resolving one title."""
+    query: str
+    method: str  # 'exact', 'prefix', 'fuzzy' or 'none'
+    deal_id: Optional[str] = None
+    position: Optional[int] = None  # 1-based card position on the page
+    score: float = 0.0
+    candidates: list = field(default_factory=list)  # [(position, deal_id, title, score)]
+    shared_id: bool = False  # the matched card's deal id is used by another card too
+
+    @property
+    def ambiguous(self) -> bool:
+        return self.position is None and len(self.candidates) > 1
+
+
+class TitleIndex:
+    """Exact, prefix and trigram lookups over card titles."""
+
+    def __init__(self, deals: list):
+        self.deals = deals
+        self.keys = [normalize_title(deal['title']) for deal in deals]
+        self.by_key = {}
+        self.by_id = Counter(deal['deal_id'] for deal in deals)
+        self.grams = []
+        self.postings = {}
+        for position, key in enumerate(self.keys):
+            self.by_key.setdefault(key, []).append(position)
+            grams = trigrams(key)
+            self.grams.append(len(grams))
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(position)
+        self.sorted_keys = sorted(self.by_key)
+
+    @classmethod
+    def from_cards(cls, cards: list) -> 'TitleIndex':
+        """Index extracted DealCards; match positions line up with the list."""
+        return cls([asdict(card) for card in cards])
+
+    def _prefix(self, key: str) -> list:
+        i = bisect.bisect_left(self.sorted_keys, key)
+        positions = []
+        while i < len(self.sorted_keys) and self.sorted_keys[i].startswith(key):
+            positions.extend(self.by_key[self.sorted_keys[i]])
+            i += 1
+        return positions
+
+    def _fuzzy(self, key: str) -> list:
+        """(position, Dice score) for cards sharing trigrams with the key, best first."""
+        grams = trigrams(key)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self.postings.get(gram, ()))
+        scored = [(position, 2 * count / (len(grams) + self.grams[position]))
+                  for position, count in shared.items()]
+        scored = [item for item in scored if item[1] >= MIN_SCORE]
+        scored.sort(key=lambda item: -item[1])
+        return scored
+
+    def match(self, title: str, ship: str = None, departure: str = None) -> Match:
+        """Resolve a title (and optional ship/departure) to a single card."""
+        key = normalize_title(title)
+        if key in self.by_key:
+            method, scored = 'exact', [(position, 1.0) for position in self.by_key[key]]
+        elif len(key) >= MIN_PREFIX_LENGTH and self._prefix(key):
+            method = 'prefix'
+            scored = [(position, len(key) / len(self.keys[position])) for position in self._prefix(key)]
+        else:
+            method, scored = 'fuzzy', self._fuzzy(key)
+
+        if ship:
+            scored = [item for item in scored if tokens_match(ship, self.deals[item[0]].get('ship'))]
+        if departure:
+            scored = [item for item in scored if tokens_match(departure, self.deals[item[0]].get('departure'))]
+
+        candidates = [(position + 1, self.deals[position]['deal_id'], self.deals[position]['title'], round(score, 3))
+                      for position, score in scored]
+        if not scored:
+            return Match(title, 'none')
+
+        if method == 'fuzzy':
+            unique = len(scored) == 1 or scored[1][1] <= scored[0][1] - AMBIGUITY_MARGIN
+        else:
+            unique = len(scored) == 1
+        if not unique:
+            return Match(title, method, candidates=candidates)
+
+        position, score = scored[0]
+        deal_id = self.deals[position]['deal_id']
+        return Match(title, method, deal_id, position + 1, round(score, 3), candidates[:1],
+                     shared_id=self.by_id[deal_id] > 1)
+
+
+def load_deals(catalog_path: str = None, html_path: str = None) -> list:
+    """Deal records from a page, or from the catalog by default."""
+    if html_path:
+        with open(html_path, 'r', encoding='utf-8') as f:
+            return TitleIndex.from_cards(extract_cards(f.read())).deals
+    from deal_catalog import CATALOG_FILE, load_catalog
+    return load_catalog(catalog_path or CATALOG_FILE)['deals']
+
+
+def describe(match: Match) -> str:
+    """One-line report of a match."""
+    if match.position is not None:
+        note = ' (deal id shared with another card)' if match.shared_id else ''
+        return f"✓ {match.query[:50]:<50} → [{match.deal_id}] card {match.position} ({match.method}, {match.score}){note}"
+    if match.ambiguous:
+        options = '; '.join(f"[{deal_id}] card {position} {title[:30]} ({score})"
+                            for position, deal_id, title, score in match.candidates)
+        return f"⚠️  {match.query[:50]:<50} ambiguous ({match.method}): {options}"
+    return f"❌ {match.query[:50]:<50} no match"
+
+
+def module_constant(module: str, name: str):
+    """A literal module-level constant, read from the source without importing the module.
+
+    download_cruise_images imports image_downloader, which needs httpx; its
+    title table is plain data, so the audit should not need that installed.
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), module + '.py')
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == name for target in node.targets):
+            return ast.literal_eval(node.value)
+    raise ValueError(f"No {name} in {path}")
+
+
+def script_titles() -> list:
+    """(script, title, ship) for every title the fix scripts look up."""
+    import add_missing_pricing
+    import final_comprehensive_fix
+    import fix_merged_cards
+    import restore_pricing
+
+    entries = []
+    for module in (add_missing_pricing, restore_pricing, fix_merged_cards, final_comprehensive_fix):
+        entries.extend((module.__name__, title, None) for title in module.PRICED_TITLES)
+    entries.extend(('download_cruise_images', title, ship)
+                   for title, ship, _ in module_constant('download_cruise_images', 'cruise_image_mapping'))
+    return entries
+
+
+def cmd_find(args):
+    index = TitleIndex(load_deals(args.catalog, args.html))
+    start = time.perf_counter()
+    match = index.match(args.title, args.ship, args.departure)
+    elapsed = time.perf_counter() - start
+    print(describe(match))
+    print(f"  ({elapsed * 1e6:.0f} µs)")
+    if match.position is None:
+        sys.exit(1)
+
+
+def cmd_audit(args):
+    index = TitleIndex(load_deals(args.catalog, args.html))
+    counts = Counter()
+    for script, title, ship in script_titles():
+        match = index.match(title, ship)
+        status = 'resolved' if match.position is not None else ('ambiguous' if match.ambiguous else 'unmatched')
+        counts[status] += 1
+        if status != 'resolved' or match.method != 'exact' or match.shared_id:
+            print(f"  {script:<24} {describe(match)}")
+    print(f"\n{counts['resolved']} resolved, {counts['ambiguous']} ambiguous, {counts['unmatched']} unmatched")
+
+
+def cmd_bench(args):
+    rng = random.Random(42)
+    words = ['grand', 'journey', 'athens', 'civitavecchia', 'baltic', 'fjords', 'coast', 'aegean',
+             'caribbean', 'island', 'voyage', 'mediterranean', 'overture', 'wonders', 'lagoons']
+    deals = [{'deal_id': str(-i), 'title': f"{' '.join(rng.sample(words, 4))} {i}",
+              'ship': 'Luxury Vessel', 'departure': '2026'} for i in range(args.cards)]
+
+    start = time.perf_counter()
+    index = TitleIndex(deals)
+    build_time = time.perf_counter() - start
+
+    queries = [deal['title'][:-4] if n % 2 else deal['title'].upper() for n, deal in enumerate(rng.sample(deals, 1000))]
+    start = time.perf_counter()
+    for query in queries:
+        index.match(query)
+    query_time = (time.perf_counter() - start) / len(queries)
+    print(f"⏱️  {args.cards} cards: index built in {build_time * 1000:.1f} ms, "
+          f"{query_time * 1e6:.0f} µs per lookup (truncated / re-cased titles)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--catalog', help='catalog JSON file (default)')
+    parser.add_argument('--html', help='index the cards on this page instead of the catalog')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    find_parser = subparsers.add_parser('find', help='resolve one title')
+    find_parser.add_argument('title')
+    find_parser.add_argument('--ship')
+    find_parser.add_argument('--departure')
+    find_parser.set_defaults(func=cmd_find)
+
+    audit_parser = subparsers.add_parser('audit', help='resolve every title the fix scripts use')
+    audit_parser.set_defaults(func=cmd_audit)
+
+    bench_parser = subparsers.add_parser('bench', help='time lookups over synthetic cards')
+    bench_parser.add_argument('cards', nargs='?', type=int, default=10000)
+    bench_parser.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+Cached pagination for the deals grid
+
+The page's showPage() re-ran querySelectorAll('article[data-deal-id]') and
+re-filtered every card with getAttribute on each click. It then set
+style.display on every card twice and logged a line per visible deal. That
+cost is fine for 27 cards and becomes a long task with thousands. It also
+only handled the hard-coded buttons 1-3.
+
+PAGINATION_JS replaces it. The script keeps the card nodes in an array
+and the indexes of the unfiltered cards in a list, which applyFilters()
+(deal_facets.py) hands over through setDealFilter(). A page change only
+touches the cards entering or leaving the page. Calls made in the same
+frame are merged into one requestAnimationFrame write. The number buttons
+become a sliding window over however many pages there are. The
+console.debug lines are only kept with --debug.
+
+Usage:
+    python3 deal_pagination.py                      # deals.html in place
+    python3 deal_pagination.py page.html --debug    # keep console.debug tracing
+    python3 deal_pagination.py --dry-run
+"""
+
+import argparse
+import re
+import sys
+
+from deal_cards import DEALS_FILE
+from deal_facets import FILTER_JS_START, function_end
+
+PAGINATION_JS_START = '// DEAL PAGINATION START'
+PAGINATION_JS_END = '// DEAL PAGINATION END'
+LEGACY_START = '// Simple Pagination - Works with HTML buttons'
+DEBUG_LINE_RE = re.compile(r'^[ \t]*console\.debug\(.*\);[ \t]*\n', re.MULTILINE)
+
+PAGINATION_JS = PAGINATION_JS_START + r'''
+        // Pagination over a cached card list (deal_pagination.py)
+        const dealsPerPage = 10;
+        let currentPage = 1;
+        let pagerCards = null;    // article nodes in document order
+        let pagerVisible = null;  // indexes into pagerCards of unfiltered cards
+        let pagerShown = null;    // Set of indexes currently displayed
+        let pagerButtons = null;
+        let pagerFrame = 0;
+
+        const ACTIVE_PAGE_BUTTON = 'width: 40px; height: 40px; background: linear-gradient(135deg, #0a1929 0%, #1e3a52 100%) !important; color: white !important; border: none !important; border-radius: 8px; font-weight: 600; cursor: pointer; transition: all 0.3s;';
+        const PAGE_BUTTON = 'width: 40px; height: 40px; background: white !important; color: #0a1929 !important; border: 1px solid rgba(10,25,41,0.1) !important; border-radius: 8px; font-weight: 600; cursor: pointer; transition: all 0.3s;';
+
+        function loadPagerCards() {
+            if (pagerCards) return;
+            pagerCards = Array.from(document.querySelectorAll('article[data-deal-id]'));
+            pagerShown = new Set();
+            pagerCards.forEach((card, i) => {
+                if (card.style.display !== 'none') pagerShown.add(i);
+            });
+            if (!pagerVisible) {
+                pagerVisible = [];
+                pagerCards.forEach((card, i) => {
+                    if (card.getAttribute('data-filtered') !== 'true') pagerVisible.push(i);
+                });
+            }
+        }
+
+        // Called by applyFilters() with the indexes of the cards that pass
+        function setDealFilter(indexes) {
+            pagerVisible = indexes;
+        }
+
+        function pageCount() {
+            return Math.max(1, Math.ceil(pagerVisible.length / dealsPerPage));
+        }
+
+        function showPage(pageNum) {
+            loadPagerCards();
+            currentPage = Math.min(Math.max(1, pageNum), pageCount());
+            console.debug('[pagination] page', currentPage, 'of', pageCount(), '-', pagerVisible.length, 'deals');
+            if (!pagerFrame) pagerFrame = requestAnimationFrame(renderPage);
+        }
+
+        function renderPage() {
+            pagerFrame = 0;
+            const start = (currentPage - 1) * dealsPerPage;
+            const page = new Set(pagerVisible.slice(start, start + dealsPerPage));
+            let changed = 0;
+            pagerShown.forEach(i => {
+                if (!page.has(i)) {
+                    pagerCards[i].style.display = 'none';
+                    changed++;
+                }
+            });
+            page.forEach(i => {
+                if (!pagerShown.has(i)) {
+                    pagerCards[i].style.display = 'grid';
+                    changed++;
+                }
+            });
+            pagerShown = page;
+            console.debug('[pagination] rendered page', currentPage, '-', changed, 'cards changed');
+
+            updatePaginationButtons(currentPage);
+            window.scrollTo({ top: 0, behavior: 'smooth' });
+        }
+
+        function setPageButton(btn, state, page, active) {
+            // Only write what changed since the last render
+            if (state.page !== page) {
+                btn.textContent = page;
+                state.page = page;
+            }
+            const style = page === null ? 'hidden' : active ? 'active' : 'page';
+            if (state.style === style) return;
+            state.style = style;
+            if (style === 'hidden') {
+                btn.style.display = 'none';
+                return;
+            }
+            btn.style.cssText = active ? ACTIVE_PAGE_BUTTON : PAGE_BUTTON;
+            btn.onmouseover = active ? null : function() {
+                this.style.background = 'rgba(10,25,41,0.05)';
+            };
+            btn.onmouseout = active ? null : function() {
+                this.style.background = 'white';
+            };
+        }
+
+        // The number buttons but the last show a window around the active
+        // page; the last one always shows the last page
+        function updatePaginationButtons(activePage) {
+            if (!pagerButtons) return;
+            const total = pageCount();
+            const numbers = pagerButtons.numbers;
+            const windowSize = Math.max(1, numbers.length - 1);
+            const first = Math.max(1, Math.min(activePage - 1, total - windowSize + 1));
+            const windowEnd = first + windowSize - 1;
+
+            numbers.forEach((btn, i) => {
+                let page = i < windowSize ? first + i : total;
+                if (page > total || (i === windowSize && windowEnd >= total)) page = null;
+                setPageButton(btn, pagerButtons.states[i], page, page === activePage);
+            });
+            if (pagerButtons.ellipsis) {
+                const display = numbers.length > windowSize && windowEnd < total - 1 ? '' : 'none';
+                if (pagerButtons.ellipsis.style.display !== display) pagerButtons.ellipsis.style.display = display;
+            }
+        }
+
+        function initPagination() {
+            const container = document.querySelector('.pagination-container');
+            if (container) {
+                const buttons = Array.from(container.querySelectorAll('button'));
+                const numbers = buttons.filter(btn => /^\d+$/.test(btn.textContent.trim()));
+                pagerButtons = {
+                    prev: buttons[0],
+                    next: buttons[buttons.length - 1],
+                    numbers: numbers,
+                    states: numbers.map(btn => ({ page: Number(btn.textContent.trim()), style: null })),
+                    ellipsis: Array.from(container.querySelectorAll('span')).find(
+                        span => span.textContent.trim() === '...'),
+                };
+
+                // One delegated listener instead of one per button
+                container.addEventListener('click', function(e) {
+                    const btn = e.target.closest('button');
+                    if (!btn || !container.contains(btn)) return;
+                    e.preventDefault();
+                    e.stopPropagation();
+                    if (btn === pagerButtons.prev) {
+                        showPage(currentPage - 1);
+                    } else if (btn === pagerButtons.next) {
+                        showPage(currentPage + 1);
+                    } else if (/^\d+$/.test(btn.textContent.trim())) {
+                        showPage(Number(btn.textContent.trim()));
+                    }
+                }, true);
+            }
+            showPage(1);
+        }
+
+        if (document.readyState === 'loading') {
+            document.addEventListener('DOMContentLoaded', initPagination);
+        } else {
+            initPagination();
+        }
+        ''' + PAGINATION_JS_END
+
+
+def render_pagination_js(debug: bool = False) -> str:
+    """PAGINATION_JS, without its console.debug lines unless debug."""
+    return PAGINATION_JS if debug else DEBUG_LINE_RE.sub('', PAGINATION_JS)
+
+
+def legacy_span(content: str) -> tuple:
+    """(start, end) of the old 'Simple Pagination' script, through its init call."""
+    start = content.find(LEGACY_START)
+    if start == -1:
+        return None
+    init = content.find('function initPagination()', start)
+    if init == -1:
+        raise ValueError("Old pagination script has no initPagination()")
+    end = function_end(content, content.index('{', init))
+    # The readyState check that runs it
+    ready = re.compile(r'\s*(?://[^\n]*\s*)?if \(document\.readyState === \'loading\'\)\s*\{').match(content, end)
+    if ready:
+        end = function_end(content, ready.end() - 1)
+        otherwise = re.compile(r'\s*else\s*\{').match(content, end)
+        if otherwise:
+            end = function_end(content, otherwise.end() - 1)
+    return start, end
+
+
+def add_pagination(content: str, debug: bool = False) -> tuple:
+    """Swap the page's pagination script for PAGINATION_JS; returns (content, replaced)."""
+    if FILTER_JS_START not in content:
+        raise ValueError("applyFilters() is not the facet version yet; run deal_facets.py first")
+    script = render_pagination_js(debug)
+    start = content.find(PAGINATION_JS_START)
+    if start != -1:
+        end = content.find(PAGINATION_JS_END, start)
+        if end == -1:
+            raise ValueError(f"{PAGINATION_JS_START} found without {PAGINATION_JS_END}")
+        span = start, end + len(PAGINATION_JS_END)
+    else:
+        span = legacy_span(content)
+        if span is None:
+            raise ValueError("No pagination script found to replace")
+    if content[span[0]:span[1]] == script:
+        return content, False
+    return content[:span[0]] + script + content[span[1]:], True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('html', nargs='?', default=DEALS_FILE)
+    parser.add_argument('--debug', action='store_true', help='keep console.debug tracing')
+    parser.add_argument('--dry-run', action='store_true', help='report only, do not write')
+    args = parser.parse_args()
+
+    try:
+        with open(args.html, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content, replaced = add_pagination(content, args.debug)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if not replaced:
+        print("✅ Already up to date")
+    elif args.dry_run:
+        print(f"🔁 Would replace the pagination script{' (debug build)' if args.debug else ''}")
+        print("(dry run - nothing written)")
+    else:
+        with open(args.html, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        print(f"✅ Pagination script replaced{' (debug build)' if args.debug else ''} in {args.html}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+In-memory transform pipeline for deals.html
+
+Loads the page once, runs the registered passes in order against a shared
+Document (page text plus a lazily parsed card model), writes the file once
+at the end and reports how long each pass took. Replaces running
+redesign_deals_cards.py, apply_hover_expansion.py, ... one after another,
+each re-reading, re-parsing and re-writing the 800 KB page.
+
+Usage:
+    python3 deal_pipeline.py                       # default restyle sequence
+    python3 deal_pipeline.py hover-expansion final-cleanup
+    python3 deal_pipeline.py --list
+    python3 deal_pipeline.py --dry-run
+    python3 deal_pipeline.py --check               # fail if a second run would change the page
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+from deal_cards import DEALS_FILE, extract_cards
+
+# name -> (function, description); functions take a Document and may
+# return a short summary string for the report
+PASSES = {}
+
+DEFAULT_SEQUENCE = [
+    'join-css',
+    'expand-css',
+    'redesign',
+    'hover-expansion',
+    'single-line-titles',
+    'voyage-infobox',
+    'restore-pricing',
+    'final-cleanup',
+    'facets',
+    'pagination',
+    'search',
+    'responsive-images',
+    'lazy-images',
+    'hover-css',
+    'prune-css',
+    'atomic-css',
+    'critical-css',
+    'validate',
+]
+
+
+class Document:
+    """A page held in memory while passes transform it."""
+
+    def __init__(self, path: str, content: str, written: dict = None):
+        self.path = path
+        self._content = content
+        self._cards = None
+        self.assets = {}  # path relative to the page -> text to write, or None to delete
+        self.written = written or {}  # assets of an earlier in-memory run, read instead of the disk
+
+    @property
+    def content(self) -> str:
+        return self._content
+
+    @content.setter
+    def content(self, value: str):
+        if value is not self._content:
+            self._content = value
+            self._cards = None  # card offsets are stale
+
+    @property
+    def cards(self) -> list:
+        """DealCards of the current content, parsed at most once per change."""
+        if self._cards is None:
+            self._cards = extract_cards(self._content)
+        return self._cards
+
+    def map_cards(self, func) -> int:
+        """Replace each card's HTML with func(card, card_html) in one splice.
+
+        func returns the new HTML, or None to leave the card unchanged.
+        Returns the number of cards changed.
+        """
+        content = self._content
+        pieces = []
+        last = 0
+        changed = 0
+        for card in self.cards:
+            card_html = content[card.start:card.end]
+            new_html = func(card, card_html)
+            if new_html is None or new_html == card_html:
+                continue
+            pieces.append(content[last:card.start])
+            pieces.append(new_html)
+            last = card.end
+            changed += 1
+        if changed:
+            pieces.append(content[last:])
+            self.content = ''.join(pieces)
+        return changed
+
+
+def register_pass(name: str, description: str = ''):
+    """Decorator adding a pass to the pipeline registry."""
+    def decorator(func):
+        PASSES[name] = (func, description or (func.__doc__ or '').strip())
+        return func
+    return decorator
+
+
+@register_pass('join-css', 'Put split critical/deferred CSS back into one <style> (critical_css.py)')
+def join_css_pass(doc: Document):
+    from critical_css import CRITICAL_BLOCK_RE, join
+    if not CRITICAL_BLOCK_RE.search(doc.content):
+        return "not split"
+    doc.content = join(doc.content, os.path.dirname(os.path.abspath(doc.path)), doc.written)
+    return "joined"
+
+
+@register_pass('expand-css', 'Inline atomic classes again so passes see style attributes (atomic_css.py)')
+def expand_css_pass(doc: Document):
+    from atomic_css import expand
+    doc.content, count = expand(doc.content)
+    return f"{count} elements"
+
+
+@register_pass('redesign', 'Vertical info layout (redesign_deals_cards.py)')
+def redesign_pass(doc: Document):
+    from redesign_deals_cards import REDESIGNED_MARKERS, redesign_card
+
+    def redesign(card, card_html):
+        if any(marker in card_html for marker in REDESIGNED_MARKERS):
+            return None
+        return redesign_card(card_html, card.position)
+
+    return f"{doc.map_cards(redesign)} cards"
+
+
+@register_pass('hover-expansion', 'Hover expansion and logo fixes (apply_hover_expansion.py)')
+def hover_expansion_pass(doc: Document):
+    from apply_hover_expansion import apply_hover_expansion
+    doc.content = apply_hover_expansion(doc.content)
+
+
+@register_pass('single-line-titles', 'Single-line titles with tooltips (make_titles_single_line.py)')
+def single_line_titles_pass(doc: Document):
+    from make_titles_single_line import make_titles_single_line
+    return f"{doc.map_cards(lambda card, card_html: make_titles_single_line(card_html))} cards"
+
+
+@register_pass('voyage-infobox', 'Voyage row in the info box (add_voyage_to_infobox.py)')
+def voyage_infobox_pass(doc: Document):
+    # Per card, so a title can never be paired with a later card's info box
+    from add_voyage_to_infobox import add_voyage_to_infobox
+    return f"{doc.map_cards(lambda card, card_html: add_voyage_to_infobox(card_html))} cards"
+
+
+@register_pass('restore-pricing', 'Restore lost pricing sections (restore_pricing.py)')
+def restore_pricing_pass(doc: Document):
+    from restore_pricing import clean_broken_pricing_fragments, restore_pricing
+    doc.content, added, failed = restore_pricing(clean_broken_pricing_fragments(doc.content))
+    return f"{added} added, {len(failed)} not found"
+
+
+@register_pass('final-cleanup', 'Duplicate pricing cleanup (final_cleanup.py)')
+def final_cleanup_pass(doc: Document):
+    from final_cleanup import add_pricing_to_second_athens_civitavecchia, remove_duplicate_pricing_sections
+    doc.content, removed = remove_duplicate_pricing_sections(doc.content)
+    doc.content, added = add_pricing_to_second_athens_civitavecchia(doc.content)
+    return f"{removed} duplicates removed"
+
+
+@register_pass('facets', 'Facet attributes, bitset index and filter script (deal_facets.py)')
+def facets_pass(doc: Document):
+    from deal_facets import add_facets
+    doc.content, stats = add_facets(doc.content)
+    return f"{stats['changed']}/{stats['cards']} cards, {stats['inputs']} filter inputs"
+
+
+@register_pass('pagination', 'Cached, frame-batched pagination script (deal_pagination.py)')
+def pagination_pass(doc: Document):
+    from deal_pagination import add_pagination
+    doc.content, replaced = add_pagination(doc.content)
+    return "script replaced" if replaced else "up to date"
+
+
+@register_pass('search', 'Static prefix search index and header search dialog (deal_search.py)')
+def search_pass(doc: Document):
+    from deal_search import add_search, build_index, search_deals, stale_files
+    site_dir = os.path.dirname(os.path.abspath(doc.path))
+    manifest, files = build_index(search_deals(site_dir, doc.content))
+    doc.assets.update(stale_files(site_dir, files))
+    doc.assets.update(files)
+    doc.content = add_search(doc.content, manifest)
+    return f"{manifest['count']} deals, {len(manifest['shards'])} term shards"
+
+
+@register_pass('responsive-images', 'AVIF/WebP <picture> markup for card images (responsive_images.py)')
+def responsive_images_pass(doc: Document):
+    from responsive_images import load_manifest, rewrite_html
+    site_dir = os.path.dirname(os.path.abspath(doc.path))  # pages sit at the site root
+    manifest = load_manifest(site_dir)
+    if not manifest:
+        return "no derivatives built yet"
+    doc.content, count = rewrite_html(doc.content, manifest, site_dir, site_dir)
+    return f"{count} images"
+
+
+@register_pass('lazy-images', 'fetchpriority for the first card, lazy loading elsewhere (lazy_images.py)')
+def lazy_images_pass(doc: Document):
+    from lazy_images import add_loading_hints
+    doc.content, report = add_loading_hints(doc.content, os.path.dirname(os.path.abspath(doc.path)))
+    deferred = sum(size for group, (_, size) in report.items() if group != 'eager')
+    return f"{sum(count for count, _ in report.values())} images, {deferred / 1024:.0f} KB deferred"
+
+
+@register_pass('hover-css', 'onmouseover/onmouseout style handlers to :hover rules (hover_css.py)')
+def hover_css_pass(doc: Document):
+    from hover_css import convert
+    doc.content, stats = convert(doc.content)
+    return f"{stats['converted']} handler pairs -> {stats['classes']} classes, {stats['kept']} kept as JavaScript"
+
+
+@register_pass('atomic-css', 'Inline styles to shared atomic classes, verified (atomic_css.py)')
+def atomic_css_pass(doc: Document):
+    from atomic_css import compact, verify
+    compacted, stats = compact(doc.content)
+    problems = verify(doc.content, compacted)
+    if problems:
+        return f"skipped, {len(problems)} style differences (run atomic_css.py compact for details)"
+    doc.content = compacted
+    return f"{stats['extracted']} declarations -> {stats['classes']} classes, {stats['kept']} kept inline"
+
+
+@register_pass('prune-css', 'Drop CSS rules that match nothing on the page (prune_css.py)')
+def prune_css_pass(doc: Document):
+    from prune_css import prune_page
+    doc.content, assets, stats = prune_page(doc.content, doc.path)
+    doc.assets.update(assets)
+    return (f"{stats['rules_dropped']}/{stats['rules']} rules, {stats['selectors_dropped']} selectors, "
+            f"{(stats['before'] - stats['after']) / 1024:.1f} KB")
+
+
+@register_pass('critical-css', 'Inline first-viewport CSS, defer the rest to css/ (critical_css.py)')
+def critical_css_pass(doc: Document):
+    from critical_css import split
+    doc.content, assets, stats = split(doc.content, doc.path)
+    doc.assets.update(assets)
+    if not stats['rules']:
+        return "no <style> blocks"
+    return (f"{stats['critical'] / 1024:.1f} KB inlined, {stats['deferred'] / 1024:.1f} KB deferred "
+            f"of {stats['original'] / 1024:.0f} KB")
+
+
+@register_pass('validate', 'Tag balance and card schema check (validate_cards.py)')
+def validate_pass(doc: Document):
+    from validate_cards import validate
+    issues = validate(doc.content)
+    errors = [issue for issue in issues if issue.severity == 'error']
+    for issue in errors:
+        card = f" [card {issue.deal_id}]" if issue.deal_id else ''
+        print(f"  ❌ {doc.path}:{issue.line}:{issue.column}{card} {issue.message}")
+    return f"{len(errors)} errors, {len(issues) - len(errors)} warnings"
+
+
+def run_pipeline(doc: Document, names: list) -> list:
+    """Run passes in order; returns [(name, seconds, bytes delta, summary)]."""
+    results = []
+    for name in names:
+        func = PASSES[name][0]
+        size_before = len(doc.content)
+        start = time.perf_counter()
+        summary = func(doc)
+        elapsed = time.perf_counter() - start
+        results.append((name, elapsed, len(doc.content) - size_before, summary or ''))
+    return results
+
+
+def check_idempotent(doc: Document, names: list) -> str:
+    """Run the passes again on their own output; returns '' or where the second run differs."""
+    again = Document(doc.path, doc.content, doc.assets)
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_pipeline(again, names)
+    if again.content != doc.content:
+        offset = next(i for i, (a, b) in enumerate(zip(doc.content + '\0', again.content + '\0')) if a != b)
+        return f"page differs from line {doc.content.count(chr(10), 0, offset) + 1}"
+    changed = sorted(path for path in set(doc.assets) | set(again.assets)
+                     if doc.assets.get(path) != again.assets.get(path))
+    return f"assets differ: {', '.join(changed)}" if changed else ''
+
+
+def print_report(results: list, load_time: float, write_time: float):
+    """Print per-pass timings."""
+    print("\n" + "=" * 72)
+    print(f"{'Pass':<22} {'Time':>10} {'Δ chars':>10}  Summary")
+    print("-" * 72)
+    print(f"{'(load + parse)':<22} {load_time * 1000:>8.1f}ms")
+    for name, elapsed, delta, summary in results:
+        print(f"{name:<22} {elapsed * 1000:>8.1f}ms {delta:>+10}  {summary}")
+    print(f"{'(write)':<22} {write_time * 1000:>8.1f}ms")
+    total = load_time + write_time + sum(r[1] for r in results)
+    print("-" * 72)
+    print(f"{'Total':<22} {total * 1000:>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('passes', nargs='*', help='passes to run, in order (default: the restyle sequence)')
+    parser.add_argument('--html', default=DEALS_FILE, help='page to transform')
+    parser.add_argument('--output', help='write here instead of overwriting --html')
+    parser.add_argument('--dry-run', action='store_true', help='run passes but do not write')
+    parser.add_argument('--list', action='store_true', help='list registered passes')
+    parser.add_argument('--check', action='store_true',
+                        help='run the passes a second time in memory and fail if that changes anything')
+    args = parser.parse_args()
+
+    if args.list:
+        for name, (func, description) in PASSES.items():
+            print(f"  {name:<22} {description}")
+        return
+
+    names = args.passes or DEFAULT_SEQUENCE
+    unknown = [name for name in names if name not in PASSES]
+    if unknown:
+        print(f"❌ Unknown pass(es): {', '.join(unknown)} (see --list)")
+        sys.exit(1)
+
+    start = time.perf_counter()
+    with open(args.html, 'r', encoding='utf-8') as f:
+        doc = Document(args.html, f.read())
+    original = doc.content
+    print(f"📖 Loaded {args.html} ({len(doc.cards)} cards)")
+    load_time = time.perf_counter() - start
+
+    results = run_pipeline(doc, names)
+
+    start = time.perf_counter()
+    output = args.output or args.html
+    if args.dry_run:
+        print("\n(dry run - nothing written)")
+    elif doc.content != original:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(doc.content)
+        print(f"\n💾 Wrote {output}")
+        if doc.assets:
+            from critical_css import write_assets
+            write_assets(os.path.dirname(os.path.abspath(output)), doc.assets)
+            print(f"💾 Wrote {sum(text is not None for text in doc.assets.values())} asset file(s) beside it")
+    else:
+        print("\nNo changes")
+    write_time = time.perf_counter() - start
+
+    print_report(results, load_time, write_time)
+
+    if args.check:
+        difference = check_idempotent(doc, names)
+        if difference:
+            print(f"\n❌ Not idempotent: a second run changes the output ({difference})")
+            sys.exit(1)
+        print("\n✅ A second run leaves the output unchanged")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Shared deal pricing table
+
+deal_pricing.csv is the one pricing source (deal_id, title, old_price,
+new_price). It is loaded into a columnar table indexed by deal id and
+normalized title; savings and discount percentages are recomputed for every
+row in one batched pass instead of being typed by hand, and the catalog
+renderer injects them into the cards.
+
+Discounts are rounded down so a card never overstates the saving.
+
+Usage:
+    python3 deal_pricing.py import             # seed from deal_catalog.json
+    python3 deal_pricing.py reprice feed.csv   # merge a fare feed, recompute
+    python3 deal_pricing.py show [title | deal-id]
+    python3 deal_pricing.py bench [rows]
+"""
+
+import argparse
+import bisect
+import csv
+import os
+import random
+import sys
+import time
+from array import array
+
+from deal_cards import DEALS_FILE, normalize_title
+
+try:
+    import numpy
+except ImportError:  # the pure-Python path is fast enough for tens of thousands of rows
+    numpy = None
+
+PRICING_FILE = os.path.join(os.path.dirname(DEALS_FILE), 'deal_pricing.csv')
+FIELDS = ['deal_id', 'title', 'old_price', 'new_price']
+
+
+def format_discount(percent: int) -> str:
+    """Discount badge text, e.g. 14 -> '-14% OFF'."""
+    return f"-{percent}% OFF"
+
+
+class PricingTable:
+    """Columnar pricing rows with id/title indexes and derived columns."""
+
+    def __init__(self, rows=()):
+        self.deal_ids = []
+        self.titles = []
+        self.old = array('l')
+        self.new = array('l')
+        self.savings = array('l')
+        self.percent = array('l')
+        for row in rows:
+            self.append(row['deal_id'], row['title'], int(row['old_price']), int(row['new_price']))
+        self.recompute()
+
+    def __len__(self):
+        return len(self.deal_ids)
+
+    def append(self, deal_id: str, title: str, old_price: int, new_price: int):
+        """Add a row; call recompute() once after a batch of appends."""
+        self.deal_ids.append(deal_id)
+        self.titles.append(title)
+        self.old.append(old_price)
+        self.new.append(new_price)
+
+    def recompute(self):
+        """Recompute savings and discount % for all rows and rebuild the indexes."""
+        if numpy is not None and len(self):
+            old = numpy.frombuffer(self.old, dtype=self.old.typecode)
+            new = numpy.frombuffer(self.new, dtype=self.new.typecode)
+            savings = numpy.maximum(old - new, 0)
+            percent = numpy.where(old > 0, savings * 100 // numpy.maximum(old, 1), 0)
+            self.savings = array('l', savings.astype(self.old.typecode).tobytes())
+            self.percent = array('l', percent.astype(self.old.typecode).tobytes())
+        else:
+            self.savings = array('l', [max(o - n, 0) for o, n in zip(self.old, self.new)])
+            self.percent = array('l', [s * 100 // o if o > 0 else 0 for s, o in zip(self.savings, self.old)])
+
+        self.by_id = {}
+        self.by_key = {}
+        for i, (deal_id, title) in enumerate(zip(self.deal_ids, self.titles)):
+            self.by_id.setdefault(deal_id, []).append(i)
+            self.by_key.setdefault(normalize_title(title), []).append(i)
+        self.sorted_keys = sorted(self.by_key)
+
+    def row(self, i: int) -> dict:
+        """One row with its derived columns."""
+        return {
+            'deal_id': self.deal_ids[i],
+            'title': self.titles[i],
+            'old_price': self.old[i],
+            'new_price': self.new[i],
+            'savings': self.savings[i],
+            'discount': format_discount(self.percent[i]),
+        }
+
+    def title_rows(self, title: str) -> list:
+        """Rows whose normalized title equals, or else starts with, the given title."""
+        key = normalize_title(title)
+        if key in self.by_key:
+            return self.by_key[key]
+        # Truncated titles ("... to Coral-La") match on prefix
+        i = bisect.bisect_left(self.sorted_keys, key)
+        rows = []
+        while i < len(self.sorted_keys) and self.sorted_keys[i].startswith(key):
+            rows.extend(self.by_key[self.sorted_keys[i]])
+            i += 1
+        return rows
+
+    def lookup(self, deal_id: str = None, title: str = None):
+        """Row index for a deal, or None if there is no unique match.
+
+        The deal id decides unless it is shared by several rows (deals.html
+        reuses -11), in which case the title picks between them. A deal id
+        with no row never falls back to the title, which could belong to a
+        different deal; only a lookup without a deal id goes by title.
+        """
+        if deal_id is None:
+            rows = self.title_rows(title) if title is not None else []
+        else:
+            rows = self.by_id.get(deal_id, [])
+            if len(rows) > 1 and title is not None:
+                rows = [i for i in self.title_rows(title) if i in rows]
+        return rows[0] if len(rows) == 1 else None
+
+    def legacy_dict(self, titles: list) -> dict:
+        """{title: {'old', 'new', 'discount'}} in the shape the fix scripts use."""
+        data = {}
+        for title in titles:
+            i = self.lookup(title=title)
+            if i is None:
+                print(f"  ⚠️  No unique price for: {title}")
+                continue
+            data[title] = {
+                'old': str(self.old[i]),
+                'new': str(self.new[i]),
+                'discount': format_discount(self.percent[i]),
+            }
+        return data
+
+    def rows(self):
+        for i in range(len(self)):
+            yield self.row(i)
+
+
+def load_pricing(filepath: str = PRICING_FILE) -> PricingTable:
+    """Load the pricing CSV into a table."""
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        return PricingTable(csv.DictReader(f))
+
+
+def save_pricing(table: PricingTable, filepath: str = PRICING_FILE):
+    """Write the pricing CSV atomically; derived columns are not stored."""
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(FIELDS)
+        for i in range(len(table)):
+            writer.writerow([table.deal_ids[i], table.titles[i], table.old[i], table.new[i]])
+    os.replace(tmp_path, filepath)
+
+
+def pricing_data_for(titles: list, filepath: str = PRICING_FILE) -> dict:
+    """Legacy {title: {'old', 'new', 'discount'}} dict for the given card titles."""
+    return load_pricing(filepath).legacy_dict(titles)
+
+
+def apply_pricing(deals: list, table: PricingTable) -> list:
+    """Copies of catalog deals with prices, discount and 'Save £' badge from the table."""
+    priced = []
+    for deal in deals:
+        i = table.lookup(deal_id=deal['deal_id'], title=deal.get('title'))
+        if i is None:
+            priced.append(deal)
+            continue
+        deal = dict(deal)
+        deal['old_price'] = table.old[i]
+        deal['new_price'] = table.new[i]
+        deal['discount'] = format_discount(table.percent[i]) if table.savings[i] else ''
+        badges = [badge for badge in deal.get('badges') or [] if not badge.startswith('Save £')]
+        if table.savings[i]:
+            badges.append(f"Save £{table.savings[i]}")
+        deal['badges'] = badges
+        priced.append(deal)
+    return priced
+
+
+def merge_feed(table: PricingTable, feed_path: str) -> tuple:
+    """Apply a fare feed (deal_id and/or title, old_price, new_price) to the table.
+
+    Returns (updated, added) counts. Unmatched rows with a deal id are added.
+    """
+    updated = added = 0
+    with open(feed_path, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            i = table.lookup(deal_id=row.get('deal_id') or None, title=row.get('title') or None)
+            old_price, new_price = int(row['old_price']), int(row['new_price'])
+            if i is not None:
+                table.old[i] = old_price
+                table.new[i] = new_price
+                updated += 1
+            elif row.get('deal_id') and row['deal_id'] not in table.by_id:
+                table.append(row['deal_id'], row.get('title', ''), old_price, new_price)
+                table.by_id[row['deal_id']] = [len(table) - 1]
+                added += 1
+            else:
+                print(f"  ⚠️  No unique row for feed entry {row.get('deal_id') or row.get('title')!r}")
+    table.recompute()
+    return updated, added
+
+
+def cmd_import(args):
+    from deal_catalog import CATALOG_FILE, load_catalog
+    catalog = load_catalog(args.catalog or CATALOG_FILE)
+    table = PricingTable()
+    for deal in catalog['deals']:
+        if deal.get('new_price') is None:
+            print(f"  ⚠️  No price on card {deal['deal_id']} ({deal['title']})")
+            continue
+        old_price = deal['old_price'] if deal.get('old_price') is not None else deal['new_price']
+        table.append(deal['deal_id'], deal['title'], old_price, deal['new_price'])
+    table.recompute()
+    save_pricing(table, args.pricing)
+    print(f"✅ Wrote {len(table)} prices to {args.pricing}")
+
+
+def cmd_reprice(args):
+    table = load_pricing(args.pricing)
+    start = time.perf_counter()
+    updated, added = merge_feed(table, args.feed)
+    elapsed = time.perf_counter() - start
+    save_pricing(table, args.pricing)
+    print(f"✅ Repriced {len(table)} rows ({updated} updated, {added} added) in {elapsed * 1000:.1f} ms")
+
+
+def cmd_show(args):
+    table = load_pricing(args.pricing)
+    if args.query:
+        # Every row of the deal id (shared ids list them all), else by title
+        found = table.by_id.get(args.query) or table.title_rows(args.query)
+        rows = [table.row(i) for i in found]
+    else:
+        rows = table.rows()
+    for row in rows:
+        print(f"  [{row['deal_id']:>4}] {row['title'][:50]:<50} £{row['old_price']:>6} → £{row['new_price']:>6}  "
+              f"save £{row['savings']:<5} {row['discount']}")
+
+
+def cmd_bench(args):
+    rng = random.Random(42)
+    table = PricingTable()
+    for i in range(args.rows):
+        old_price = rng.randrange(1500, 40000)
+        table.append(str(i), f"Sailing {i}", old_price, old_price - rng.randrange(0, old_price // 2))
+    start = time.perf_counter()
+    table.recompute()
+    elapsed = time.perf_counter() - start
+    backend = 'numpy' if numpy is not None else 'pure Python'
+    print(f"⏱️  Recomputed {args.rows} rows in {elapsed * 1000:.1f} ms ({backend})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pricing', default=PRICING_FILE, help='pricing CSV')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = subparsers.add_parser('import', help='seed the pricing table from the catalog')
+    import_parser.add_argument('--catalog', help='catalog JSON file')
+    import_parser.set_defaults(func=cmd_import)
+
+    reprice_parser = subparsers.add_parser('reprice', help='merge a fare feed and recompute discounts')
+    reprice_parser.add_argument('feed')
+    reprice_parser.set_defaults(func=cmd_reprice)
+
+    show_parser = subparsers.add_parser('show', help='show prices')
+    show_parser.add_argument('query', nargs='?')
+    show_parser.set_defaults(func=cmd_show)
+
+    bench_parser = subparsers.add_parser('bench', help='time a batch recompute')
+    bench_parser.add_argument('rows', nargs='?', type=int, default=50000)
+    bench_parser.set_defaults(func=cmd_bench)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Static prefix search over the deal catalog for the site header
+
+Neither page had a working text search. The index.html modal is a hidden
+form of selects, and initSearchModal() on deals.html looks for a
+.search-box that is not there. Any real search would have had to walk the
+DOM or call a server. This builds an inverted index over deal titles,
+ports, cruise lines, ships and regions at build time and writes it next to
+the pages as static JSON:
+
+    search/terms-<prefix>.json   sorted terms + delta-encoded postings
+    search/docs-<n>.json         result records, DOC_SHARD_SIZE per file
+
+Term shards are keyed by a term's first letter, and a letter whose shard
+would exceed MAX_SHARD_BYTES is split by the first two letters. The pages
+get a small manifest inline, a search dialog (the header search icon,
+'/' or Ctrl+K) and SEARCH_JS. On the first keystroke the script fetches
+only the shards for the typed prefix, binary-searches the sorted terms for
+the prefix range and ranks the matches by field. It then loads the doc
+shards of the top results.
+
+Usage:
+    python3 deal_search.py build                         # index + index.html, deals.html
+    python3 deal_search.py build --pages deals.html
+    python3 deal_search.py query "athens civ"
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import unicodedata
+from bisect import bisect_left
+from dataclasses import asdict
+
+from critical_css import write_assets
+from deal_cards import DEALS_FILE, extract_cards
+
+SEARCH_DIR = 'search'
+RESULTS_PAGE = 'deals.html'
+DOC_SHARD_SIZE = 256
+MAX_SHARD_BYTES = 48 * 1024
+MAX_RESULTS = 8
+# (field, weight); a field's bit in a posting is its position here
+FIELDS = [('title', 3), ('ports', 4), ('line', 3), ('ship', 3), ('region', 2)]
+FIELD_BITS = 5
+STOP_WORDS = ['a', 'an', 'and', 'at', 'by', 'for', 'from', 'in', 'of', 'on', 'the', 'to', 'with']
+DEFAULT_PAGES = ['index.html', 'deals.html']
+
+TOKEN_SPLIT_RE = re.compile(r'[^a-z0-9]+')
+COMBINING_RE = re.compile('[\u0300-\u036f]')
+PORTS_AFTER_COLON_RE = re.compile(r':\s*(.+)$')
+PORTS_FROM_TO_RE = re.compile(r'(?:^|\bfrom\s+)([A-Z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)*)\s+to\s+'
+                              r'([A-Z][\w\'.-]*(?:\s+[A-Z][\w\'.-]*)*)$')
+ROUND_TRIP_RE = re.compile(r'^(.+?)\s+Round Trip$', re.IGNORECASE)
+
+BLOCK_START = '<!-- DEAL SEARCH START -->'
+BLOCK_END = '<!-- DEAL SEARCH END -->'
+BLOCK_RE = re.compile(r'[ \t]*' + re.escape(BLOCK_START) + r'.*?' + re.escape(BLOCK_END) + r'\n?', re.DOTALL)
+TRIGGER_MARKER = '<!-- Wishlist Icon -->'
+TRIGGER_HTML = '''<!-- Search Icon -->
+                    <div class="deal-search-trigger">
+                        <button type="button" class="deal-search-open" data-deal-search aria-label="Search voyages">
+                            <i class="fa-solid fa-magnifying-glass"></i>
+                        </button>
+                    </div>
+
+                    '''
+
+SEARCH_CSS = '''
+        .deal-search-trigger { display: inline-block; margin-left: 16px; vertical-align: middle; }
+        .deal-search-open { display: inline-flex; align-items: center; justify-content: center; width: 42px; height: 42px; border: 1.5px solid rgba(255, 255, 255, 0.25); border-radius: 50%; color: rgba(255, 255, 255, 0.9); background: rgba(255, 255, 255, 0.05); cursor: pointer; font-size: 16px; transition: all 0.4s cubic-bezier(0.4, 0, 0.2, 1); }
+        .deal-search-open:hover, .deal-search-open:focus-visible { color: var(--gold, #d4af37); border-color: var(--gold, #d4af37); background: rgba(212, 165, 116, 0.1); }
+        .deal-search { width: calc(100% - 40px); max-width: 680px; margin: 12vh auto auto; padding: 0; border: 1px solid rgba(212, 175, 55, 0.3); border-radius: 20px; background: #faf8f5; color: #1a2332; box-shadow: 0 24px 64px rgba(10, 25, 41, 0.25); font-family: 'Inter', sans-serif; }
+        .deal-search::backdrop { background: rgba(10, 25, 41, 0.45); backdrop-filter: blur(8px); }
+        .deal-search-form { display: flex; align-items: center; gap: 12px; padding: 20px 24px; border-bottom: 1px solid rgba(212, 175, 55, 0.2); }
+        .deal-search-form input { flex: 1; border: none; background: transparent; font-size: 20px; font-family: 'Cormorant Garamond', serif; color: #1a2332; outline: none; }
+        .deal-search-close { border: none; background: none; font-size: 18px; color: #888; cursor: pointer; }
+        .deal-search-results { list-style: none; margin: 0; padding: 8px; max-height: 60vh; overflow-y: auto; }
+        .deal-search-results a { display: block; padding: 12px 16px; border-radius: 12px; color: inherit; text-decoration: none; }
+        .deal-search-results [aria-selected="true"] a, .deal-search-results a:hover { background: rgba(212, 175, 55, 0.12); }
+        .deal-search-results strong { display: block; font-family: 'Cormorant Garamond', serif; font-size: 19px; font-weight: 600; }
+        .deal-search-results span { font-size: 12px; color: #666; letter-spacing: 0.3px; }
+        .deal-search-status { margin: 0; padding: 0 24px 16px; font-size: 12px; color: #888; }
+'''
+
+SEARCH_JS = r'''
+        // Typeahead over the static index built by deal_search.py
+        (function() {
+            const manifestScript = document.getElementById('deal-search-index');
+            const dialog = document.getElementById('deal-search');
+            if (!manifestScript || !dialog) return;
+            const manifest = JSON.parse(manifestScript.textContent);
+            const input = document.getElementById('deal-search-input');
+            const list = document.getElementById('deal-search-results');
+            const status = dialog.querySelector('.deal-search-status');
+            const stopWords = new Set(manifest.stopWords);
+            const termShards = {};
+            const docShards = {};
+            let latest = 0;
+            let selected = -1;
+
+            function tokens(text) {
+                return text.normalize('NFKD').replace(/[\u0300-\u036f]/g, '').toLowerCase()
+                    .split(/[^a-z0-9]+/).filter(token => token);
+            }
+
+            function load(cache, name) {
+                if (!cache[name]) {
+                    cache[name] = fetch(manifest.base + name + '.json?v=' + manifest.version)
+                        .then(response => {
+                            if (!response.ok) throw new Error(response.status + ' ' + name);
+                            return response.json();
+                        })
+                        .catch(error => {
+                            delete cache[name];
+                            throw error;
+                        });
+                }
+                return cache[name];
+            }
+
+            // Shards that can hold terms starting with prefix
+            function shardKeys(prefix) {
+                return manifest.shards.filter(key => prefix.startsWith(key) || key.startsWith(prefix));
+            }
+
+            function lowerBound(terms, prefix) {
+                let low = 0;
+                let high = terms.length;
+                while (low < high) {
+                    const mid = (low + high) >> 1;
+                    if (terms[mid] < prefix) low = mid + 1; else high = mid;
+                }
+                return low;
+            }
+
+            // doc -> best field score of any term starting with prefix
+            function matchPrefix(shards, prefix) {
+                const scores = new Map();
+                shards.forEach(shard => {
+                    for (let i = lowerBound(shard.terms, prefix); i < shard.terms.length && shard.terms[i].startsWith(prefix); i++) {
+                        const bonus = shard.terms[i] === prefix ? 1 : 0;
+                        let value = 0;
+                        shard.postings[i].forEach(delta => {
+                            value += delta;
+                            const doc = Math.floor(value / 32);
+                            let score = 0;
+                            manifest.weights.forEach((weight, bit) => {
+                                if (value & (1 << bit) && weight > score) score = weight;
+                            });
+                            score += bonus;
+                            if (!(scores.get(doc) >= score)) scores.set(doc, score);
+                        });
+                    }
+                });
+                return scores;
+            }
+
+            async function search(query) {
+                let terms = tokens(query);
+                if (terms.length > 1) terms = terms.filter(term => !stopWords.has(term));
+                if (!terms.length) return { total: 0, docs: [] };
+                const shardsByTerm = await Promise.all(terms.map(
+                    term => Promise.all(shardKeys(term.slice(0, 2)).map(key => load(termShards, 'terms-' + key)))));
+
+                // Every term must match (as a prefix); scores add up
+                let scores = null;
+                terms.forEach((term, i) => {
+                    const termScores = matchPrefix(shardsByTerm[i], term);
+                    if (!scores) {
+                        scores = termScores;
+                        return;
+                    }
+                    const both = new Map();
+                    scores.forEach((score, doc) => {
+                        if (termScores.has(doc)) both.set(doc, score + termScores.get(doc));
+                    });
+                    scores = both;
+                });
+
+                const top = Array.from(scores).sort((a, b) => b[1] - a[1] || a[0] - b[0]).slice(0, manifest.limit);
+                const docs = await Promise.all(top.map(
+                    ([doc]) => load(docShards, 'docs-' + Math.floor(doc / manifest.docShardSize))
+                        .then(shard => shard[doc % manifest.docShardSize])));
+                return { total: scores.size, docs: docs };
+            }
+
+            function select(index) {
+                const items = list.children;
+                if (!items.length) return;
+                selected = (index + items.length) % items.length;
+                Array.from(items).forEach((item, i) => item.setAttribute('aria-selected', String(i === selected)));
+                items[selected].scrollIntoView({ block: 'nearest' });
+            }
+
+            function render(result) {
+                list.textContent = '';
+                selected = -1;
+                result.docs.forEach(doc => {
+                    const [id, title, ports, line, ship, region, departure, nights, price] = doc;
+                    const item = document.createElement('li');
+                    item.setAttribute('role', 'option');
+                    const link = document.createElement('a');
+                    link.href = manifest.page + '#deal-' + encodeURIComponent(id);
+                    const heading = document.createElement('strong');
+                    heading.textContent = title;
+                    const details = document.createElement('span');
+                    details.textContent = [line, ship, ports, region, departure, nights ? nights + ' nights' : '',
+                        price ? 'from £' + price.toLocaleString('en-GB') : ''].filter(part => part).join(' · ');
+                    link.append(heading, details);
+                    item.appendChild(link);
+                    list.appendChild(item);
+                });
+                status.textContent = result.total ? (result.total > result.docs.length
+                    ? 'Top ' + result.docs.length + ' of ' + result.total + ' voyages' : result.total + ' voyages')
+                    : 'No voyages match';
+            }
+
+            input.addEventListener('input', () => {
+                const query = input.value;
+                const request = ++latest;
+                if (!query.trim()) {
+                    list.textContent = '';
+                    status.textContent = '';
+                    return;
+                }
+                search(query).then(result => {
+                    if (request === latest) render(result);
+                }).catch(() => {
+                    if (request === latest) status.textContent = 'Search is unavailable right now';
+                });
+            });
+
+            input.addEventListener('keydown', e => {
+                if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+                    e.preventDefault();
+                    select(selected + (e.key === 'ArrowDown' ? 1 : -1));
+                } else if (e.key === 'Enter') {
+                    e.preventDefault();
+                    const item = list.children[Math.max(selected, 0)];
+                    if (item) item.querySelector('a').click();
+                }
+            });
+
+            function openDealSearch() {
+                if (!dialog.open) dialog.showModal();
+                input.focus();
+                input.select();
+            }
+            window.openDealSearch = openDealSearch;
+
+            document.addEventListener('click', e => {
+                if (e.target.closest('[data-deal-search]')) {
+                    e.preventDefault();
+                    openDealSearch();
+                } else if (e.target.closest('.deal-search-results a')) {
+                    dialog.close();
+                    // Same result again: no hashchange, so reveal it directly
+                    if (e.target.closest('a').hash === location.hash) revealDeal();
+                }
+            });
+            document.addEventListener('keydown', e => {
+                const typing = /^(INPUT|TEXTAREA|SELECT)$/.test(e.target.tagName) || e.target.isContentEditable;
+                if ((e.key === 'k' && (e.ctrlKey || e.metaKey)) || (e.key === '/' && !typing)) {
+                    e.preventDefault();
+                    openDealSearch();
+                }
+            });
+
+            // On the results page, #deal-<id> pages to the card and scrolls to it
+            function revealDeal() {
+                const match = location.hash.match(/^#deal-(.+)$/);
+                if (!match) return;
+                const id = decodeURIComponent(match[1]);
+                const cards = Array.from(document.querySelectorAll('article[data-deal-id]'));
+                const card = cards.find(article => article.getAttribute('data-deal-id') === id);
+                if (!card) return;
+                if (typeof showPage === 'function') {
+                    if (card.getAttribute('data-filtered') === 'true' && typeof clearAllFilters === 'function') {
+                        clearAllFilters();
+                    }
+                    const position = cards.filter(article => article.getAttribute('data-filtered') !== 'true').indexOf(card);
+                    const perPage = typeof dealsPerPage === 'number' ? dealsPerPage : 10;
+                    showPage(Math.floor(position / perPage) + 1);
+                }
+                requestAnimationFrame(() => requestAnimationFrame(
+                    () => card.scrollIntoView({ behavior: 'smooth', block: 'center' })));
+            }
+            window.addEventListener('hashchange', revealDeal);
+            if (document.readyState === 'complete') {
+                revealDeal();
+            } else {
+                window.addEventListener('load', revealDeal);
+            }
+        })();
+'''
+
+
+def normalize(text: str) -> str:
+    """The same folding SEARCH_JS applies to queries: no accents, lower case."""
+    return COMBINING_RE.sub('', unicodedata.normalize('NFKD', text)).lower()
+
+
+def tokenize(text: str) -> list:
+    """Index terms of a field: folded words of two or more characters, minus stop words."""
+    return [token for token in TOKEN_SPLIT_RE.split(normalize(text or ''))
+            if len(token) > 1 and token not in STOP_WORDS]
+
+
+def title_ports(title: str) -> list:
+    """Ports named in a title: 'Cruise: Athens, Amalfi Coast & Nice', 'from Larnaca to Athens', 'X Round Trip'."""
+    after_colon = PORTS_AFTER_COLON_RE.search(title)
+    if after_colon:
+        return [port.strip() for port in re.split(r',|&', after_colon.group(1)) if port.strip()]
+    from_to = PORTS_FROM_TO_RE.search(title)
+    if from_to:
+        return list(dict.fromkeys(from_to.groups()))
+    round_trip = ROUND_TRIP_RE.match(title)
+    if round_trip:
+        return [round_trip.group(1)]
+    return []
+
+
+def search_record(deal: dict) -> dict:
+    """The searchable and displayed fields of a catalog record or DealCard dict."""
+    line = deal.get('cruise_line') or ''
+    return {
+        'id': str(deal['deal_id']),
+        'title': deal.get('title') or '',
+        'ports': ', '.join(deal.get('ports') or title_ports(deal.get('title') or '')),
+        'line': '' if line.strip().lower() == 'cruise line' else line,  # template placeholder
+        'ship': '' if deal.get('ship') == 'Luxury Vessel' else deal.get('ship') or '',
+        'region': deal.get('region') or '',
+        'departure': deal.get('departure') or '',
+        'nights': deal.get('nights'),
+        'price': deal.get('new_price'),
+    }
+
+
+def dumps(data) -> str:
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+
+
+def build_index(deals: list) -> tuple:
+    """Returns (manifest dict, {relative path: JSON text}) for deals in result order."""
+    records = [search_record(deal) for deal in deals]
+    postings = {}  # term -> {doc: field mask}
+    for doc, record in enumerate(records):
+        for bit, (field, _) in enumerate(FIELDS):
+            for term in tokenize(record[field]):
+                docs = postings.setdefault(term, {})
+                docs[doc] = docs.get(doc, 0) | 1 << bit
+
+    def encode(term):
+        values = [doc << FIELD_BITS | mask for doc, mask in sorted(postings[term].items())]
+        return [value - previous for value, previous in zip(values, [0] + values[:-1])]
+
+    # One shard per first letter; letters with too many postings split by two
+    by_letter = {}
+    for term in sorted(postings):
+        by_letter.setdefault(term[0], []).append(term)
+    shards = {}
+    for letter, terms in by_letter.items():
+        text = dumps({'terms': terms, 'postings': [encode(term) for term in terms]})
+        if len(text.encode()) <= MAX_SHARD_BYTES:
+            shards[letter] = text
+            continue
+        by_prefix = {}
+        for term in terms:
+            by_prefix.setdefault(term[:2], []).append(term)
+        for prefix, prefix_terms in by_prefix.items():
+            shards[prefix] = dumps({'terms': prefix_terms, 'postings': [encode(term) for term in prefix_terms]})
+
+    files = {os.path.join(SEARCH_DIR, f"terms-{key}.json"): text for key, text in sorted(shards.items())}
+    for start in range(0, len(records), DOC_SHARD_SIZE):
+        rows = [[record[name] for name in ('id', 'title', 'ports', 'line', 'ship', 'region', 'departure',
+                                           'nights', 'price')]
+                for record in records[start:start + DOC_SHARD_SIZE]]
+        files[os.path.join(SEARCH_DIR, f"docs-{start // DOC_SHARD_SIZE}.json")] = dumps(rows)
+
+    digest = hashlib.sha1()
+    for path, text in sorted(files.items()):
+        digest.update(path.encode())
+        digest.update(text.encode())
+    manifest = {
+        'version': digest.hexdigest()[:10],
+        'count': len(records),
+        'base': SEARCH_DIR + '/',
+        'page': RESULTS_PAGE,
+        'shards': sorted(shards),
+        'docShardSize': DOC_SHARD_SIZE,
+        'limit': MAX_RESULTS,
+        'fields': [field for field, _ in FIELDS],
+        'weights': [weight for _, weight in FIELDS],
+        'stopWords': STOP_WORDS,
+    }
+    return manifest, files
+
+
+def stale_files(site_dir: str, files: dict) -> dict:
+    """{path: None} for index files left over from a bigger previous build."""
+    search_dir = os.path.join(site_dir, SEARCH_DIR)
+    if not os.path.isdir(search_dir):
+        return {}
+    return {os.path.join(SEARCH_DIR, name): None for name in os.listdir(search_dir)
+            if name.endswith('.json') and os.path.join(SEARCH_DIR, name) not in files}
+
+
+def render_block(manifest: dict) -> str:
+    data = dumps(manifest).replace('</', '<\\/')
+    return f'''    {BLOCK_START}
+    <style id="deal-search-css">{SEARCH_CSS}    </style>
+    <dialog id="deal-search" class="deal-search" aria-label="Search voyages">
+        <form method="dialog" class="deal-search-form" role="search">
+            <input type="search" id="deal-search-input" placeholder="Search ports, ships, regions or cruise lines"
+                autocomplete="off" aria-controls="deal-search-results">
+            <button class="deal-search-close" value="close" aria-label="Close search">✕</button>
+        </form>
+        <ul id="deal-search-results" class="deal-search-results" role="listbox"></ul>
+        <p class="deal-search-status" aria-live="polite"></p>
+    </dialog>
+    <script type="application/json" id="deal-search-index">{data}</script>
+    <script>{SEARCH_JS}    </script>
+    {BLOCK_END}
+'''
+
+
+def add_search(content: str, manifest: dict) -> str:
+    """Add (or refresh) the search dialog, script and header icon in a page."""
+    content = BLOCK_RE.sub('', content)
+    body_end = content.rfind('</body>')
+    if body_end == -1:
+        raise ValueError("Page has no </body>")
+    content = content[:body_end] + render_block(manifest) + content[body_end:]
+    if 'class="deal-search-open"' not in content and TRIGGER_MARKER in content:
+        content = content.replace(TRIGGER_MARKER, TRIGGER_HTML + TRIGGER_MARKER, 1)
+    return content
+
+
+def search_deals(site_dir: str, page_content: str = None) -> list:
+    """Catalog deals (with pricing) when there is a catalog, else the cards of deals.html."""
+    from deal_catalog import CATALOG_FILE, load_catalog, priced_deals
+    from deal_pricing import PRICING_FILE
+
+    catalog_path = os.path.join(site_dir, os.path.basename(CATALOG_FILE))
+    if os.path.exists(catalog_path):
+        pricing_path = os.path.join(site_dir, os.path.basename(PRICING_FILE))
+        return priced_deals(load_catalog(catalog_path)['deals'], pricing_path)
+    if page_content is None:
+        with open(os.path.join(site_dir, RESULTS_PAGE), 'r', encoding='utf-8') as f:
+            page_content = f.read()
+    return [asdict(card) for card in extract_cards(page_content)]
+
+
+def query(site_dir: str, text: str) -> tuple:
+    """Python twin of SEARCH_JS's search(), for checking an index; returns (total, records)."""
+    with open(os.path.join(site_dir, RESULTS_PAGE), 'r', encoding='utf-8') as f:
+        manifest = json.loads(re.search(r'id="deal-search-index">(.*?)</script>', f.read(), re.DOTALL)
+                              .group(1).replace('<\\/', '</'))
+
+    def load(name):
+        with open(os.path.join(site_dir, manifest['base'], name + '.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    terms = TOKEN_SPLIT_RE.split(normalize(text))
+    terms = [term for term in terms if term]
+    if len(terms) > 1:
+        terms = [term for term in terms if term not in STOP_WORDS]
+    scores = None
+    for term in terms:
+        term_scores = {}
+        keys = [key for key in manifest['shards'] if term[:2].startswith(key) or key.startswith(term[:2])]
+        for shard in (load(f"terms-{key}") for key in keys):
+            i = bisect_left(shard['terms'], term)
+            while i < len(shard['terms']) and shard['terms'][i].startswith(term):
+                bonus = 1 if shard['terms'][i] == term else 0
+                value = 0
+                for delta in shard['postings'][i]:
+                    value += delta
+                    doc = value >> FIELD_BITS
+                    score = max(weight for bit, weight in enumerate(manifest['weights']) if value & 1 << bit) + bonus
+                    term_scores[doc] = max(term_scores.get(doc, 0), score)
+                i += 1
+        scores = term_scores if scores is None else \
+            {doc: score + term_scores[doc] for doc, score in scores.items() if doc in term_scores}
+    scores = scores or {}
+    top = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:manifest['limit']]
+    size = manifest['docShardSize']
+    return len(scores), [load(f"docs-{doc // size}")[doc % size] for doc, _ in top]
+
+
+def cmd_build(args):
+    site_dir = os.path.dirname(os.path.abspath(args.html))
+    deals = search_deals(site_dir)
+    manifest, files = build_index(deals)
+    write_assets(site_dir, {**stale_files(site_dir, files), **files})
+    size = sum(len(text.encode()) for text in files.values())
+    print(f"🔎 Indexed {manifest['count']} deals: {len(manifest['shards'])} term shards, "
+          f"{len(files) - len(manifest['shards'])} doc shards, {size / 1024:.1f} KB in {SEARCH_DIR}/")
+
+    for page in args.pages:
+        path = os.path.join(site_dir, page)
+        if not os.path.exists(path):
+            print(f"⏭️  {page}: not found")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content = add_search(content, manifest)
+        if new_content != content:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            print(f"✅ Updated {page}")
+        else:
+            print(f"✅ {page} already up to date")
+
+
+def cmd_query(args):
+    total, records = query(os.path.dirname(os.path.abspath(args.html)), args.text)
+    for record in records:
+        print(f"  [{record[0]:>4}] {record[1][:60]:<60} {record[3]}")
+    print(f"\n{total} matches")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--html', default=DEALS_FILE, help='results page; the index is written beside it')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='write the index and add search to pages')
+    build_parser.add_argument('--pages', nargs='*', default=DEFAULT_PAGES, help='pages beside --html to update')
+    build_parser.set_defaults(func=cmd_build)
+
+    query_parser = subparsers.add_parser('query', help='run a query against the built index')
+    query_parser.add_argument('text')
+    query_parser.set_defaults(func=cmd_query)
+
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
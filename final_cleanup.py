@@ -7,6 +7,9 @@ Final cleanup:
 
 import re
 
+from deal_cards import extract_cards
+from deal_match import TitleIndex, describe
+
 def read_file(filepath: str) -> str:
     """Read the entire file."""
     with open(filepath, 'r', encoding='utf-8') as f:
@@ -38,12 +41,18 @@ def remove_duplicate_pricing_sections(content: str) -> tuple:
 
 def add_pricing_to_second_athens_civitavecchia(content: str) -> tuple:
     """Add pricing to the second Athens to Civitavecchia card (Silver Muse)."""
-    # Find the second Athens to Civitavecchia (Silver Muse)
-    pattern = r'(Athens to Civitavecchia</h3>.*?Silver\s+Muse.*?</div>\s*</div>)\s*(.*?<button class="luxury-heart-btn")'
-
-    match = re.search(pattern, content, re.DOTALL)
-
-    if match:
+    # Two cards share the title; resolve by ship instead of regex-scanning
+    # from the first title to the next "Silver Muse" on the page
+    cards = extract_cards(content)
+    match = TitleIndex.from_cards(cards).match("Athens to Civitavecchia", ship="Silver Muse")
+    if match.position is None:
+        print(f"  {describe(match)}")
+        return content, False
+    card = cards[match.position - 1]
+    card_html = content[card.start:card.end]
+    heart = card_html.find('<button class="luxury-heart-btn"')
+
+    if heart != -1 and 'text-decoration: line-through' not in card_html:
         # Create pricing section
         pricing_html = '''
 <div style="padding: 24px 0; border-top: 1px solid rgba(10,25,41,0.08); border-bottom: 1px solid rgba(10,25,41,0.08); margin-bottom: 32px;">
@@ -63,7 +72,7 @@ def add_pricing_to_second_athens_civitavecchia(content: str) -> tuple:
 '''
 
         # Insert pricing before the luxury-heart-btn
-        insert_pos = match.start(2)
+        insert_pos = card.start + heart
         content = content[:insert_pos] + pricing_html + content[insert_pos:]
         print("  ✓ Added pricing to second Athens to Civitavecchia card (Silver Muse)")
         return content, True
@@ -8,35 +8,37 @@ Comprehensive fix for all deals.html cards:
 
 import re
 
-# Complete pricing data for ALL cards
-PRICING_DATA = {
-    "A Journey to Adriatic Wonders": {"old": "6100", "new": "5300", "discount": "-13% OFF"},
-    "Baltic Sea & Beyond": {"old": "7200", "new": "6149", "discount": "-15% OFF"},
-    "Spring In The Aegean": {"old": "5300", "new": "4549", "discount": "-14% OFF"},
-    "7-Day Jewels Of The Dalmatian Coast": {"old": "4700", "new": "4092", "discount": "-13% OFF"},
-    "Fort Lauderdale to Bridgetown": {"old": "5800", "new": "4649", "discount": "-20% OFF"},
-    "A Grand Journey from Barcelona to Miami": {"old": "8900", "new": "8450", "discount": "-5% OFF"},
-    "A Grand Journey from Andalusian Shores": {"old": "7200", "new": "6899", "discount": "-4% OFF"},
-    "Cairns to Darwin": {"old": "5890", "new": "5249", "discount": "-11% OFF"},
-    "A Journey from Cliffs to Cathedrals": {"old": "6300", "new": "5799", "discount": "-8% OFF"},
-    "Colorful East Coast": {"old": "9089", "new": "6219", "discount": "-32% OFF"},
-    "10-Day Mediterranean Overture": {"old": "5300", "new": "4823", "discount": "-9% OFF"},
-    "Athens to Civitavecchia": {"old": "5400", "new": "4949", "discount": "-8% OFF"},
-    "Discover Mediterranean Wonders": {"old": "4900", "new": "4299", "discount": "-12% OFF"},
-    "Historical echoes, a voyage from Larnaca to Athens": {"old": "4900", "new": "4349", "discount": "-11% OFF"},
-    "12-Day Amazon Delta": {"old": "6800", "new": "5799", "discount": "-15% OFF"},
-    "Greece, Italy & France Cruise": {"old": "6800", "new": "6249", "discount": "-8% OFF"},
-    "Chilean Fjords": {"old": "8900", "new": "7999", "discount": "-10% OFF"},
-    "New York City Round Trip": {"old": "6200", "new": "5649", "discount": "-9% OFF"},
-    "Monte Carlo to Civitavecchia": {"old": "5900", "new": "5299", "discount": "-10% OFF"},
-    "Spotlight With Ancestry": {"old": "7200", "new": "6599", "discount": "-8% OFF"},
-    "Grand Continental Sojourn": {"old": "12900", "new": "11499", "discount": "-11% OFF"},
-    "Athens to Athens": {"old": "5200", "new": "4799", "discount": "-8% OFF"},
-    "Bangkok, Bali & Beyond": {"old": "8900", "new": "7999", "discount": "-10% OFF"},
-    "7 Night Tortola": {"old": "4800", "new": "4249", "discount": "-11% OFF"},
-    "Greek Odyssey": {"old": "5600", "new": "4760", "discount": "-15% OFF"},
-    "South Africa, Namibia & Cape Verde": {"old": "9159", "new": "6049", "discount": "-34% OFF"},
-}
+from deal_pricing import pricing_data_for
+
+# Every card title; prices come from deal_pricing.csv
+PRICED_TITLES = [
+    "A Journey to Adriatic Wonders",
+    "Baltic Sea & Beyond",
+    "Spring In The Aegean",
+    "7-Day Jewels Of The Dalmatian Coast",
+    "Fort Lauderdale to Bridgetown",
+    "A Grand Journey from Barcelona to Miami",
+    "A Grand Journey from Andalusian Shores",
+    "Cairns to Darwin",
+    "A Journey from Cliffs to Cathedrals",
+    "Colorful East Coast",
+    "10-Day Mediterranean Overture",
+    "Athens to Civitavecchia",
+    "Discover Mediterranean Wonders",
+    "Historical echoes, a voyage from Larnaca to Athens",
+    "12-Day Amazon Delta",
+    "Greece, Italy & France Cruise",
+    "Chilean Fjords",
+    "New York City Round Trip",
+    "Monte Carlo to Civitavecchia",
+    "Spotlight With Ancestry",
+    "Grand Continental Sojourn",
+    "Athens to Athens",
+    "Bangkok, Bali & Beyond",
+    "7 Night Tortola",
+    "Greek Odyssey",
+    "South Africa, Namibia & Cape Verde",
+]
 
 def read_file(filepath: str) -> str:
     """Read the entire file."""
@@ -50,6 +52,7 @@ def write_file(filepath: str, content: str):
 
 def fix_placeholder_prices(content: str) -> str:
     """Fix all £0000 placeholder prices."""
+    prices = pricing_data_for(PRICED_TITLES)
     fixed = 0
     # Find all instances of £0000 and try to replace with correct price
     pattern = r'<span style="font-family: \'Playfair Display\', serif; font-size: 40px; font-weight: 400; color: var\(--navy\); line-height: 1;">£0000</span>'
@@ -72,13 +75,13 @@ def fix_placeholder_prices(content: str) -> str:
 
             # Find matching pricing data
             matched_key = None
-            for key in PRICING_DATA.keys():
+            for key in prices.keys():
                 if key in title or title in key:
                     matched_key = key
                     break
 
             if matched_key:
-                new_price = PRICING_DATA[matched_key]['new']
+                new_price = prices[matched_key]['new']
                 # Replace the first occurrence
                 content = content[:match_pos] + f'£{new_price}' + content[match_pos+5:]
                 fixed += 1
@@ -5,82 +5,29 @@ Extract data from original HTML and apply Opulent Classic design with correct da
 
 import re
 
+from deal_cards import iter_cards
+
 def extract_card_data(html_content):
     """Extract all card data from HTML"""
     cards_data = []
 
-    # Find all article elements
-    article_pattern = r'<article[^>]*data-deal-id="([^"]*)"[^>]*>(.*?)</article>'
-    articles = re.findall(article_pattern, html_content, re.DOTALL)
-
-    for deal_id, content in articles:
-        data = {'deal_id': deal_id}
+    for card in iter_cards(html_content):
+        data = {'deal_id': card.deal_id}
 
-        # Extract logo
-        logo_match = re.search(r'<img src="([^"]+)"[^>]*alt="([^"]+)"', content)
-        if logo_match:
-            data['logo_src'] = logo_match.group(1)
-            data['logo_alt'] = logo_match.group(2)
-        else:
-            data['logo_src'] = ''
-            data['logo_alt'] = ''
+        data['logo_src'] = card.logo
+        data['logo_alt'] = card.cruise_line
+        data['title'] = card.title or 'Luxury Voyage'
+        data['duration'] = str(card.nights) if card.nights is not None else '7'
 
-        # Extract title from h2 or h3
-        title_match = re.search(r'<h[23][^>]*>([^<]+)</h[23]>', content)
-        if title_match:
-            data['title'] = title_match.group(1).strip()
+        # Full dates ("12 May 2026") are shortened to "May 2026"
+        parts = card.departure.split()
+        if len(parts) == 3 and parts[0].isdigit():
+            data['departure'] = f"{parts[1]} {parts[2]}"
         else:
-            data['title'] = 'Luxury Voyage'
+            data['departure'] = card.departure or '2026'
 
-        # Extract duration - look for "X Nights" or "X Night"
-        duration_match = re.search(r'>(\d+)\s*Nights?<', content)
-        if duration_match:
-            data['duration'] = duration_match.group(1)
-        else:
-            data['duration'] = '7'
-
-        # Extract departure - look for month and year pattern or just dates
-        departure_match = re.search(r'>(\d+\s+[A-Za-z]+\s+\d{4})<', content)
-        if departure_match:
-            # Full date found
-            full_date = departure_match.group(1)
-            parts = full_date.split()
-            if len(parts) >= 2:
-                data['departure'] = f"{parts[1]} {parts[2] if len(parts) > 2 else parts[1]}"
-            else:
-                data['departure'] = full_date
-        else:
-            # Look for just year
-            year_match = re.search(r'>(\d{4})<', content)
-            data['departure'] = year_match.group(1) if year_match else '2026'
-
-        # Extract ship - look for "Ship" label followed by value
-        ship_patterns = [
-            r'Ship</div>\s*<div[^>]*>([^<]+)<',
-            r'>Ship<[^>]*>\s*<div[^>]*>([^<]+)<',
-            r'Ship.*?font-weight: 600[^>]*>([^<]+)<'
-        ]
-        for pattern in ship_patterns:
-            ship_match = re.search(pattern, content, re.DOTALL)
-            if ship_match:
-                data['ship'] = ship_match.group(1).strip()
-                break
-        if 'ship' not in data:
-            data['ship'] = 'TBA'
-
-        # Extract region - look for "Region" label followed by value
-        region_patterns = [
-            r'Region</div>\s*<div[^>]*>([^<]+)<',
-            r'>Region<[^>]*>\s*<div[^>]*>([^<]+)<',
-            r'Region.*?font-weight: 600[^>]*>([^<]+)<'
-        ]
-        for pattern in region_patterns:
-            region_match = re.search(pattern, content, re.DOTALL)
-            if region_match:
-                data['region'] = region_match.group(1).strip()
-                break
-        if 'region' not in data:
-            data['region'] = 'TBA'
+        data['ship'] = card.ship or 'TBA'
+        data['region'] = card.region or 'TBA'
 
         cards_data.append(data)
 
@@ -7,28 +7,30 @@ Also ensure proper closing tags.
 import re
 from typing import List, Tuple
 
-# Pricing data for cards (extracted from Save badges and deal info)
-PRICING_DATA = {
-    "Colorful East Coast": {"old": "9089", "new": "6219", "discount": "-32% OFF"},
-    "Greek Odyssey": {"old": "5600", "new": "4760", "discount": "-15% OFF"},
-    "South Africa, Namibia & Cape Verde Cruise": {"old": "7899", "new": "6199", "discount": "-22% OFF"},
-    "Fort Lauderdale to Bridgetown": {"old": "5800", "new": "4649", "discount": "-20% OFF"},
-    "A Grand Journey from Barcelona to Miami": {"old": "8900", "new": "8450", "discount": "-5% OFF"},
-    "A Grand Journey from Andalusian Shores to Coral-La": {"old": "7200", "new": "6899", "discount": "-4% OFF"},
-    "Cairns to Darwin": {"old": "5890", "new": "5249", "discount": "-11% OFF"},
-    "A Journey from Cliffs to Cathedrals": {"old": "6300", "new": "5799", "discount": "-8% OFF"},
-    "10-Day Mediterranean Overture": {"old": "5300", "new": "4823", "discount": "-9% OFF"},
-    "Historical echoes, a voyage from Larnaca to Athens": {"old": "4900", "new": "4349", "discount": "-11% OFF"},
-    "Greece, Italy & France Cruise": {"old": "6800", "new": "6249", "discount": "-8% OFF"},
-    "Chilean Fjords & Scenic Shores": {"old": "8900", "new": "7999", "discount": "-10% OFF"},
-    "New York City Round Trip": {"old": "6200", "new": "5649", "discount": "-9% OFF"},
-    "Monte Carlo to Civitavecchia": {"old": "5900", "new": "5299", "discount": "-10% OFF"},
-    "Spotlight With Ancestry": {"old": "7200", "new": "6599", "discount": "-8% OFF"},
-    "Grand Continental Sojourn": {"old": "12900", "new": "11499", "discount": "-11% OFF"},
-    "Athens to Athens": {"old": "5200", "new": "4799", "discount": "-8% OFF"},
-    "Athens to Civitavecchia": {"old": "5400", "new": "4949", "discount": "-8% OFF"},
-    "Bangkok, Bali & Beyond": {"old": "8900", "new": "7999", "discount": "-10% OFF"},
-}
+from deal_pricing import pricing_data_for
+
+# Cards to fix; prices come from deal_pricing.csv
+PRICED_TITLES = [
+    "Colorful East Coast",
+    "Greek Odyssey",
+    "South Africa, Namibia & Cape Verde Cruise",
+    "Fort Lauderdale to Bridgetown",
+    "A Grand Journey from Barcelona to Miami",
+    "A Grand Journey from Andalusian Shores to Coral-La",
+    "Cairns to Darwin",
+    "A Journey from Cliffs to Cathedrals",
+    "10-Day Mediterranean Overture",
+    "Historical echoes, a voyage from Larnaca to Athens",
+    "Greece, Italy & France Cruise",
+    "Chilean Fjords & Scenic Shores",
+    "New York City Round Trip",
+    "Monte Carlo to Civitavecchia",
+    "Spotlight With Ancestry",
+    "Grand Continental Sojourn",
+    "Athens to Athens",
+    "Athens to Civitavecchia",
+    "Bangkok, Bali & Beyond",
+]
 
 CTA_BUTTONS_TEMPLATE = '''
                                 <!-- CTA Buttons - Full Width -->
@@ -148,7 +150,7 @@ def main():
     print("\nFixing cards missing CTA buttons and pricing...\n")
 
     # Fix cards in order
-    for card_title, pricing_data in PRICING_DATA.items():
+    for card_title, pricing_data in pricing_data_for(PRICED_TITLES).items():
         content = fix_card_missing_cta(content, card_title, pricing_data)
 
     print("\nWriting fixed content...")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Turn onmouseover/onmouseout style handlers into CSS :hover rules
+
+The card and CTA templates animate hover states with inline handlers:
+
+    onmouseover="this.style.color='#d4af37'" onmouseout="this.style.color='#888'"
+
+which run JavaScript and write styles synchronously on every pointer move.
+This pass parses each handler pair and, when onmouseout only restores the
+element's own inline values, replaces the pair with a class whose rules
+live in a <style id="hover-css"> block:
+
+    :where(.hv-1a2b3c:hover, .hv-1a2b3c:focus-visible) { color: #d4af37 !important; }
+
+!important is what lets a stylesheet rule override the inline base value;
+:where() keeps the specificity at zero so the page's own !important
+overrides (the mobile media queries) still win, as they did against the
+inline writes. Containers that cannot take focus themselves (the deal
+cards) use :focus-within, so tabbing to a card's buttons expands its
+details the way hovering does. Elements without an inline transition get a 0.3s one for
+the hovered properties.
+
+Handled statements: this.style.x = '...', this.querySelector('.c').style.x
+= '...' and this.querySelectorAll('.c').forEach(el => {el.style.x = '...'}).
+Anything else (previousElementSibling, computed values) keeps its handlers.
+
+Usage:
+    python3 hover_css.py deals.html [--output out.html] [--dry-run]
+"""
+
+import argparse
+import hashlib
+import html
+import re
+import sys
+
+from atomic_css import STYLE_BLOCK_ID as ATOMIC_BLOCK_ID, camel_to_kebab, parse_declaration, split_declarations
+from deal_cards import DEALS_FILE
+
+STYLE_BLOCK_ID = 'hover-css'
+CLASS_PREFIX = 'hv-'
+TRANSITION = '0.3s ease'
+
+START_TAG_RE = re.compile(r'<([a-zA-Z][a-zA-Z0-9-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>', re.DOTALL)
+SKIP_RE = re.compile(r'<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>', re.DOTALL | re.IGNORECASE)
+HANDLER_RE = re.compile(r'\s+on(mouseover|mouseout)\s*=\s*"([^"]*)"', re.IGNORECASE)
+CLASS_ATTR_RE = re.compile(r'(\s)class\s*=\s*"([^"]*)"', re.IGNORECASE)
+STYLE_ATTR_RE = re.compile(r'\sstyle\s*=\s*"([^"]*)"', re.IGNORECASE)
+HOVER_BLOCK_RE = re.compile(r'\n?\s*<style id="' + STYLE_BLOCK_ID + r'">(.*?)</style>', re.DOTALL)
+
+SELF_RE = re.compile(r'^this\.style\.(\w+)\s*=\s*([\'"])(.*)\2$', re.DOTALL)
+QUERY_ONE_RE = re.compile(r'^this\.querySelector\(([\'"])([.\w-]+)\1\)\.style\.(\w+)\s*=\s*([\'"])(.*)\4$', re.DOTALL)
+QUERY_ALL_RE = re.compile(
+    r'^this\.querySelectorAll\(([\'"])([.\w-]+)\1\)\.forEach\(\s*\(?(\w+)\)?\s*=>\s*\{(.*)\}\s*\)$', re.DOTALL)
+VAR_STYLE_RE = r'^{var}\.style\.(\w+)\s*=\s*([\'"])(.*)\2$'
+SIMPLE_SELECTOR_RE = re.compile(r'^\.[\w-]+$|^[a-zA-Z][\w-]*$')
+IDENTITY_FUNCTION_RE = re.compile(
+    r'(?:translate[XYZ3d]*|rotate[XYZ]?|skew[XY]?)\(\s*0(?:px|deg|%)?(?:\s*,\s*0(?:px|deg|%)?)*\s*\)'
+    r'|scale[XYZ3d]*\(\s*1(?:\s*,\s*1)*\s*\)',
+    re.IGNORECASE
+)
+FOCUSABLE_TAGS = {'a', 'button', 'input', 'select', 'textarea', 'summary'}
+NONE_INITIAL = {'transform', 'box-shadow', 'text-shadow', 'filter', 'background-image'}
+BOX_SHORTHANDS = {'padding', 'margin'}
+SIDES = ('top', 'right', 'bottom', 'left')
+BORDER_STYLES = {'none', 'hidden', 'dotted', 'dashed', 'solid', 'double', 'groove', 'ridge', 'inset', 'outset'}
+
+
+def split_statements(code: str) -> list:
+    """Top-level ';'-separated statements (not splitting inside (), {} or quotes)."""
+    statements = []
+    depth = 0
+    quote = None
+    start = 0
+    for i, char in enumerate(code):
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in '"\'`':
+            quote = char
+        elif char in '({[':
+            depth += 1
+        elif char in ')}]':
+            depth -= 1
+        elif char == ';' and depth == 0:
+            statements.append(code[start:i])
+            start = i + 1
+    statements.append(code[start:])
+    return [s.strip() for s in statements if s.strip()]
+
+
+def parse_handler(code: str):
+    """{(target, property): value} for a handler, target None meaning the element; None if unsupported."""
+    assignments = {}
+    for statement in split_statements(html.unescape(code)):
+        match = SELF_RE.match(statement)
+        if match:
+            assignments[(None, camel_to_kebab(match.group(1)))] = match.group(3)
+            continue
+        match = QUERY_ONE_RE.match(statement)
+        if match and SIMPLE_SELECTOR_RE.match(match.group(2)):
+            assignments[(match.group(2), camel_to_kebab(match.group(3)))] = match.group(5)
+            continue
+        match = QUERY_ALL_RE.match(statement)
+        if match and SIMPLE_SELECTOR_RE.match(match.group(2)):
+            inner = re.compile(VAR_STYLE_RE.format(var=re.escape(match.group(3))), re.DOTALL)
+            for body_statement in split_statements(match.group(4)):
+                body_match = inner.match(body_statement)
+                if not body_match:
+                    return None
+                assignments[(match.group(2), camel_to_kebab(body_match.group(1)))] = body_match.group(3)
+            continue
+        return None
+    return assignments
+
+
+def normalize(value: str) -> str:
+    return re.sub(r'\s*([,()])\s*', r'\1', ' '.join(value.split()).lower())
+
+
+def is_reset(prop: str, value: str) -> bool:
+    """True if value is what an absent declaration already looks like."""
+    value = normalize(value)
+    if value in ('', 'initial', 'unset'):
+        return True
+    if value == 'none' and prop in NONE_INITIAL:
+        return True
+    if prop == 'transform':
+        return not IDENTITY_FUNCTION_RE.sub('', value).strip()
+    return False
+
+
+def split_values(value: str) -> list:
+    """Space-separated tokens of a value, keeping rgba(...) and friends whole."""
+    return re.findall(r'[^\s(]+(?:\([^)]*\))?', value)
+
+
+def base_value(styles: dict, prop: str):
+    """Inline value of prop, read out of padding/margin/border shorthands if needed."""
+    if prop in styles:
+        return styles[prop]
+    shorthand, _, side = prop.partition('-')
+    if shorthand in BOX_SHORTHANDS and side in SIDES and shorthand in styles:
+        values = split_values(styles[shorthand])
+        if 1 <= len(values) <= 4:
+            top = values[0]
+            right = values[1] if len(values) > 1 else top
+            bottom = values[2] if len(values) > 2 else top
+            left = values[3] if len(values) > 3 else right
+            return {'top': top, 'right': right, 'bottom': bottom, 'left': left}[side]
+    if prop == 'border-color' and 'border' in styles:
+        colors = [v for v in split_values(styles['border'])
+                  if v.lower() not in BORDER_STYLES and not re.match(r'^[\d.]+(?:px|em|rem)?$|^(?:thin|medium|thick)$', v)]
+        return colors[0] if len(colors) == 1 else None
+    return None
+
+
+def inline_styles(tag: str) -> dict:
+    """{property: value} of a start tag's style attribute."""
+    match = STYLE_ATTR_RE.search(tag)
+    declarations = {}
+    for raw in split_declarations(html.unescape(match.group(1))) if match else []:
+        parsed = parse_declaration(raw)
+        if parsed:
+            declarations[parsed[0]] = parsed[1]
+    return declarations
+
+
+def element_tags(content: str, start: int, end: int, name: str) -> list:
+    """Start tags inside the element whose start tag spans content[start:end]."""
+    depth = 1
+    tags = []
+    close_re = re.compile(r'<(/?)(' + re.escape(name) + r')\b', re.IGNORECASE)
+    position = end
+    while depth:
+        close = close_re.search(content, position)
+        if not close:
+            break
+        depth += -1 if close.group(1) else 1
+        position = close.end()
+    subtree = SKIP_RE.sub(lambda m: ' ' * len(m.group(0)), content[end:position])
+    return [m.group(0) for m in START_TAG_RE.finditer(subtree)]
+
+
+def targets_of(selector: str, descendants: list) -> list:
+    if selector.startswith('.'):
+        wanted = selector[1:]
+        return [tag for tag in descendants
+                if CLASS_ATTR_RE.search(tag) and wanted in CLASS_ATTR_RE.search(tag).group(2).split()]
+    return [tag for tag in descendants if re.match(r'<' + re.escape(selector) + r'\b', tag, re.IGNORECASE)]
+
+
+def restores_base(content: str, match, over: dict, out: dict) -> bool:
+    """True if onmouseout puts back exactly the inline values onmouseover changed."""
+    if set(over) != set(out):
+        return False
+    descendants = None
+    for (target, prop), value in out.items():
+        if target is None:
+            tags = [match.group(0)]
+        else:
+            if descendants is None:
+                descendants = element_tags(content, match.start(), match.end(), match.group(1))
+            tags = targets_of(target, descendants)
+            if not tags:
+                return False
+        for tag in tags:
+            base = base_value(inline_styles(tag), prop)
+            if base is None and not is_reset(prop, value):
+                return False
+            if base is not None and normalize(base) != normalize(value):
+                return False
+    return True
+
+
+def hover_rules(name: str, over: dict, transitions: dict, focus: str) -> list:
+    """CSS lines for one hover class."""
+    groups = {}
+    for (target, prop), value in over.items():
+        groups.setdefault(target, []).append((prop, value))
+
+    lines = []
+    for target in sorted(groups, key=lambda t: t or ''):
+        suffix = f" {target}" if target else ''
+        body = ' '.join(f"{prop}: {value} !important;" for prop, value in groups[target])
+        lines.append(f":where(.{name}:hover{suffix}, .{name}{focus}{suffix}) {{ {body} }}")
+        if transitions.get(target):
+            props = ', '.join(f"{prop} {TRANSITION}" for prop, _ in groups[target])
+            lines.append(f":where(.{name}{suffix}) {{ transition: {props}; }}")
+    return lines
+
+
+def convert(content: str) -> tuple:
+    """Returns (content, stats dict)."""
+    if f'id="{ATOMIC_BLOCK_ID}"' in content:
+        raise ValueError("page has atomic classes; run atomic_css.py expand first")
+
+    existing = HOVER_BLOCK_RE.search(content)
+    rules = {}
+    if existing:
+        for line in existing.group(1).strip().splitlines():
+            name = re.match(r':where\(\.(' + CLASS_PREFIX + r'[0-9a-f]+)', line.strip())
+            if name:
+                rules.setdefault(name.group(1), []).append(line.strip())
+        content = content[:existing.start()] + content[existing.end():]
+
+    skipped = {}
+    stats = {'converted': 0, 'kept': 0}
+    skip_spans = [m.span() for m in SKIP_RE.finditer(content)]
+    pieces = []
+    last = 0
+    span_index = 0
+    for match in START_TAG_RE.finditer(content):
+        while span_index < len(skip_spans) and skip_spans[span_index][1] <= match.start():
+            span_index += 1
+        if span_index < len(skip_spans) and skip_spans[span_index][0] <= match.start():
+            continue
+        tag = match.group(0)
+        handlers = {kind.lower(): code for kind, code in HANDLER_RE.findall(tag)}
+        if not handlers:
+            continue
+        over = parse_handler(handlers.get('mouseover', ''))
+        out = parse_handler(handlers.get('mouseout', ''))
+        if not over or out is None or not restores_base(content, match, over, out):
+            stats['kept'] += 1
+            key = ' '.join(handlers.get('mouseover', '').split())[:70]
+            skipped[key] = skipped.get(key, 0) + 1
+            continue
+
+        transitions = {}
+        for target in {t for t, _ in over}:
+            if target is None:
+                transitions[None] = 'transition' not in inline_styles(tag)
+            else:
+                descendants = element_tags(content, match.start(), match.end(), match.group(1))
+                transitions[target] = any('transition' not in inline_styles(t) for t in targets_of(target, descendants))
+
+        focusable = match.group(1).lower() in FOCUSABLE_TAGS or re.search(r'\stabindex\s*=', tag)
+        focus = ':focus-visible' if focusable else ':focus-within'
+        signature = repr(sorted(over.items(), key=repr)) + repr(sorted(transitions.items(), key=repr)) + focus
+        name = CLASS_PREFIX + hashlib.sha1(signature.encode()).hexdigest()[:6]
+        rules.setdefault(name, hover_rules(name, over, transitions, focus))
+
+        new_tag = HANDLER_RE.sub('', tag)
+        class_match = CLASS_ATTR_RE.search(new_tag)
+        if class_match:
+            new_tag = (new_tag[:class_match.start(2)] + f"{class_match.group(2).strip()} {name}".strip()
+                       + new_tag[class_match.end(2):])
+        else:
+            new_tag = re.sub(r'^<([a-zA-Z][a-zA-Z0-9-]*)', lambda m: f'<{m.group(1)} class="{name}"', new_tag)
+        pieces.append(content[last:match.start()])
+        pieces.append(new_tag)
+        last = match.end()
+        stats['converted'] += 1
+
+    pieces.append(content[last:])
+    content = ''.join(pieces)
+
+    used = {name for name in rules if re.search(r'[\s"]' + re.escape(name) + r'[\s"]', content)}
+    css = '\n'.join(line for name in sorted(used) for line in rules[name])
+    if css:
+        head_end = content.find('</head>')
+        if head_end < 0:
+            raise ValueError("no </head> to put the hover stylesheet in")
+        block = f'\n    <style id="{STYLE_BLOCK_ID}">\n{css}\n    </style>\n'
+        content = content[:head_end].rstrip() + block + content[head_end:]
+    stats['classes'] = len(used)
+    stats['skipped'] = skipped
+    return content, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('html', nargs='?', default=DEALS_FILE)
+    parser.add_argument('--output', help='write here instead of overwriting the page')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    with open(args.html, 'r', encoding='utf-8') as f:
+        content = f.read()
+    try:
+        new_content, stats = convert(content)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    for handler, count in sorted(stats['skipped'].items(), key=lambda item: -item[1]):
+        print(f"  ⏭️  kept {count}× {handler}")
+    print(f"✅ {stats['converted']} handler pairs -> {stats['classes']} hover classes, "
+          f"{stats['kept']} left as JavaScript; {len(content) - len(new_content):+,} bytes saved")
+    if not args.dry_run and new_content != content:
+        with open(args.output or args.html, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+
+
+if __name__ == '__main__':
+    main()
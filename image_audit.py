@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate image finder and reference audit for the site's image trees
+
+Computes a 64-bit difference hash (dHash) of every image under the site,
+groups images whose hashes are within a few bits of each other, and
+cross-references every src, srcset and CSS url() in the HTML pages to see
+which copies are actually used. Hashes are cached in .image_hashes.json by
+file size and mtime, so re-runs only open new or changed files.
+
+A dHash is too coarse to tell apart images that differ only in a small
+area: two award badges with the same frame and different wording are 4 bits
+apart. Every hash match is therefore confirmed on 32x32 grey thumbnails; a
+pair whose worst 4x4 block differs by more than MAX_BLOCK_DIFF goes to the
+plan's review list instead of a cluster, and `apply` leaves it alone.
+
+`plan` picks one canonical file per cluster (most referenced, then largest,
+then shortest path) and writes a dedupe plan; `apply` rewrites the pages'
+references to the canonical files and, with --delete, removes duplicates
+that nothing references any more - no page, and no stylesheet, script or
+JSON file (deal_catalog.json, search shards) anywhere under the site.
+
+Usage:
+    python3 image_audit.py report [--threshold 4]
+    python3 image_audit.py plan --output dedupe_plan.json
+    python3 image_audit.py apply dedupe_plan.json [--delete]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import time
+
+from deal_cards import DEALS_FILE
+
+SITE_DIR = os.path.dirname(DEALS_FILE)
+CACHE_NAME = '.image_hashes.json'
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
+SKIP_DIRS = {'.git', 'venv', 'node_modules', '__pycache__', 'responsive'}
+DEFAULT_THRESHOLD = 4  # differing bits out of 64
+THUMB_SIZE = 32
+BLOCK = 4              # thumbnail pixels per block side
+MAX_BLOCK_DIFF = 16    # mean grey-level difference (0-255) allowed in the worst block
+TEXT_EXTENSIONS = {'.html', '.htm', '.css', '.js', '.json', '.xml', '.svg', '.txt', '.md', '.webmanifest'}
+
+SRC_RE = re.compile(r'\b((?:data-)?src)\s*=\s*(["\'])(.*?)\2', re.DOTALL)
+SRCSET_RE = re.compile(r'\b((?:data-)?srcset)\s*=\s*(["\'])(.*?)\2', re.DOTALL)
+URL_RE = re.compile(r'url\(\s*(["\']?)([^)"\']+)\1\s*\)')
+EXTERNAL_RE = re.compile(r'^(?:[a-zA-Z][a-zA-Z0-9+.-]*:|//|#)')
+# Anything in a text file that looks like a path to an image
+IMAGE_PATH_RE = re.compile(r'[^\s"\'`()<>,;=\\]+\.(?:jpe?g|png|gif|webp)\b', re.IGNORECASE)
+
+
+def flattened(image):
+    """Greyscale copy of an image, transparency flattened onto white."""
+    from PIL import Image
+
+    if image.mode in ('RGBA', 'LA', 'P'):
+        # Flatten transparency onto white so logos hash by what is visible
+        image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, (255, 255, 255, 255))
+        image = Image.alpha_composite(background, image)
+    return image.convert('L')
+
+
+def dhash(path: str) -> tuple:
+    """(64-bit difference hash, width, height) of an image."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        width, height = image.size
+        pixels = flattened(image).resize((9, 8), Image.LANCZOS).tobytes()
+
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] < pixels[row * 9 + col + 1])
+    return bits, width, height
+
+
+def thumbnail(path: str) -> bytes:
+    """THUMB_SIZE x THUMB_SIZE grey pixels of an image, for confirming hash matches."""
+    from PIL import Image
+
+    with Image.open(path) as image:
+        return flattened(image).resize((THUMB_SIZE, THUMB_SIZE), Image.BOX).tobytes()
+
+
+def block_difference(a: bytes, b: bytes) -> float:
+    """Mean grey-level difference of the most different BLOCK x BLOCK block of two thumbnails."""
+    worst = 0
+    for top in range(0, THUMB_SIZE, BLOCK):
+        for left in range(0, THUMB_SIZE, BLOCK):
+            total = 0
+            for row in range(top, top + BLOCK):
+                start = row * THUMB_SIZE + left
+                total += sum(abs(x - y) for x, y in zip(a[start:start + BLOCK], b[start:start + BLOCK]))
+            worst = max(worst, total)
+    return worst / (BLOCK * BLOCK)
+
+
+def find_images(site_dir: str) -> list:
+    """Site-relative paths of every image file."""
+    images = []
+    for dirpath, dirnames, filenames in os.walk(site_dir):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+                images.append(os.path.relpath(os.path.join(dirpath, name), site_dir).replace(os.sep, '/'))
+    return images
+
+
+def load_hashes(site_dir: str) -> dict:
+    try:
+        with open(os.path.join(site_dir, CACHE_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_hashes(site_dir: str, hashes: dict):
+    path = os.path.join(site_dir, CACHE_NAME)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def hash_images(site_dir: str, images: list) -> tuple:
+    """{path: record} for all images, reusing cached hashes; returns (records, hashed)."""
+    cache = load_hashes(site_dir)
+    records = {}
+    hashed = 0
+    for image in images:
+        stat = os.stat(os.path.join(site_dir, image))
+        cached = cache.get(image)
+        if cached and cached['size'] == stat.st_size and cached['mtime'] == stat.st_mtime:
+            records[image] = cached
+            continue
+        try:
+            bits, width, height = dhash(os.path.join(site_dir, image))
+        except Exception as e:
+            print(f"  ⚠️  {image}: {e}")
+            continue
+        records[image] = {'size': stat.st_size, 'mtime': stat.st_mtime,
+                          'dhash': f"{bits:016x}", 'width': width, 'height': height}
+        hashed += 1
+    save_hashes(site_dir, records)
+    return records, hashed
+
+
+def cluster(records: dict, threshold: int = DEFAULT_THRESHOLD, confirm=None) -> tuple:
+    """Groups of images whose hashes differ in at most threshold bits.
+
+    Splits each hash into threshold + 1 bands: two hashes within threshold
+    bits must agree exactly on at least one band, so only images sharing a
+    band are compared instead of every pair. confirm(a, b), if given, has the
+    final say on each hash match. Returns (groups, rejected pairs).
+    """
+    paths = sorted(records)
+    hashes = [int(records[path]['dhash'], 16) for path in paths]
+    bands = threshold + 1
+    band_bits = [64 // bands + (1 if i < 64 % bands else 0) for i in range(bands)]
+
+    parent = list(range(len(paths)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    buckets = {}
+    for index, bits in enumerate(hashes):
+        shift = 0
+        for band, width in enumerate(band_bits):
+            buckets.setdefault((band, (bits >> shift) & ((1 << width) - 1)), []).append(index)
+            shift += width
+
+    rejected = set()
+    for members in buckets.values():
+        for a_pos, a in enumerate(members):
+            for b in members[a_pos + 1:]:
+                if find(a) == find(b) or (a, b) in rejected or bin(hashes[a] ^ hashes[b]).count('1') > threshold:
+                    continue
+                if confirm is None or confirm(paths[a], paths[b]):
+                    parent[find(b)] = find(a)
+                else:
+                    rejected.add((a, b))
+
+    groups = {}
+    for index, path in enumerate(paths):
+        groups.setdefault(find(index), []).append(path)
+    rejected = sorted((paths[a], paths[b]) for a, b in rejected if find(a) != find(b))
+    return sorted((group for group in groups.values() if len(group) > 1), key=lambda g: (-len(g), g)), rejected
+
+
+def resolve(url: str, page_dir: str, site_dir: str):
+    """Site-relative path a local reference points at, or None."""
+    url = url.strip()
+    if not url or EXTERNAL_RE.match(url) or url.startswith('data:'):
+        return None
+    url = url.split('#')[0].split('?')[0]
+    if url.startswith('/'):
+        path = os.path.join(site_dir, url.lstrip('/'))
+    else:
+        path = os.path.join(page_dir, url)
+    return os.path.relpath(os.path.normpath(path), site_dir).replace(os.sep, '/')
+
+
+def iter_references(content: str):
+    """(url, start, end) for every src, srcset candidate and url() in a page."""
+    for match in SRC_RE.finditer(content):
+        yield match.group(3), match.start(3), match.end(3)
+    for match in SRCSET_RE.finditer(content):
+        offset = match.start(3)
+        for candidate in re.finditer(r'[^,\s][^,]*', match.group(3)):
+            url = candidate.group(0).split()[0]
+            yield url, offset + candidate.start(), offset + candidate.start() + len(url)
+    for match in URL_RE.finditer(content):
+        yield match.group(2), match.start(2), match.end(2)
+
+
+def find_pages(site_dir: str) -> list:
+    return sorted(glob.glob(os.path.join(site_dir, '*.html')))
+
+
+def collect_references(pages: list, site_dir: str) -> dict:
+    """{image path: {page name: count}} for every local image reference."""
+    references = {}
+    for page in pages:
+        with open(page, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        page_dir = os.path.dirname(os.path.abspath(page))
+        name = os.path.relpath(page, site_dir)
+        for url, _, _ in iter_references(content):
+            path = resolve(url, page_dir, site_dir)
+            if path and os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+                counts = references.setdefault(path, {})
+                counts[name] = counts.get(name, 0) + 1
+    return references
+
+
+def text_references(site_dir: str, exclude: set = frozenset()) -> set:
+    """Site-relative image paths named anywhere in the site's text files.
+
+    Deliberately generous, for deciding what is safe to delete: any string
+    ending in an image extension counts, resolved both against the file's
+    folder and the site root. Dot files (hash and download caches) and the
+    paths in exclude (the dedupe plan itself) are skipped.
+    """
+    found = set()
+    for dirpath, dirnames, filenames in os.walk(site_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.')]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            if (name.startswith('.') or os.path.abspath(path) in exclude
+                    or os.path.splitext(name)[1].lower() not in TEXT_EXTENSIONS):
+                continue
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                content = f.read()
+            for url in set(IMAGE_PATH_RE.findall(content)):
+                for base in (dirpath, site_dir):
+                    resolved = resolve(url, base, site_dir)
+                    if resolved:
+                        found.add(resolved)
+    return found
+
+
+def choose_canonical(group: list, records: dict, references: dict) -> str:
+    """Most referenced copy, then the largest, then the shortest path."""
+    def rank(path):
+        record = records[path]
+        return (-sum(references.get(path, {}).values()),
+                -record['width'] * record['height'], -record['size'], len(path), path)
+    return min(group, key=rank)
+
+
+def make_plan(site_dir: str, threshold: int) -> dict:
+    images = find_images(site_dir)
+    records, hashed = hash_images(site_dir, images)
+    pages = find_pages(site_dir)
+    references = collect_references(pages, site_dir)
+    thumbnails = {}
+
+    def pixels(path):
+        if path not in thumbnails:
+            thumbnails[path] = thumbnail(os.path.join(site_dir, path))
+        return thumbnails[path]
+
+    differences = {}
+
+    def confirm(a, b):
+        differences[a, b] = differences[b, a] = block_difference(pixels(a), pixels(b))
+        return differences[a, b] <= MAX_BLOCK_DIFF
+
+    groups, rejected = cluster(records, threshold, confirm)
+
+    clusters = []
+    for group in groups:
+        canonical = choose_canonical(group, records, references)
+        base = int(records[canonical]['dhash'], 16)
+        duplicates = [{
+            'path': path,
+            'distance': bin(base ^ int(records[path]['dhash'], 16)).count('1'),
+            'block_difference': round(block_difference(pixels(canonical), pixels(path)), 1),
+            'bytes': records[path]['size'],
+            'references': references.get(path, {}),
+        } for path in group if path != canonical]
+        clusters.append({'canonical': canonical, 'references': references.get(canonical, {}),
+                         'duplicates': duplicates})
+
+    return {
+        'threshold': threshold,
+        'images': len(records),
+        'hashed': hashed,
+        'pages': [os.path.relpath(page, site_dir) for page in pages],
+        'clusters': clusters,
+        'review': [{'paths': [a, b], 'distance': bin(int(records[a]['dhash'], 16)
+                                                     ^ int(records[b]['dhash'], 16)).count('1'),
+                    'block_difference': round(differences[a, b], 1)} for a, b in rejected],
+        'unreferenced': sorted(path for path in records if path not in references),
+        'missing': sorted(path for path in references if not os.path.exists(os.path.join(site_dir, path))),
+        'bytes': {path: record['size'] for path, record in records.items()},
+    }
+
+
+def print_report(plan: dict):
+    sizes = plan['bytes']
+    print(f"\n🔎 {plan['images']} images ({plan['hashed']} hashed this run), "
+          f"{len(plan['pages'])} pages, threshold {plan['threshold']} bits")
+
+    saved = 0
+    for group in plan['clusters']:
+        refs = sum(group['references'].values())
+        print(f"\n  ★ {group['canonical']}  ({sizes[group['canonical']] // 1024} KB, {refs} refs)")
+        for dup in group['duplicates']:
+            dup_refs = sum(dup['references'].values())
+            print(f"    {dup['distance']:>2} bits  {dup['path']}  ({dup['bytes'] // 1024} KB, {dup_refs} refs)")
+            saved += dup['bytes']
+
+    for pair in plan.get('review', []):
+        print(f"\n  ? {pair['paths'][0]}\n    {pair['distance']:>2} bits  {pair['paths'][1]}  "
+              f"(pixels differ by {pair['block_difference']} in one block: review by eye, not applied)")
+
+    unreferenced = sum(sizes[path] for path in plan['unreferenced'])
+    print(f"\n📦 {len(plan['clusters'])} clusters, "
+          f"{sum(len(g['duplicates']) for g in plan['clusters'])} duplicates, "
+          f"{saved / 1024 / 1024:.1f} MB removable by dedupe")
+    print(f"🗑️  {len(plan['unreferenced'])} images referenced by no page ({unreferenced / 1024 / 1024:.1f} MB)")
+    for path in plan['missing']:
+        print(f"  ❌ referenced but missing: {path}")
+
+
+def rewrite_references(content: str, page_dir: str, site_dir: str, mapping: dict) -> tuple:
+    """Point references at canonical files; returns (content, references changed)."""
+    pieces = []
+    last = 0
+    changed = 0
+    for url, start, end in sorted(iter_references(content), key=lambda ref: ref[1]):
+        target = mapping.get(resolve(url, page_dir, site_dir))
+        if not target:
+            continue
+        if url.startswith('/'):
+            new_url = '/' + target
+        else:
+            new_url = os.path.relpath(os.path.join(site_dir, target), page_dir).replace(os.sep, '/')
+        pieces.append(content[last:start])
+        pieces.append(new_url)
+        last = end
+        changed += 1
+    pieces.append(content[last:])
+    return ''.join(pieces), changed
+
+
+def apply_plan(plan: dict, site_dir: str, delete: bool = False, plan_path: str = None):
+    mapping = {dup['path']: group['canonical'] for group in plan['clusters'] for dup in group['duplicates']}
+    for page in plan['pages']:
+        path = os.path.join(site_dir, page)
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content, changed = rewrite_references(content, os.path.dirname(os.path.abspath(path)),
+                                                  site_dir, mapping)
+        if changed:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            print(f"  ✏️  {page}: {changed} references")
+
+    if delete:
+        still_used = set(collect_references([os.path.join(site_dir, page) for page in plan['pages']], site_dir))
+        still_used |= text_references(site_dir, {os.path.abspath(plan_path)} if plan_path else set())
+        removed = kept = 0
+        for duplicate in mapping:
+            if not os.path.exists(os.path.join(site_dir, duplicate)):
+                continue
+            if duplicate in still_used:
+                kept += 1
+                continue
+            os.remove(os.path.join(site_dir, duplicate))
+            removed += 1
+        print(f"  🗑️  {removed} duplicate files deleted, {kept} kept because something still names them")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--site', default=SITE_DIR, help='folder holding the pages and images')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    for name, help_text in (('report', 'print clusters and unused images'), ('plan', 'write a dedupe plan')):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument('--threshold', type=int, default=DEFAULT_THRESHOLD,
+                         help='max differing hash bits for a near-duplicate')
+        if name == 'plan':
+            sub.add_argument('--output', default='dedupe_plan.json')
+
+    apply_parser = subparsers.add_parser('apply', help='rewrite pages to canonical files')
+    apply_parser.add_argument('plan')
+    apply_parser.add_argument('--delete', action='store_true',
+                              help='delete duplicates that no page or text asset references')
+    args = parser.parse_args()
+
+    if args.command == 'apply':
+        with open(args.plan, 'r', encoding='utf-8') as f:
+            apply_plan(json.load(f), args.site, args.delete, args.plan)
+        return
+
+    start = time.perf_counter()
+    plan = make_plan(args.site, args.threshold)
+    print_report(plan)
+    print(f"\n⏱️  {time.perf_counter() - start:.2f}s")
+    if args.command == 'plan':
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(plan, f, indent=1)
+        print(f"💾 Plan written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Pooled, streaming image downloader
+
+Fetches many images concurrently over one pooled httpx client instead of
+forking a wget process per image. Each response is streamed to a .part file
+and renamed into place only once it is complete and its magic bytes say it
+is an image, so an error page or a cut-off transfer never lands on disk as
+a .jpg. ETag / Last-Modified values are kept in .download_meta.json next to
+the images, and re-runs send conditional requests so unchanged images cost
+a 304 instead of a full download.
+
+Usage:
+    python3 image_downloader.py urls.txt --output images/deals    # "url [filename]" per line
+    python3 image_downloader.py bench [count]                     # against a local HTTP server
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+try:
+    import fcntl
+except ImportError:  # Windows: the re-read below still narrows the window
+    fcntl = None
+
+DEFAULT_CONCURRENCY = 16
+DEFAULT_TIMEOUT = 30
+DEFAULT_RETRIES = 3
+META_FILE = '.download_meta.json'
+USER_AGENT = 'Mozilla/5.0 (compatible; sixstar-image-downloader)'
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+# Leading bytes of the image formats we accept
+MAGIC_BYTES = (
+    (b'\xff\xd8\xff', 'image/jpeg'),
+    (b'\x89PNG\r\n\x1a\n', 'image/png'),
+    (b'GIF87a', 'image/gif'),
+    (b'GIF89a', 'image/gif'),
+)
+
+
+class NotAnImage(Exception):
+    """The response body is not an image (error page, HTML redirect...)."""
+
+
+def sniff_image(head: bytes):
+    """MIME type from an image's first bytes, or None if it is not an image."""
+    for magic, mime in MAGIC_BYTES:
+        if head.startswith(magic):
+            return mime
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[4:8] == b'ftyp' and head[8:12] in (b'avif', b'avis'):
+        return 'image/avif'
+    return None
+
+
+@dataclass
+class Download:
+    """One image to fetch and what happened to it."""
+    url: str
+    path: str
+    status: str = 'pending'  # downloaded, unchanged, failed
+    bytes: int = 0
+    content_type: str = ''
+    error: str = ''
+    seconds: float = 0.0
+
+
+def load_meta(folder: str) -> dict:
+    try:
+        with open(os.path.join(folder, META_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_meta(folder: str, updates: dict):
+    """Merge entries into the folder's metadata file.
+
+    The file is re-read under a lock right before it is replaced, and each
+    writer uses its own temp file, so downloads running side by side into
+    one folder keep each other's entries.
+    """
+    if not updates:
+        return
+    path = os.path.join(folder, META_FILE)
+    with open(path + '.lock', 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # released when the file closes
+        meta = load_meta(folder)
+        meta.update(updates)
+        with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=folder, prefix=META_FILE + '.',
+                                         suffix='.tmp', delete=False) as f:
+            json.dump(meta, f, indent=1)
+        os.replace(f.name, path)
+
+
+def conditional_headers(item: Download, meta: dict) -> dict:
+    """If-None-Match / If-Modified-Since for a file we already have from the same URL."""
+    entry = meta.get(os.path.basename(item.path))
+    if not entry or entry.get('url') != item.url or not os.path.exists(item.path):
+        return {}
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+async def fetch(client: httpx.AsyncClient, item: Download, meta: dict, retries: int):
+    """Stream one image to disk; sets item.status."""
+    start = time.perf_counter()
+    part_path = item.path + '.part'
+    for attempt in range(retries + 1):
+        try:
+            async with client.stream('GET', item.url, headers=conditional_headers(item, meta)) as response:
+                if response.status_code == 304:
+                    await response.aread()  # lets the connection go back to the pool
+                    item.status = 'unchanged'
+                    break
+                if response.status_code in RETRYABLE_STATUS and attempt < retries:
+                    raise httpx.HTTPStatusError(f"HTTP {response.status_code}", request=response.request,
+                                                response=response)
+                response.raise_for_status()
+
+                size = 0
+                mime = None
+                with open(part_path, 'wb') as f:
+                    async for chunk in response.aiter_bytes():
+                        if mime is None:
+                            mime = sniff_image(chunk[:16])
+                            if mime is None:
+                                declared = response.headers.get('content-type', '?')
+                                raise NotAnImage(f"not an image (Content-Type {declared})")
+                        f.write(chunk)
+                        size += len(chunk)
+                if mime is None:
+                    raise NotAnImage("empty response")
+                os.replace(part_path, item.path)
+
+                item.status = 'downloaded'
+                item.bytes = size
+                item.content_type = mime
+                meta[os.path.basename(item.path)] = {
+                    'url': item.url,
+                    'etag': response.headers.get('etag'),
+                    'last_modified': response.headers.get('last-modified'),
+                    'bytes': size,
+                    'content_type': mime,
+                }
+                break
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            retryable = isinstance(e, httpx.TransportError) or e.response.status_code in RETRYABLE_STATUS
+            if retryable and attempt < retries:
+                await asyncio.sleep(0.5 * 2 ** attempt + random.random() * 0.5)
+                continue
+            item.status, item.error = 'failed', (str(e) or e.__class__.__name__).splitlines()[0]
+            break
+        except NotAnImage as e:
+            item.status, item.error = 'failed', str(e)
+            break
+        finally:
+            if os.path.exists(part_path):
+                os.remove(part_path)
+    item.seconds = time.perf_counter() - start
+
+
+async def download_all(items: list, concurrency: int = DEFAULT_CONCURRENCY,
+                       timeout: float = DEFAULT_TIMEOUT, retries: int = DEFAULT_RETRIES) -> list:
+    """Download items over one pooled client, at most `concurrency` at a time."""
+    folders = {os.path.dirname(item.path) or '.' for item in items}
+    metas = {}
+    for folder in folders:
+        os.makedirs(folder, exist_ok=True)
+        metas[folder] = load_meta(folder)
+
+    limiter = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=timeout, follow_redirects=True,
+                                 headers={'User-Agent': USER_AGENT}) as client:
+        async def run(item):
+            async with limiter:
+                await fetch(client, item, metas[os.path.dirname(item.path) or '.'], retries)
+
+        await asyncio.gather(*(run(item) for item in items))
+
+    updates = {folder: {} for folder in metas}
+    for item in items:
+        if item.status == 'downloaded':
+            folder = os.path.dirname(item.path) or '.'
+            name = os.path.basename(item.path)
+            updates[folder][name] = metas[folder][name]
+    for folder, entries in updates.items():
+        save_meta(folder, entries)
+    return items
+
+
+def summarize(items: list, elapsed: float) -> str:
+    counts = {}
+    for item in items:
+        counts[item.status] = counts.get(item.status, 0) + 1
+    size = sum(item.bytes for item in items)
+    return (f"{counts.get('downloaded', 0)} downloaded, {counts.get('unchanged', 0)} unchanged, "
+            f"{counts.get('failed', 0)} failed - {size / 1024 / 1024:.1f} MB in {elapsed:.2f}s")
+
+
+# Local stand-in for an image host, used by the benchmark
+
+class _ImageHandler(BaseHTTPRequestHandler):
+    body = b''
+    latency = 0.0
+    etag = '"bench-v1"'
+    last_modified = formatdate(0, usegmt=True)
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        time.sleep(self.latency)
+        if self.headers.get('If-None-Match') == self.etag:
+            self.send_response(304)
+            self.send_header('ETag', self.etag)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'image/jpeg')
+        self.send_header('Content-Length', str(len(self.body)))
+        self.send_header('ETag', self.etag)
+        self.send_header('Last-Modified', self.last_modified)
+        self.end_headers()
+        self.wfile.write(self.body)
+
+
+def cmd_bench(args):
+    _ImageHandler.body = b'\xff\xd8\xff\xe0' + os.urandom(args.size_kb * 1024)
+    _ImageHandler.latency = args.latency_ms / 1000
+    _ImageHandler.protocol_version = 'HTTP/1.1'  # keep-alive, so the pool is used
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _ImageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    folder = tempfile.mkdtemp(prefix='download-bench-')
+
+    try:
+        items = [Download(f"{base}/deal-{i}.jpg", os.path.join(folder, f"deal-{i}.jpg")) for i in range(args.count)]
+        print(f"⏱️  {args.count} images of {args.size_kb} KB, {args.latency_ms} ms latency, from {base}")
+        for label in ('cold', 'warm (conditional GET)'):
+            for item in items:
+                item.status, item.bytes = 'pending', 0
+            start = time.perf_counter()
+            asyncio.run(download_all(items, args.concurrency))
+            print(f"   pooled, {label:<24} {summarize(items, time.perf_counter() - start)}")
+
+        if shutil.which('wget'):
+            sample = items[:min(50, args.count)]
+            start = time.perf_counter()
+            for item in sample:
+                subprocess.run(['wget', '-q', '-O', item.path, item.url], capture_output=True, timeout=30)
+            elapsed = time.perf_counter() - start
+            print(f"   wget per image, {len(sample)} sampled  {elapsed:.2f}s "
+                  f"(≈{elapsed / len(sample) * args.count:.1f}s for {args.count})")
+    finally:
+        server.shutdown()
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def read_url_list(filepath: str, output: str) -> list:
+    """Downloads for a file with "url [filename]" per line ('#' starts a comment line)."""
+    items = []
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith('#'):
+                continue
+            url = parts[0]
+            name = parts[1] if len(parts) > 1 else os.path.basename(httpx.URL(url).path) or f"image-{len(items) + 1}"
+            items.append(Download(url, os.path.join(output, name)))
+    return items
+
+
+def cmd_fetch(args):
+    items = read_url_list(args.urls, args.output)
+
+    start = time.perf_counter()
+    asyncio.run(download_all(items, args.concurrency, args.timeout))
+    for item in items:
+        if item.status == 'failed':
+            print(f"  ✗ {item.url}: {item.error}")
+    print(f"✅ {summarize(items, time.perf_counter() - start)}")
+    sys.exit(1 if any(item.status == 'failed' for item in items) else 0)
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'bench':
+        parser = argparse.ArgumentParser(description='Benchmark against a local HTTP server')
+        parser.add_argument('command')
+        parser.add_argument('count', nargs='?', type=int, default=1000)
+        parser.add_argument('--size-kb', type=int, default=150)
+        parser.add_argument('--latency-ms', type=int, default=50, help='simulated server latency per request')
+        parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+        cmd_bench(parser.parse_args())
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('urls', help='file with "url [filename]" per line')
+    parser.add_argument('--output', default='.', help='folder to save images in')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    cmd_fetch(parser.parse_args())
+
+
+if __name__ == '__main__':
+    main()
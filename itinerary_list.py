@@ -0,0 +1,571 @@
+#!/usr/bin/env python3
+"""
+Windowed itinerary list for list.html
+
+list.html is a single-voyage page. Its itinerary renders every day three
+times in the list view: a detail panel in the left column (all but one
+display:none), a row in the right column and a "More Info" modal. The
+detail panels and modals carry slick carousels that were already
+initialised when the page was saved, cloned slides included. Every copy is
+in the DOM from the first paint, so DOM size grows with the voyage length,
+three copies per day.
+
+This replaces all three with the day records as JSON
+(<script id="itinerary-days">) and ITINERARY_JS. The script mounts:
+
+    one detail panel, re-filled when a row is clicked (showLeftBox)
+    the rows in view plus ITINERARY_OVERSCAN, recycled as the list scrolls
+    one modal, filled when it opens and emptied when it closes
+
+Only the selected day's carousel has slides in the DOM. They are built
+from the JSON and slicked when shown, so no cloned slides are saved into
+the page. The first INITIAL_ROWS rows and the first day's panel are
+rendered into the HTML, so the page paints the same before the script runs.
+The timeline tab is left alone; the site's app.js drives it.
+
+Re-running is safe: the generated block and script are replaced, and the
+days are read back from the JSON. The report compares elements, <img>
+tags, carousel slides and bytes before and after. --days N extrapolates
+both to an N-day voyage. Heap size needs a browser (the DevTools Memory
+panel); nothing here measures it.
+
+Usage:
+    python3 itinerary_list.py                      # list.html beside deals.html, in place
+    python3 itinerary_list.py list.html --dry-run
+    python3 itinerary_list.py list.html --dry-run --days 120
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from html import escape, unescape
+
+from deal_cards import DEALS_FILE, TOKEN_RE, VOID_TAGS, parse_attrs
+from deal_facets import function_end
+
+LIST_FILE = os.path.join(os.path.dirname(DEALS_FILE), 'list.html')
+INITIAL_ROWS = 12
+MODAL_ID = 'itineraryDayModal'
+
+LIST_START = '<!-- ITINERARY LIST START -->'
+LIST_END = '<!-- ITINERARY LIST END -->'
+ITINERARY_JS_START = '// ITINERARY LIST START'
+ITINERARY_JS_END = '// ITINERARY LIST END'
+LEGACY_FUNCTION = 'function showLeftBox(id)'
+LEGACY_START = '<div class="col-7 leftinfo'
+LEGACY_MODAL_RE = re.compile(r'\s*<div class="modal fade" id="mobileModal-\d+"')
+SCROLLBOX_STYLE_RE = re.compile(r'<div class="scrollbox"(?: style="([^"]*)")?>')
+DAYS_JSON_RE = re.compile(r'<script type="application/json" id="itinerary-days">(.*?)</script>', re.DOTALL)
+COMMENT_RE = re.compile(r'<!--.*?-->', re.DOTALL)
+SCRIPT_STYLE_RE = re.compile(r'<(script|style)\b[^>]*>.*?</\1\s*>|<!--.*?-->', re.DOTALL | re.IGNORECASE)
+START_TAG_RE = re.compile(r'<[a-zA-Z]')
+IMG_TAG_RE = re.compile(r'<img\b', re.IGNORECASE)
+# Saved slick slides, and the unslicked slides render_images() writes
+SLIDE_RE = re.compile(r'\bdata-slick-index=|<img style="height: 500px"')
+
+READ_MORE_STYLE = 'color: inherit; text-decoration: underline; cursor: pointer;'
+
+ITINERARY_JS = ITINERARY_JS_START + r'''
+        // Windowed itinerary list (itinerary_list.py): the days live in the
+        // #itinerary-days JSON and only the rows in view, one detail panel
+        // and the open modal are mounted
+        const ITINERARY_OVERSCAN = 3;
+        const ITINERARY_ROW_ESTIMATE = 120;
+        const BREAKDOWN_SLICK = {
+            slidesToShow: 1,
+            slidesToScroll: 1,
+            autoplay: false,
+            dots: false,
+            infinite: true,
+            arrows: true,
+            prevArrow: '<a class="carousel-control-prev bg-transparent w-aut" role="button">' +
+                '<span class="carousel-control-prev-icon" aria-hidden="true"></span></a>',
+            nextArrow: '<a class="carousel-control-next bg-transparent w-aut" role="button">' +
+                '<span class="carousel-control-next-icon" aria-hidden="true"></span></a>',
+        };
+        let itineraryDays = [];
+        let itineraryActive = 0;
+        let itineraryList = null;      // row container inside the scrollbox
+        let itineraryScroller = null;
+        let itineraryTemplate = null;  // blank row cloned when the pool is empty
+        let itineraryMounted = new Map();  // day index -> row node
+        let itineraryPool = [];        // rows scrolled out, kept for reuse
+        let itineraryHeights = [];     // measured row heights, 0 until seen
+        let itineraryFrame = 0;
+
+        function escapeItinerary(text) {
+            return String(text).replace(/[&<>"]/g, c => ({ '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' })[c]);
+        }
+
+        function itineraryImages(day) {
+            if (day.images.length > 1) {
+                return '<div class="breakdown-carousel">' + day.images.map(src =>
+                    '<img style="height: 500px" src="' + escapeItinerary(src) + '" alt="" loading="lazy">').join('') +
+                    '</div>';
+            }
+            return day.images.map(src =>
+                '<img style="max-height: 500px" src="' + escapeItinerary(src) + '" alt="" loading="lazy">').join('');
+        }
+
+        function itineraryDetail(day) {
+            let text = '<span class="short-text">' + escapeItinerary(day.short) + '</span>';
+            if (day.full) {
+                text += '<span class="full-text" style="display: none;">' + escapeItinerary(day.full) + '</span>' +
+                    '<a class="itinerary-read-more" style="__READ_MORE_STYLE__">Read More</a>';
+            }
+            return '<div class="imgbox">' + itineraryImages(day) + '</div>' +
+                '<div class="img-caption"><h3>' + escapeItinerary(day.title) + '</h3><p>' + text + '</p>' +
+                '<div class="btnarea">' + day.buttons + '</div></div>';
+        }
+
+        function slickBreakdown(container) {
+            if (!window.jQuery || !jQuery.fn.slick) return;
+            jQuery(container).find('.breakdown-carousel').each(function () {
+                if (jQuery(this).hasClass('slick-initialized')) jQuery(this).slick('unslick');
+                if (jQuery(this).is(':visible')) jQuery(this).slick(BREAKDOWN_SLICK);
+            });
+        }
+
+        function unslickBreakdown(container) {
+            if (!window.jQuery || !jQuery.fn.slick) return;
+            jQuery(container).find('.breakdown-carousel.slick-initialized').slick('unslick');
+        }
+
+        // Kept under its old name: the detail panel is re-filled, not swapped
+        function showLeftBox(id) {
+            if (!itineraryDays[id]) return;
+            itineraryActive = id;
+            const detail = document.getElementById('itinerary-detail');
+            if (detail) {
+                unslickBreakdown(detail);
+                detail.innerHTML = itineraryDetail(itineraryDays[id]);
+                slickBreakdown(detail);
+            }
+            itineraryMounted.forEach((row, i) => row.classList.toggle('active', i === id));
+        }
+
+        function fillItineraryRow(row, i) {
+            const day = itineraryDays[i];
+            row.dataset.day = i;
+            row.querySelector('.day').textContent = day.day;
+            row.querySelector('.date span').textContent = day.date;
+            row.querySelector('h4').textContent = day.title;
+            row.querySelector('.view-more-btn').dataset.day = i;
+            row.classList.toggle('active', i === itineraryActive);
+        }
+
+        function scheduleItineraryRows() {
+            if (!itineraryFrame) itineraryFrame = requestAnimationFrame(renderItineraryRows);
+        }
+
+        // First index whose offset is above y
+        function itineraryIndexAt(offsets, y) {
+            let lo = 0;
+            let hi = offsets.length - 1;
+            while (lo < hi) {
+                const mid = (lo + hi) >> 1;
+                if (offsets[mid + 1] <= y) lo = mid + 1;
+                else hi = mid;
+            }
+            return lo;
+        }
+
+        function renderItineraryRows() {
+            itineraryFrame = 0;
+            const count = itineraryDays.length;
+            let measured = 0;
+            let total = 0;
+            itineraryHeights.forEach(height => {
+                if (height) {
+                    measured++;
+                    total += height;
+                }
+            });
+            const estimate = measured ? total / measured : ITINERARY_ROW_ESTIMATE;
+            const offsets = new Float64Array(count + 1);
+            for (let i = 0; i < count; i++) offsets[i + 1] = offsets[i] + (itineraryHeights[i] || estimate);
+
+            // The part of the list inside both the scrollbox and the viewport
+            const rect = itineraryList.getBoundingClientRect();
+            const box = itineraryScroller.getBoundingClientRect();
+            const top = Math.max(box.top, 0) - rect.top;
+            const bottom = Math.min(box.bottom, window.innerHeight) - rect.top;
+            const start = Math.max(0, itineraryIndexAt(offsets, top) - ITINERARY_OVERSCAN);
+            const end = Math.min(count, itineraryIndexAt(offsets, bottom) + 1 + ITINERARY_OVERSCAN);
+
+            itineraryMounted.forEach((row, i) => {
+                if (i < start || i >= end) {
+                    itineraryMounted.delete(i);
+                    itineraryPool.push(row);
+                }
+            });
+            let previous = null;
+            for (let i = start; i < end; i++) {
+                let row = itineraryMounted.get(i);
+                if (!row) {
+                    row = itineraryPool.pop() || itineraryTemplate.cloneNode(true);
+                    fillItineraryRow(row, i);
+                    itineraryMounted.set(i, row);
+                }
+                const next = previous ? previous.nextSibling : itineraryList.firstChild;
+                if (row !== next) itineraryList.insertBefore(row, next);
+                previous = row;
+            }
+            itineraryPool.forEach(row => {
+                if (row.parentNode) row.remove();
+            });
+            itineraryList.style.paddingTop = offsets[start] + 'px';
+            itineraryList.style.paddingBottom = (offsets[count] - offsets[end]) + 'px';
+
+            // Heights from the distance between neighbouring rows, so
+            // collapsed margins are counted; re-render if any changed
+            let changed = false;
+            for (let i = start; i < end - 1; i++) {
+                const height = itineraryMounted.get(i + 1).offsetTop - itineraryMounted.get(i).offsetTop;
+                if (height > 0 && height !== itineraryHeights[i]) {
+                    itineraryHeights[i] = height;
+                    changed = true;
+                }
+            }
+            if (changed) scheduleItineraryRows();
+        }
+
+        function toggleItineraryText(toggle) {
+            const text = toggle.parentElement;
+            const full = text.querySelector('.full-text');
+            const short = text.querySelector('.short-text');
+            const expand = full.style.display === 'none';
+            full.style.display = expand ? 'inline' : 'none';
+            short.style.display = expand ? 'none' : '';
+            toggle.textContent = expand ? 'Read Less' : 'Read More';
+        }
+
+        function initItineraryList() {
+            const source = document.getElementById('itinerary-days');
+            itineraryList = document.getElementById('itinerary-rows');
+            if (!source || !itineraryList) return;
+            itineraryDays = JSON.parse(source.textContent);
+            const rows = Array.from(itineraryList.querySelectorAll('.right-box[data-day]'));
+            if (!rows.length) return;
+            itineraryTemplate = rows[0].cloneNode(true);
+            itineraryList.replaceChildren(...rows);
+            rows.forEach(row => itineraryMounted.set(Number(row.dataset.day), row));
+            itineraryScroller = itineraryList.closest('.scrollbox') || itineraryList;
+
+            const container = itineraryList.closest('.itinerary-list') || document;
+            container.addEventListener('click', function(e) {
+                const toggle = e.target.closest('.itinerary-read-more');
+                if (toggle) {
+                    toggleItineraryText(toggle);
+                    return;
+                }
+                const row = e.target.closest('.right-box[data-day]');
+                if (row) showLeftBox(Number(row.dataset.day));
+            });
+            itineraryScroller.addEventListener('scroll', scheduleItineraryRows, { passive: true });
+            window.addEventListener('scroll', scheduleItineraryRows, { passive: true });
+            window.addEventListener('resize', scheduleItineraryRows);
+
+            const modal = document.getElementById('__MODAL_ID__');
+            if (modal) {
+                const title = modal.querySelector('.modal-title');
+                const body = modal.querySelector('.modal-body');
+                modal.addEventListener('show.bs.modal', function(e) {
+                    const trigger = e.relatedTarget;
+                    const day = itineraryDays[trigger && trigger.dataset.day ? Number(trigger.dataset.day) : itineraryActive];
+                    title.textContent = day.title;
+                    body.innerHTML = itineraryDetail(day);
+                });
+                modal.addEventListener('shown.bs.modal', () => slickBreakdown(body));
+                modal.addEventListener('hidden.bs.modal', function() {
+                    unslickBreakdown(body);
+                    body.innerHTML = '';
+                });
+            }
+            scheduleItineraryRows();
+        }
+
+        if (document.readyState === 'loading') {
+            document.addEventListener('DOMContentLoaded', initItineraryList);
+        } else {
+            initItineraryList();
+        }
+        ''' + ITINERARY_JS_END
+ITINERARY_JS = ITINERARY_JS.replace('__READ_MORE_STYLE__', READ_MORE_STYLE).replace('__MODAL_ID__', MODAL_ID)
+
+
+def text_of(parts: list) -> str:
+    return ' '.join(unescape(' '.join(parts)).split())
+
+
+def element_end(content: str, start: int) -> int:
+    """End offset of the element whose start tag is at start."""
+    depth = 0
+    for match in TOKEN_RE.finditer(content, start):
+        closing, tag, attr_text, _ = match.groups()
+        if tag is None or tag.lower() in VOID_TAGS or attr_text.rstrip().endswith('/'):
+            continue
+        depth += -1 if closing else 1
+        if depth == 0:
+            return match.end()
+    raise ValueError(f"Unclosed element at offset {start}")
+
+
+def parse_box(content: str, start: int, end: int) -> dict:
+    """Texts, images and button markup of a legacy left-box or right-box."""
+    box = {'images': [], 'title': [], 'day': [], 'date': [], 'short': [], 'full': [], 'buttons': ''}
+    stack = []  # (tag, field) of open elements
+    skip_until = start
+    for match in TOKEN_RE.finditer(content, start, end):
+        if match.start() < skip_until:
+            continue
+        closing, tag, attr_text, text = match.groups()
+        if text is not None:
+            field = next((f for _, f in reversed(stack) if f), None)
+            if field:
+                box[field].append(text)
+            continue
+        if tag is None:
+            continue
+        tag = tag.lower()
+        if closing:
+            while stack and stack.pop()[0] != tag:
+                pass
+            continue
+        attrs = parse_attrs(attr_text)
+        classes = (attrs.get('class') or '').split()
+        if tag == 'img':
+            # Slick's clones repeat the real slides
+            if 'slick-cloned' not in classes and attrs.get('src') and attrs['src'] not in box['images']:
+                box['images'].append(attrs['src'])
+            continue
+        if tag in VOID_TAGS:
+            continue
+        if 'btnarea' in classes:
+            skip_until = element_end(content, match.start())
+            inner = content[match.end():skip_until]
+            box['buttons'] = inner[:inner.rfind('</')].strip()
+            continue
+        field = 'title' if tag in ('h3', 'h4') else None
+        for name in ('day', 'date', 'short', 'full'):
+            if name in classes or f'{name}-text' in classes:
+                field = name
+        stack.append((tag, field))
+    return box
+
+
+def legacy_span(content: str) -> tuple:
+    """(start, end) of the left column, right column and day modals."""
+    start = content.find(LEGACY_START)
+    if start == -1:
+        raise ValueError("No itinerary list found (no col-7 leftinfo column)")
+    left_end = element_end(content, start)
+    right_start = content.find('<div class="col-5 rightcol', left_end)
+    if right_start == -1 or COMMENT_RE.sub('', content[left_end:right_start]).strip():
+        raise ValueError("Itinerary right column does not follow the left column")
+    end = element_end(content, right_start)
+    while True:
+        modal = LEGACY_MODAL_RE.match(content, end)
+        if not modal:
+            break
+        end = element_end(content, content.index('<div', modal.start()))
+    return start, end
+
+
+def legacy_days(content: str, start: int, end: int) -> list:
+    """Day records from the legacy left-box/right-box pairs."""
+    days = []
+    index = 0
+    while True:
+        left = content.find(f'id="left-box-{index}"', start, end)
+        right = content.find(f'id="right-box-{index}"', start, end)
+        if left == -1 or right == -1:
+            break
+        left = content.rfind('<div', start, left)
+        right = content.rfind('<div', start, right)
+        detail = parse_box(content, left, element_end(content, left))
+        row = parse_box(content, right, element_end(content, right))
+        days.append({
+            'day': text_of(row['day']),
+            'date': text_of(row['date']),
+            'title': text_of(row['title']) or text_of(detail['title']),
+            'images': detail['images'],
+            'short': text_of(detail['short']),
+            'full': text_of(detail['full']),
+            'buttons': detail['buttons'],
+        })
+        index += 1
+    if not days:
+        raise ValueError("Itinerary list has no left-box/right-box days")
+    return days
+
+
+def render_images(day: dict) -> str:
+    if len(day['images']) > 1:
+        slides = ''.join(f'<img style="height: 500px" src="{escape(src)}" alt="" loading="lazy">'
+                         for src in day['images'])
+        return f'<div class="breakdown-carousel">{slides}</div>'
+    return ''.join(f'<img style="max-height: 500px" src="{escape(src)}" alt="" loading="lazy">'
+                   for src in day['images'])
+
+
+def render_detail(day: dict) -> str:
+    """Same markup as itineraryDetail() in ITINERARY_JS."""
+    text = f'<span class="short-text">{escape(day["short"], quote=False)}</span>'
+    if day['full']:
+        text += (f'<span class="full-text" style="display: none;">{escape(day["full"], quote=False)}</span>'
+                 f'<a class="itinerary-read-more" style="{READ_MORE_STYLE}">Read More</a>')
+    return (f'<div class="imgbox">{render_images(day)}</div>'
+            f'<div class="img-caption"><h3>{escape(day["title"], quote=False)}</h3><p>{text}</p>'
+            f'<div class="btnarea">{day["buttons"]}</div></div>')
+
+
+def render_row(index: int, day: dict, active: bool) -> str:
+    """A right-column row; ITINERARY_JS clones and re-fills these."""
+    return f'''
+                            <div class="boxinner right-box{' active' if active else ''}" data-day="{index}">
+                                <div class="row align-items-center">
+                                    <div class="col day">{escape(day['day'], quote=False)}</div>
+                                    <div class="col date"><span style="width: max-content">{escape(day['date'], quote=False)}</span></div>
+                                </div>
+                                <h4>{escape(day['title'], quote=False)}</h4>
+                                <div class="view-more-btn text-decoration-underline" data-bs-toggle="modal"
+                                    data-bs-target="#{MODAL_ID}" data-day="{index}">More Info</div>
+                            </div>'''
+
+
+def render_list(days: list, scrollbox_style: str) -> str:
+    rows = ''.join(render_row(i, day, i == 0) for i, day in enumerate(days[:INITIAL_ROWS]))
+    data = json.dumps(days, separators=(',', ':'), ensure_ascii=False).replace('</', '<\\/')
+    style = f' style="{scrollbox_style}"' if scrollbox_style else ''
+    return f'''{LIST_START}
+                    <div class="col-7 leftinfo d-none d-md-block">
+                        <div class="boxinner left-box" id="itinerary-detail">{render_detail(days[0])}</div>
+                    </div>
+                    <div class="col-5 rightcol right-col-itin">
+                        <div class="scrollbox"{style}>
+                        <div id="itinerary-rows">{rows}
+                        </div>
+                        </div>
+                    </div>
+                    <div class="modal fade" id="{MODAL_ID}" tabindex="-1" aria-labelledby="{MODAL_ID}Label"
+                        aria-hidden="true">
+                        <div class="modal-dialog modal-dialog-centered">
+                            <div class="modal-content">
+                                <div class="modal-header">
+                                    <h5 class="modal-title" id="{MODAL_ID}Label"></h5>
+                                    <button type="button" class="btn-close" data-bs-dismiss="modal"
+                                        aria-label="Close"></button>
+                                </div>
+                                <div class="modal-body"></div>
+                            </div>
+                        </div>
+                    </div>
+                    <script type="application/json" id="itinerary-days">{data}</script>
+                    {LIST_END}'''
+
+
+def replace_script(content: str) -> str:
+    """Swap the page's showLeftBox() for ITINERARY_JS."""
+    start = content.find(ITINERARY_JS_START)
+    if start != -1:
+        end = content.find(ITINERARY_JS_END, start)
+        if end == -1:
+            raise ValueError(f"{ITINERARY_JS_START} found without {ITINERARY_JS_END}")
+        end += len(ITINERARY_JS_END)
+    else:
+        start = content.find(LEGACY_FUNCTION)
+        if start == -1:
+            raise ValueError("No showLeftBox() script found to replace")
+        end = function_end(content, content.index('{', start))
+    return content[:start] + ITINERARY_JS + content[end:]
+
+
+def virtualize(content: str) -> tuple:
+    """Returns (new content, day records)."""
+    start = content.find(LIST_START)
+    if start != -1:
+        end = content.find(LIST_END, start)
+        if end == -1:
+            raise ValueError(f"{LIST_START} found without {LIST_END}")
+        end += len(LIST_END)
+        days = json.loads(DAYS_JSON_RE.search(content, start, end).group(1).replace('<\\/', '</'))
+    else:
+        start, end = legacy_span(content)
+        days = legacy_days(content, start, end)
+    scrollbox = SCROLLBOX_STYLE_RE.search(content, start, end)
+    style = scrollbox.group(1) if scrollbox and scrollbox.group(1) else ''
+    content = content[:start] + render_list(days, style) + content[end:]
+    return replace_script(content), days
+
+
+def dom_counts(html: str) -> dict:
+    """Elements, <img> tags, carousel slides and bytes of markup; scripts and styles not counted."""
+    markup = SCRIPT_STYLE_RE.sub('', html)
+    return {
+        'elements': len(START_TAG_RE.findall(markup)),
+        'images': len(IMG_TAG_RE.findall(markup)),
+        'slides': len(SLIDE_RE.findall(markup)),
+        'bytes': len(html.encode('utf-8')),
+    }
+
+
+def list_region(content: str) -> str:
+    start = content.find(LIST_START)
+    if start != -1:
+        return content[start:content.find(LIST_END, start) + len(LIST_END)]
+    start, end = legacy_span(content)
+    return content[start:end]
+
+
+def print_report(before: str, after: str, days: list, scale: int = None):
+    old, new = dom_counts(list_region(before)), dom_counts(list_region(after))
+    old_page, new_page = dom_counts(before), dom_counts(after)
+    print(f"  {'':<24}{'elements':>10}{'<img>':>8}{'slides':>8}{'KB':>9}")
+    for label, counts in (('itinerary before', old), ('itinerary after', new),
+                          ('page before', old_page), ('page after', new_page)):
+        print(f"  {label:<24}{counts['elements']:>10,}{counts['images']:>8}{counts['slides']:>8}"
+              f"{counts['bytes'] / 1024:>9.1f}")
+    if scale:
+        # Old markup grows by its per-day average; the new page is rendered
+        # with the days repeated, and still mounts INITIAL_ROWS rows
+        per_day = {key: old[key] / len(days) for key in old}
+        mounted = dom_counts(render_list((days * (scale // len(days) + 1))[:scale], ''))
+        print(f"  {f'{scale} days, before':<24}{per_day['elements'] * scale:>10,.0f}"
+              f"{per_day['images'] * scale:>8.0f}{per_day['slides'] * scale:>8.0f}"
+              f"{per_day['bytes'] * scale / 1024:>9.1f}")
+        print(f"  {f'{scale} days, after':<24}{mounted['elements']:>10,}{mounted['images']:>8}"
+              f"{mounted['slides']:>8}{mounted['bytes'] / 1024:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('html', nargs='?', default=LIST_FILE)
+    parser.add_argument('--dry-run', action='store_true', help='report only, do not write')
+    parser.add_argument('--days', type=int, help='also extrapolate the report to a voyage of this many days')
+    args = parser.parse_args()
+
+    try:
+        with open(args.html, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content, days = virtualize(content)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"🧭 {len(days)} itinerary days in {args.html}")
+    print_report(content, new_content, days, args.days)
+    if new_content == content:
+        print("✅ Already up to date")
+    elif args.dry_run:
+        print("(dry run - nothing written)")
+    else:
+        with open(args.html, 'w', encoding='utf-8') as f:
+            f.write(new_content)
+        print(f"✅ Itinerary list virtualized in {args.html}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Loading hints for page images: fetchpriority for the fold, lazy for the rest
+
+Marks the first deal card's image fetchpriority="high" and every other card
+image, logo, mega-menu thumbnail and footer badge loading="lazy"
+decoding="async". Cards past the first pagination page (dealsPerPage in
+the page's own script) sit in display:none until showPage reveals them, and
+lazy images there are not fetched at all until then. On pages without deal
+cards the first few content images are left eager.
+
+Re-running is safe: hints written by an earlier run are replaced. The
+report shows how many bytes of local images each pagination page defers.
+
+Usage:
+    python3 lazy_images.py deals.html index.html itinerary.html [--dry-run]
+"""
+
+import argparse
+import os
+import re
+
+from deal_cards import DEALS_FILE, extract_cards
+
+DEFAULT_PAGE_SIZE = 10
+ABOVE_FOLD_CARDS = 1  # cards visible without scrolling under the hero
+EAGER_IMAGES = 2  # leading content images kept eager on pages without cards
+LAZY_CLASSES = {'mega-menu-image'}  # hidden until a menu opens
+
+IMG_RE = re.compile(r'<img\b[^>]*>', re.DOTALL)
+HINT_ATTR_RE = re.compile(r'\s+(?:loading|decoding|fetchpriority)\s*=\s*(?:"[^"]*"|\'[^\']*\'|[^\s>]+)')
+PAGE_SIZE_RE = re.compile(r'\bdealsPerPage\s*=\s*(\d+)')
+CLASS_RE = re.compile(r'\sclass\s*=\s*["\']([^"\']*)["\']')
+SRC_RE = re.compile(r'\ssrc\s*=\s*["\']([^"\']+)["\']')
+
+
+def page_size_of(content: str) -> int:
+    """Cards per pagination page, as configured in the page's script."""
+    match = PAGE_SIZE_RE.search(content)
+    return int(match.group(1)) if match else DEFAULT_PAGE_SIZE
+
+
+def with_hints(img_tag: str, hints: dict) -> str:
+    """img_tag with any old loading hints replaced by hints."""
+    img_tag = HINT_ATTR_RE.sub('', img_tag)
+    attrs = ''.join(f' {name}="{value}"' for name, value in hints.items())
+    return re.sub(r'\s*(/?)>$', lambda m: f"{attrs}{' /' if m.group(1) else ''}>", img_tag)
+
+
+def image_bytes(img_tag: str, page_dir: str) -> int:
+    """Size of a local image on disk; 0 for remote or missing files."""
+    src = SRC_RE.search(img_tag)
+    if not src or re.match(r'^(?:[a-z]+:|//)', src.group(1)):
+        return 0
+    try:
+        return os.path.getsize(os.path.join(page_dir, src.group(1).split('?')[0]))
+    except OSError:
+        return 0
+
+
+def classify(content: str) -> list:
+    """(match, group, hints) for every <img>; group names where it is deferred to."""
+    cards = extract_cards(content)
+    page_size = page_size_of(content)
+    images = []
+    card_index = 0
+    content_images = 0
+    high_set = False
+
+    for match in IMG_RE.finditer(content):
+        while card_index < len(cards) and cards[card_index].end <= match.start():
+            card_index += 1
+        in_card = card_index < len(cards) and cards[card_index].start <= match.start()
+        class_attr = CLASS_RE.search(match.group(0))
+        classes = set(class_attr.group(1).split()) if class_attr else set()
+
+        if classes & LAZY_CLASSES:
+            images.append((match, 'menus', {'loading': 'lazy', 'decoding': 'async'}))
+        elif in_card:
+            page = card_index // page_size + 1
+            if card_index < ABOVE_FOLD_CARDS and not high_set:
+                images.append((match, 'eager', {'fetchpriority': 'high'}))
+                high_set = True  # the card photo; its logo can wait
+            else:
+                group = 'page 1 (below fold)' if page == 1 else f"page {page}"
+                images.append((match, group, {'loading': 'lazy', 'decoding': 'async'}))
+        elif (match.start() < cards[0].start) if cards else (content_images < EAGER_IMAGES):
+            images.append((match, 'eager', {}))  # header logo and first content images
+            content_images += 1
+        else:
+            images.append((match, 'footer' if cards else 'below fold', {'loading': 'lazy', 'decoding': 'async'}))
+    return images
+
+
+def add_loading_hints(content: str, page_dir: str = '.') -> tuple:
+    """Returns (content, {group: [images, bytes]})."""
+    pieces = []
+    last = 0
+    report = {}
+    for match, group, hints in classify(content):
+        img_tag = match.group(0)
+        stats = report.setdefault(group, [0, 0])
+        stats[0] += 1
+        stats[1] += image_bytes(img_tag, page_dir)
+        new_tag = with_hints(img_tag, hints)
+        if new_tag != img_tag:
+            pieces.append(content[last:match.start()])
+            pieces.append(new_tag)
+            last = match.end()
+    pieces.append(content[last:])
+    return ''.join(pieces), report
+
+
+def print_report(path: str, report: dict):
+    eager = report.get('eager', [0, 0])
+    deferred = sum(size for group, (_, size) in report.items() if group != 'eager')
+    print(f"\n📄 {path}: {eager[0]} images eager ({eager[1] / 1024:.0f} KB), "
+          f"{sum(n for g, (n, _) in report.items() if g != 'eager')} deferred ({deferred / 1024:.0f} KB)")
+    for group, (count, size) in sorted(report.items(), key=lambda item: (item[0] != 'eager', item[0])):
+        print(f"   {group:<22} {count:>4} images {size / 1024:>9.0f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pages', nargs='*', default=[DEALS_FILE])
+    parser.add_argument('--dry-run', action='store_true', help='report only, do not write')
+    args = parser.parse_args()
+
+    for path in args.pages:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content, report = add_loading_hints(content, os.path.dirname(os.path.abspath(path)))
+        print_report(path, report)
+        if new_content != content and not args.dry_run:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Drop page CSS rules that match nothing on the page
+
+Each redesign appended its stylesheet and left the previous one in place, so
+the <style> blocks still carry luxury-*, deal-card, glass overlay and old
+expand-on-hover rules for markup that no longer exists. This removes, per
+page, every selector that matches no element of that page, and every rule
+left without selectors. @keyframes and @font-face are kept only while
+something on the page still names them.
+
+Matching is generous in the same way as critical_css.py: pseudo-classes are
+ignored, classes the inline scripts add (classList.add('show'), innerHTML
+templates) count as present, and classes from libraries that build their
+own markup (SAFELIST) are never required. Generated blocks (atomic and
+hover classes) are left alone; a page already split by critical_css.py is
+joined, pruned and split again.
+
+Usage:
+    python3 prune_css.py                                  # the four site pages
+    python3 prune_css.py deals.html index.html [--dry-run] [--safelist 'tooltip-']
+"""
+
+import argparse
+import os
+import re
+import sys
+import time
+
+from critical_css import (CRITICAL_BLOCK_RE, PLAIN_STYLE_RE, ElementIndex, join, parse_css, parse_page,
+                          script_classes, serialize, split, split_selector_list, write_assets)
+from deal_cards import DEALS_FILE
+
+SITE_PAGES = ['deals.html', 'index.html', 'list.html', 'itinerary.html']
+# Class prefixes of libraries that create their own elements at runtime
+SAFELIST = ['swiper-', 'slick-', 'select2-', 'daterangepicker', 'noUi-', 'leaflet-', 'flatpickr-', 'curator-',
+            'fa-', 'modal-backdrop', 'fade', 'show', 'collapsing']
+CLASS_NAME_RE = re.compile(r'\.((?:\\.|[-\w])+)')
+
+
+def optional_classes(content: str, css: str, safelist: list) -> set:
+    """Classes a selector may name without them being in the markup."""
+    classes = script_classes(content)
+    for name in CLASS_NAME_RE.findall(css):
+        name = name.replace('\\', '')
+        if any(name.startswith(prefix) for prefix in safelist):
+            classes.add(name)
+    return classes
+
+
+def referenced(name: str, text: str) -> bool:
+    return re.search(r'(?<![-\w])' + re.escape(name) + r'(?![-\w])', text, re.IGNORECASE) is not None
+
+
+def prune_rules(rules: list, index: ElementIndex, page_text: str) -> tuple:
+    """(kept rules, selectors dropped)."""
+    kept = []
+    dropped_selectors = 0
+    for rule in rules:
+        if rule.body is None or rule.prelude.startswith('@'):
+            kept.append(rule)
+            continue
+        selectors = split_selector_list(rule.prelude)
+        used = [selector for selector in selectors if index.any_match(selector)]
+        dropped_selectors += len(selectors) - len(used)
+        if used:
+            if len(used) < len(selectors):
+                rule.prelude = ', '.join(used)
+            kept.append(rule)
+
+    # At-rules stay while the kept CSS, the markup or a script names them
+    text = ' '.join(rule.body for rule in kept if rule.body and not rule.prelude.startswith('@')) + page_text
+    result = []
+    for rule in kept:
+        prelude = rule.prelude.lower()
+        if prelude.startswith(('@keyframes', '@-webkit-keyframes')):
+            if not referenced(rule.prelude.split(None, 1)[-1].strip(), text):
+                continue
+        elif prelude.startswith('@font-face'):
+            family = re.search(r'font-family\s*:\s*([\'"]?)([^;\'"]+)\1', rule.body or '', re.IGNORECASE)
+            if family and not referenced(family.group(2).strip(), text):
+                continue
+        result.append(rule)
+    return result, dropped_selectors
+
+
+def prune(content: str, safelist: list = SAFELIST) -> tuple:
+    """Returns (content, stats dict) for a page whose CSS is in plain <style> blocks."""
+    blocks = list(PLAIN_STYLE_RE.finditer(content))
+    stats = {'before': 0, 'after': 0, 'rules': 0, 'rules_dropped': 0, 'selectors_dropped': 0}
+    if not blocks:
+        return content, stats
+
+    css = '\n'.join(block.group(1) for block in blocks)
+    index = ElementIndex(parse_page(content, 0, set()), optional_classes(content, css, safelist))
+    # Everything outside the page's own CSS, for @keyframes / @font-face names
+    page_text = PLAIN_STYLE_RE.sub(' ', content)
+
+    pieces = []
+    last = 0
+    for block in blocks:
+        rules = parse_css(block.group(1))
+        kept, dropped_selectors = prune_rules(rules, index, page_text)
+        stats['rules'] += len(rules)
+        stats['rules_dropped'] += len(rules) - len(kept)
+        stats['selectors_dropped'] += dropped_selectors
+        new_css = serialize(kept)
+        stats['before'] += len(block.group(1).encode())
+        stats['after'] += len(new_css.encode())
+        start, end = block.span(1)
+        pieces.append(content[last:start])
+        pieces.append(f"\n{new_css}\n    " if new_css else '')
+        last = end
+    pieces.append(content[last:])
+    return ''.join(pieces), stats
+
+
+def prune_page(content: str, path: str, safelist: list = SAFELIST) -> tuple:
+    """prune() for any page, joining and re-splitting critical CSS; returns (content, assets, stats)."""
+    if not CRITICAL_BLOCK_RE.search(content):
+        content, stats = prune(content, safelist)
+        return content, {}, stats
+    content = join(content, os.path.dirname(os.path.abspath(path)))
+    content, stats = prune(content, safelist)
+    content, assets, _ = split(content, path)
+    return content, assets, stats
+
+
+def main():
+    site_dir = os.path.dirname(DEALS_FILE)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pages', nargs='*', default=[os.path.join(site_dir, page) for page in SITE_PAGES])
+    parser.add_argument('--safelist', action='append', default=[], help='extra class prefix to always keep')
+    parser.add_argument('--dry-run', action='store_true', help='report only, do not write')
+    args = parser.parse_args()
+
+    total_before = total_after = 0
+    for path in args.pages:
+        if not os.path.exists(path):
+            print(f"⏭️  {path}: not found")
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        start = time.perf_counter()
+        try:
+            new_content, assets, stats = prune_page(content, path, SAFELIST + args.safelist)
+        except ValueError as e:
+            print(f"❌ {path}: {e}")
+            sys.exit(1)
+        elapsed = time.perf_counter() - start
+        total_before += stats['before']
+        total_after += stats['after']
+        print(f"📄 {os.path.basename(path):<16} {stats['before'] / 1024:>6.1f} KB -> {stats['after'] / 1024:>6.1f} KB  "
+              f"{stats['rules_dropped']}/{stats['rules']} rules, {stats['selectors_dropped']} selectors dropped "
+              f"({elapsed * 1000:.0f}ms)")
+        if new_content != content and not args.dry_run:
+            write_assets(os.path.dirname(os.path.abspath(path)), assets)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+
+    if total_before:
+        print(f"✅ {(total_before - total_after) / 1024:.1f} KB of CSS removed "
+              f"({(1 - total_after / total_before) * 100:.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
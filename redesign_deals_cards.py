@@ -6,6 +6,10 @@ Redesign all 30 deal cards in deals.html to match the luxury card style from ind
 import re
 import sys
 
+# Info layouts that replace the Innovative Info Grid; a card carrying one
+# has already been redesigned and is left alone
+REDESIGNED_MARKERS = ('<!-- Vertical Info Layout', '<!-- Rich Info Box')
+
 def extract_card_info(card_html):
     """Extract departure date, ship name, and region from the Info Grid"""
     info = {
@@ -96,11 +100,8 @@ def redesign_card(card_html, card_num):
 
     return card_html
 
-def process_deals_file(input_file, output_file):
-    """Process the entire deals.html file"""
-
-    with open(input_file, 'r', encoding='utf-8') as f:
-        content = f.read()
+def redesign_cards(content):
+    """Redesign every deal card in a page; returns (new content, card numbers processed)"""
 
     # Find all deal cards
     # Pattern: from <!-- Deal Card N to the next <!-- Deal Card or end of section
@@ -113,6 +114,9 @@ def process_deals_file(input_file, output_file):
         card_num = match.group(2)
         card_content = match.group(3)
 
+        if any(marker in card_content for marker in REDESIGNED_MARKERS):
+            return match.group(0)
+
         print(f"Processing Card {card_num}...")
 
         # Redesign the card
@@ -125,6 +129,16 @@ def process_deals_file(input_file, output_file):
     # Replace all cards
     new_content = re.sub(card_pattern, replace_card, content, flags=re.DOTALL)
 
+    return new_content, cards_processed
+
+def process_deals_file(input_file, output_file):
+    """Process the entire deals.html file"""
+
+    with open(input_file, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    new_content, cards_processed = redesign_cards(content)
+
     # Write the output
     with open(output_file, 'w', encoding='utf-8') as f:
         f.write(new_content)
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+Responsive image derivatives and srcset/<picture> rewriting
+
+`build` resizes every JPEG/PNG under the site's image folders to a ladder of
+widths and writes WebP (and AVIF when Pillow can encode it) copies to
+images/responsive/. Sources are hashed and recorded in
+images/responsive/manifest.json, so a re-run only re-encodes images that
+changed; the work is spread over a process pool. Derivative names carry
+the source hash, so they can be served with long cache lifetimes.
+
+`rewrite` wraps each local <img> found in the manifest in a <picture> with
+AVIF/WebP <source srcset> candidates, keeping the original file as the
+fallback src and adding width/height so the layout does not shift. Card
+images also get a tiny blurred WebP (at most PLACEHOLDER_BUDGET characters)
+as their CSS background, so the slot shows the picture's colours instead of
+a blank box while the real image loads. The rewrite is idempotent: pictures
+written by an earlier run are regenerated in place.
+
+Usage:
+    python3 responsive_images.py build [--widths 320,480,640,960,1280] [--workers 8]
+    python3 responsive_images.py rewrite deals.html index.html list.html itinerary.html
+    python3 responsive_images.py stats
+"""
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from html import escape
+
+from deal_cards import ATTR_RE, DEALS_FILE
+
+SITE_DIR = os.path.dirname(DEALS_FILE)
+OUTPUT_DIR = 'images/responsive'
+MANIFEST_NAME = 'manifest.json'
+SOURCE_DIRS = ('deals', 'images')
+SKIP_DIRS = {'responsive', 'fonts'}
+SOURCE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+PAGES = ('deals.html', 'index.html', 'list.html', 'itinerary.html')
+
+DEFAULT_WIDTHS = (320, 480, 640, 960, 1280)
+SAVE_OPTIONS = {'avif': {'quality': 55, 'speed': 7}, 'webp': {'quality': 80, 'method': 4}}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp'}
+
+# Rendered width by source folder, for the sizes attribute; first match wins.
+# Cards show their image in a 400px column that goes full width on phones.
+SIZES = (
+    ('deals/', '(max-width: 768px) 100vw, 400px'),
+    ('images/deals/', '(max-width: 768px) 100vw, 400px'),
+    ('images/cruise-destinations/', '(max-width: 768px) 100vw, 400px'),
+    ('images/megamenu/', '(max-width: 768px) 100vw, 320px'),
+)
+DEFAULT_SIZES = '(max-width: 768px) 100vw, 50vw'
+
+# Card images get a tiny blurred WebP painted behind them until they load.
+# The data URI is capped so each card grows by a bounded number of bytes.
+PLACEHOLDER_SOURCES = ('deals/', 'images/deals/', 'images/cruise-destinations/')
+PLACEHOLDER_WIDTHS = (32, 24, 16)
+PLACEHOLDER_BUDGET = 600  # characters of data URI per image
+PLACEHOLDER_STYLE = 'background: url({uri}) center / cover no-repeat;'
+PLACEHOLDER_STYLE_RE = re.compile(
+    r'\s*background: url\(data:image/webp;base64,[A-Za-z0-9+/=]*\) center / cover no-repeat;')
+
+# An <img>, optionally inside a <picture> written by an earlier rewrite
+PICTURE_RE = re.compile(
+    r'<picture data-responsive>\s*(?:<source\b[^>]*>\s*)*(<img\b[^>]*>)\s*</picture>'
+    r'|<img\b[^>]*>',
+    re.DOTALL
+)
+
+
+def available_formats() -> list:
+    """Derivative formats this Pillow build can write, best first."""
+    from PIL import Image
+    Image.init()
+    return [fmt for fmt in ('avif', 'webp') if fmt.upper() in Image.SAVE]
+
+
+def source_hash(path: str) -> str:
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+
+def find_sources(site_dir: str) -> list:
+    """Site-relative paths of every image we make derivatives for."""
+    sources = []
+    for top in SOURCE_DIRS:
+        for dirpath, dirnames, filenames in os.walk(os.path.join(site_dir, top)):
+            dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+            for name in sorted(filenames):
+                if os.path.splitext(name)[1].lower() in SOURCE_EXTENSIONS:
+                    sources.append(os.path.relpath(os.path.join(dirpath, name), site_dir).replace(os.sep, '/'))
+    return sources
+
+
+def derivative_path(source: str, digest: str, width: int, fmt: str) -> str:
+    stem = os.path.splitext(source)[0]
+    return f"{OUTPUT_DIR}/{stem}-{digest[:8]}-{width}.{fmt}"
+
+
+def ladder_for(image_width: int, widths: list) -> list:
+    """Ladder steps narrower than the source, plus the source width itself."""
+    steps = [w for w in widths if w < image_width]
+    if image_width <= max(widths):
+        steps.append(image_width)
+    return steps or [min(widths)]
+
+
+def make_placeholder(image) -> str:
+    """Blurred WebP data URI of an RGB image within PLACEHOLDER_BUDGET, or None."""
+    from PIL import Image, ImageFilter
+
+    width, height = image.size
+    for step in PLACEHOLDER_WIDTHS:
+        small = image.resize((step, max(1, round(height * step / width))), Image.BILINEAR)
+        small = small.filter(ImageFilter.GaussianBlur(1))
+        for quality in (40, 25, 10):
+            buffer = io.BytesIO()
+            small.save(buffer, format='WEBP', quality=quality)
+            uri = 'data:image/webp;base64,' + base64.b64encode(buffer.getvalue()).decode('ascii')
+            if len(uri) <= PLACEHOLDER_BUDGET:
+                return uri
+    return None
+
+
+def wants_placeholder(source: str) -> bool:
+    return source.startswith(PLACEHOLDER_SOURCES)
+
+
+def placeholder_for(site_dir: str, source: str) -> tuple:
+    """(source, placeholder) for an image built before placeholders existed."""
+    from PIL import Image, ImageOps
+
+    with Image.open(os.path.join(site_dir, source)) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+            return source, None  # logos: a blurred blob would show through
+        return source, make_placeholder(image.convert('RGB'))
+
+
+def build_one(site_dir: str, source: str, digest: str, widths: list, formats: list) -> dict:
+    """Encode all derivatives of one source image (runs in a worker process)."""
+    from PIL import Image, ImageOps
+
+    with Image.open(os.path.join(site_dir, source)) as image:
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+        image = image.convert('RGBA' if has_alpha else 'RGB')
+        width, height = image.size
+
+        variants = {fmt: [] for fmt in formats}
+        for step in ladder_for(width, widths):
+            resized = image if step == width else image.resize(
+                (step, max(1, round(height * step / width))), Image.LANCZOS)
+            for fmt in formats:
+                path = derivative_path(source, digest, step, fmt)
+                full_path = os.path.join(site_dir, path)
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                tmp_path = f"{full_path}.{os.getpid()}.tmp"
+                resized.save(tmp_path, format=fmt.upper(), **SAVE_OPTIONS[fmt])
+                os.replace(tmp_path, full_path)
+                variants[fmt].append([step, path, os.path.getsize(full_path)])
+
+        placeholder = None
+        if wants_placeholder(source) and not has_alpha:
+            placeholder = make_placeholder(image)
+
+    return {
+        'hash': digest,
+        'width': width,
+        'height': height,
+        'bytes': os.path.getsize(os.path.join(site_dir, source)),
+        'widths': list(widths),
+        'variants': variants,
+        'placeholder': placeholder,
+    }
+
+
+def manifest_path(site_dir: str) -> str:
+    return os.path.join(site_dir, OUTPUT_DIR, MANIFEST_NAME)
+
+
+def load_manifest(site_dir: str) -> dict:
+    try:
+        with open(manifest_path(site_dir), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(site_dir: str, manifest: dict):
+    path = manifest_path(site_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def remove_variants(site_dir: str, entry: dict):
+    for variants in entry.get('variants', {}).values():
+        for _, path, _ in variants:
+            try:
+                os.remove(os.path.join(site_dir, path))
+            except OSError:
+                pass
+
+
+def is_current(site_dir: str, entry: dict, digest: str, widths: list, formats: list) -> bool:
+    """True if entry was built from this source with these settings and its files exist."""
+    if not entry or entry['hash'] != digest or entry['widths'] != list(widths):
+        return False
+    if sorted(entry['variants']) != sorted(formats):
+        return False
+    return all(os.path.exists(os.path.join(site_dir, path))
+               for variants in entry['variants'].values() for _, path, _ in variants)
+
+
+def build(site_dir: str, widths: list, workers: int = None, force: bool = False) -> tuple:
+    """Bring images/responsive up to date; returns (manifest, built, reused, removed)."""
+    formats = available_formats()
+    manifest = load_manifest(site_dir)
+    sources = find_sources(site_dir)
+
+    stale = []
+    for source in sources:
+        digest = source_hash(os.path.join(site_dir, source))
+        if force or not is_current(site_dir, manifest.get(source), digest, widths, formats):
+            stale.append((source, digest))
+
+    current = set(sources)
+    removed = [source for source in manifest if source not in current]
+    for source in removed:
+        remove_variants(site_dir, manifest.pop(source))
+
+    stale_sources = {source for source, _ in stale}
+    missing_placeholders = [source for source in sources
+                            if source not in stale_sources and 'placeholder' not in manifest[source]]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(build_one, site_dir, source, digest, list(widths), formats): source
+                   for source, digest in stale}
+        futures.update({pool.submit(placeholder_for, site_dir, source): source
+                        for source in missing_placeholders if wants_placeholder(source)})
+        for future in as_completed(futures):
+            source = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"  ✗ {source}: {e}")
+                continue
+            if isinstance(result, tuple):
+                manifest[source]['placeholder'] = result[1]
+                continue
+            old = manifest.get(source)
+            if old and old['hash'] != result['hash']:
+                remove_variants(site_dir, old)
+            manifest[source] = result
+            print(f"  ✓ {source} ({result['width']}×{result['height']})")
+        for source in missing_placeholders:
+            manifest[source].setdefault('placeholder', None)
+
+    save_manifest(site_dir, manifest)
+    return manifest, len(stale), len(sources) - len(stale), len(removed)
+
+
+def sizes_for(source: str) -> str:
+    for prefix, sizes in SIZES:
+        if source.startswith(prefix):
+            return sizes
+    return DEFAULT_SIZES
+
+
+def picture_markup(img_tag: str, entry: dict, url_prefix: str, sizes: str) -> str:
+    """<picture> with AVIF/WebP sources around the original <img>, plus its placeholder."""
+    attrs = {name.lower() for name, _ in ATTR_RE.findall(img_tag[4:])}
+    if 'width' not in attrs and 'height' not in attrs:
+        img_tag = re.sub(r'\s*/?>$', f' width="{entry["width"]}" height="{entry["height"]}">', img_tag)
+
+    img_tag = PLACEHOLDER_STYLE_RE.sub('', img_tag)
+    if entry.get('placeholder'):
+        background = PLACEHOLDER_STYLE.format(uri=entry['placeholder'])
+        style = re.search(r'\sstyle\s*=\s*"([^"]*)"', img_tag)
+        if style:
+            value = style.group(1).rstrip()
+            value = f"{value}{'' if not value or value.endswith(';') else ';'} {background}".lstrip()
+            img_tag = img_tag[:style.start(1)] + value + img_tag[style.end(1):]
+        else:
+            img_tag = re.sub(r'\s*/?>$', f' style="{background}">', img_tag)
+
+    sources = []
+    for fmt, variants in entry['variants'].items():
+        srcset = ', '.join(f"{url_prefix}{path} {width}w" for width, path, _ in variants)
+        sources.append(f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(srcset)}" sizes="{sizes}">')
+    return f"<picture data-responsive>{''.join(sources)}{img_tag}</picture>"
+
+
+def rewrite_html(content: str, manifest: dict, page_dir: str, site_dir: str) -> tuple:
+    """Wrap manifest images in <picture>; returns (content, images rewritten)."""
+    url_prefix = os.path.relpath(site_dir, page_dir).replace(os.sep, '/')
+    url_prefix = '' if url_prefix == '.' else url_prefix + '/'
+    rewritten = 0
+
+    def replace(match):
+        nonlocal rewritten
+        img_tag = match.group(1) or match.group(0)
+        src = re.search(r'\ssrc\s*=\s*["\']([^"\']+)["\']', img_tag)
+        if not src or re.match(r'^(?:[a-z]+:|//)', src.group(1)):
+            return match.group(0)
+        source = os.path.relpath(os.path.normpath(os.path.join(page_dir, src.group(1))), site_dir)
+        entry = manifest.get(source.replace(os.sep, '/'))
+        if not entry:
+            return match.group(0)
+        rewritten += 1
+        return picture_markup(img_tag, entry, url_prefix, sizes_for(source.replace(os.sep, '/')))
+
+    return PICTURE_RE.sub(replace, content), rewritten
+
+
+def rewrite_files(paths: list, site_dir: str) -> int:
+    manifest = load_manifest(site_dir)
+    if not manifest:
+        print("❌ No derivatives yet - run `responsive_images.py build` first")
+        sys.exit(1)
+
+    total = 0
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content, count = rewrite_html(content, manifest, os.path.dirname(os.path.abspath(path)), site_dir)
+        if new_content != content:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+        print(f"  {path}: {count} images")
+        total += count
+    return total
+
+
+def print_stats(manifest: dict, slot_width: int = 400):
+    """Bytes per format, and what a card slot of slot_width px downloads."""
+    original = sum(entry['bytes'] for entry in manifest.values())
+    print(f"{'Format':<8} {'Files':>6} {'All MB':>8} {f'@{slot_width}px MB':>11}")
+    formats = sorted({fmt for entry in manifest.values() for fmt in entry['variants']})
+    for fmt in formats:
+        files = total = slot = 0
+        for entry in manifest.values():
+            variants = entry['variants'].get(fmt, [])
+            files += len(variants)
+            total += sum(size for _, _, size in variants)
+            if variants:
+                slot += next((size for width, _, size in variants if width >= slot_width), variants[-1][2])
+        print(f"{fmt:<8} {files:>6} {total / 1024 / 1024:>8.2f} {slot / 1024 / 1024:>11.2f}")
+    placeholders = [entry['placeholder'] for entry in manifest.values() if entry.get('placeholder')]
+    if placeholders:
+        print(f"🌫️  {len(placeholders)} placeholders, {max(map(len, placeholders))} chars max, "
+              f"{sum(map(len, placeholders)) // len(placeholders)} average")
+    print(f"📦 {len(manifest)} source images, {original / 1024 / 1024:.1f} MB at full size")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--site', default=SITE_DIR, help='folder holding the pages and images/')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build_parser = subparsers.add_parser('build', help='encode derivatives for new/changed images')
+    build_parser.add_argument('--widths', default=','.join(map(str, DEFAULT_WIDTHS)))
+    build_parser.add_argument('--workers', type=int, help='worker processes (default: CPU count)')
+    build_parser.add_argument('--force', action='store_true', help='re-encode everything')
+
+    rewrite_parser = subparsers.add_parser('rewrite', help='wrap <img> tags in <picture>')
+    rewrite_parser.add_argument('pages', nargs='*', help='pages to rewrite (default: the four site pages)')
+
+    subparsers.add_parser('stats', help='derivative sizes per format and width')
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        widths = sorted(int(w) for w in args.widths.split(','))
+        start = time.perf_counter()
+        print(f"🖼️  Building {', '.join(available_formats())} derivatives at {widths} px")
+        manifest, built, reused, removed = build(args.site, widths, args.workers, args.force)
+        print(f"✅ {built} built, {reused} up to date, {removed} removed "
+              f"in {time.perf_counter() - start:.1f}s")
+    elif args.command == 'rewrite':
+        pages = args.pages or [os.path.join(args.site, page) for page in PAGES]
+        print(f"✅ {rewrite_files(pages, args.site)} images now responsive")
+    else:
+        print_stats(load_manifest(args.site))
+
+
+if __name__ == '__main__':
+    main()
@@ -5,13 +5,16 @@ Restore pricing sections to the 5 cards that lost them.
 
 import re
 
-PRICING_DATA = {
-    "Baltic Sea & Beyond": {"old": "7200", "new": "6149", "discount": "-15% OFF"},
-    "7-Day Jewels Of The Dalmatian Coast": {"old": "4700", "new": "4092", "discount": "-13% OFF"},
-    "Discover Mediterranean Wonders": {"old": "4900", "new": "4299", "discount": "-12% OFF"},
-    "12-Day Amazon Delta & Coast Of Brazil": {"old": "6800", "new": "5799", "discount": "-15% OFF"},
-    "7 Night Tortola, San Juan & Puerto Plata": {"old": "4800", "new": "4249", "discount": "-11% OFF"},
-}
+from deal_pricing import pricing_data_for
+
+# Prices come from deal_pricing.csv
+PRICED_TITLES = [
+    "Baltic Sea & Beyond",
+    "7-Day Jewels Of The Dalmatian Coast",
+    "Discover Mediterranean Wonders",
+    "12-Day Amazon Delta & Coast Of Brazil",
+    "7 Night Tortola, San Juan & Puerto Plata",
+]
 
 def create_pricing_section(old_price: str, new_price: str, discount: str) -> str:
     """Create the pricing section HTML."""
@@ -83,20 +86,14 @@ def add_pricing_before_cta(content: str, card_title: str, pricing_data: dict) ->
 
     return content, False
 
-def main():
-    filepath = '/mnt/d/Websites/travel/deals.html'
-
-    print("Restoring pricing sections...\n")
-    content = read_file(filepath)
-
-    print("1. Cleaning broken pricing fragments...")
-    content = clean_broken_pricing_fragments(content)
-
-    print("\n2. Adding pricing sections to cards...")
+def restore_pricing(content: str, prices: dict = None) -> tuple:
+    """Add pricing to every PRICED_TITLES card; returns (content, added count, failed titles)."""
+    if prices is None:
+        prices = pricing_data_for(PRICED_TITLES)
     added_count = 0
     failed_cards = []
 
-    for card_title, pricing_data in PRICING_DATA.items():
+    for card_title, pricing_data in prices.items():
         content, success = add_pricing_before_cta(content, card_title, pricing_data)
         if success:
             added_count += 1
@@ -105,6 +102,20 @@ def main():
             failed_cards.append(card_title)
             print(f"  ⚠️  Failed to add pricing to: {card_title}")
 
+    return content, added_count, failed_cards
+
+def main():
+    filepath = '/mnt/d/Websites/travel/deals.html'
+
+    print("Restoring pricing sections...\n")
+    content = read_file(filepath)
+
+    print("1. Cleaning broken pricing fragments...")
+    content = clean_broken_pricing_fragments(content)
+
+    print("\n2. Adding pricing sections to cards...")
+    content, added_count, failed_cards = restore_pricing(content)
+
     print(f"\n✓ Successfully restored pricing to {added_count} cards")
     if failed_cards:
         print(f"⚠️  Failed cards: {len(failed_cards)}")
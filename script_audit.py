@@ -0,0 +1,653 @@
+#!/usr/bin/env python3
+"""
+Third-party script audit and a deduplicated, deferred loading plan
+
+list.html was saved from the live site and carries 45 <script> tags. Some
+load a library twice (the Facebook SDK, the reviews.io badge). Some are
+copies of scripts that another script injects at runtime (gtm.js, the
+reCAPTCHA release, the Curator feed), saved along with their loader. Both
+Bootstrap 4.1.3 and 5.3.3 are loaded, each with its own Popper. moment
+comes from a `latest` URL, and most of the rest block the parser.
+
+The audit parses every page's scripts and puts each into one bucket:
+
+    critical     stays where it is, synchronous
+    deferrable   loaded with defer, in dependency order
+    idle         loaded after the load event, when the browser is idle
+    duplicate    a second tag for a library already loaded
+    leftover     a saved copy of a script another script injects
+
+It also reports libraries loaded in conflicting versions, and unpinned
+CDN URLs. Known libraries are listed in LIBRARIES. Unknown external
+scripts are deferrable.
+
+An inline script that calls a library while the page parses (jQuery's $,
+reviewsBadgeRibbon, new Swiper) is checked for top-level declarations. If
+it declares nothing it is wrapped: a DOMContentLoaded listener waits for
+deferred libraries, and scriptPlan.ready() waits for idle ones. If it does
+declare globals, wrapping would hide them, so the library it needs (and
+that library's requirements) stays critical. This check is a rough scanner,
+not a JavaScript parser.
+
+--rewrite drops the duplicates and leftovers. It puts the deferred scripts
+and the idle loader into one block (SCRIPT PLAN) ahead of the page's first
+script, and wraps the dependent inline scripts. Re-running is safe: the
+block is expanded back into tags and planned again.
+
+The before/after figures are an estimate, not a measurement.
+Parser-blocking time is the slowest fetch among the scripts that block the
+parser (the preload scanner fetches them together) plus their summed
+execution. Sizes are rough gzip figures, with DEFAULT_KB for unknown
+scripts. The network and CPU costs use the constants below, for a mid-range
+phone on 4G.
+
+Usage:
+    python3 script_audit.py                              # audit the four site pages
+    python3 script_audit.py list.html index.html
+    python3 script_audit.py list.html --rewrite [--dry-run]
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from dataclasses import dataclass, field
+from html import escape
+
+from deal_cards import DEALS_FILE, parse_attrs
+
+SITE_PAGES = ['list.html', 'index.html', 'deals.html', 'itinerary.html']
+
+CRITICAL = 'critical'
+DEFER = 'deferrable'
+IDLE = 'idle'
+DUPLICATE = 'duplicate'
+LEFTOVER = 'leftover'
+
+# Estimate model
+DEFAULT_KB = 20
+RTT_MS = 100
+CONNECT_MS = 250       # DNS + TCP + TLS for an origin not seen before
+KB_PER_MS = 1.0        # ~8 Mbit/s
+EXEC_MS_PER_KB = 2.0   # parse + compile + run, per gzip KB
+
+PLAN_START = '<!-- SCRIPT PLAN START -->'
+PLAN_END = '<!-- SCRIPT PLAN END -->'
+PLAN_RE = re.compile(r'[ \t]*' + re.escape(PLAN_START) + r'(.*?)' + re.escape(PLAN_END) + r'\n?', re.DOTALL)
+PLAN_QUEUE_RE = re.compile(r'const queue = (\[.*?\]);\n')
+SCRIPT_RE = re.compile(r'[ \t]*<script\b([^>]*)>(.*?)</script\s*>[ \t]*\n?', re.DOTALL | re.IGNORECASE)
+HEAD_END_RE = re.compile(r'</head\s*>', re.IGNORECASE)
+JS_TYPES = {'', 'text/javascript', 'application/javascript', 'module'}
+KEPT_ATTRS = ('id', 'type', 'integrity', 'crossorigin', 'charset', 'referrerpolicy', 'nomodule')
+DECLARATION_RE = re.compile(r'(?:^|[;})\s])(?:var|let|const|function|class)\s+([\w$]+)')
+WORD_BEFORE_RE = re.compile(r'([\w$]+)\s*$')
+BLOCK_KEYWORDS = {'if', 'for', 'while', 'switch', 'catch', 'with'}
+REGEX_PREFIX = set('(,=:[!&|?{};+-*%<>~^') | {''}
+PINNED_RE = re.compile(r'^\d+\.\d+')
+# An inline snippet already wrapped by a previous --rewrite
+IDLE_WRAPPED_RE = re.compile(r'^\s*scriptPlan\.idle\(function \(\) \{')
+
+
+@dataclass
+class Library:
+    name: str
+    url: str                 # regex on the script URL
+    load: str                # CRITICAL, DEFER or IDLE
+    kb: int = DEFAULT_KB     # rough gzip size for the estimate
+    version: str = ''        # regex with one group for the version in the URL
+    globals: tuple = ()      # names inline code reaches it through
+    requires: tuple = ()     # libraries that must run first
+    injected_by: str = ''    # library or snippet that loads it at runtime
+
+
+# First match wins, so specific URLs come before general ones
+LIBRARIES = [
+    Library('tailwind-play', r'cdn\.tailwindcss\.com', CRITICAL, 110, globals=('tailwind',)),
+    Library('jquery', r'jquery[-.\d]*(?:\.slim)?(?:\.min)?\.js', DEFER, 31, r'jquery-(\d[\d.]*\d)',
+            globals=('$', 'jQuery')),
+    Library('bootstrap', r'bootstrap(?:@|/)\d[^/]*/(?:dist/)?js/bootstrap(?:\.bundle)?(?:\.min)?\.js', DEFER, 23,
+            r'bootstrap[@/](\d[\d.]*\d)', globals=('bootstrap',), requires=('popper', 'jquery')),
+    Library('popper', r'popper(?:\.js)?[@/][\d.]+/', DEFER, 7, r'popper(?:\.js)?[@/](\d[\d.]*\d)',
+            globals=('Popper',)),
+    Library('moment', r'moment(?:\.min)?\.js', DEFER, 18, r'moment(?:js)?[@/](latest|\d[\d.]*\d)',
+            globals=('moment',)),
+    Library('daterangepicker', r'daterangepicker(?:\.min)?\.js', DEFER, 9, requires=('jquery', 'moment')),
+    Library('select2', r'select2(?:\.full)?(?:\.min)?\.js', DEFER, 21, r'select2@(\d[\w.-]*)',
+            requires=('jquery',)),
+    Library('slick', r'slick(?:\.min)?\.js', DEFER, 11, requires=('jquery',)),
+    Library('nouislider', r'nouislider(?:\.min)?\.js', DEFER, 8, r'noUiSlider/(\d[\d.]*\d)',
+            globals=('noUiSlider',)),
+    Library('swiper', r'swiper-bundle(?:\.min)?\.js', DEFER, 40, r'swiper@(\d[\d.]*)', globals=('Swiper',)),
+    Library('leaflet', r'/leaflet(?:\.min)?\.js', DEFER, 42, globals=('L',)),
+    Library('facebook-sdk', r'connect\.facebook\.net/[^/]+/sdk\.js\?hash=', IDLE, 70, injected_by='facebook-sdk'),
+    Library('facebook-sdk', r'connect\.facebook\.net/[^/]+/sdk\.js', IDLE, 70, globals=('FB',)),
+    Library('recaptcha-release', r'gstatic\.com/recaptcha/releases/', IDLE, 150, injected_by='recaptcha'),
+    Library('recaptcha', r'google\.com/recaptcha/api\.js', IDLE, 1, globals=('grecaptcha',)),
+    Library('gtm', r'googletagmanager\.com/gtm\.js', IDLE, 90, injected_by='google-tag-manager'),
+    Library('curator-feed', r'cdn\.curator\.io/published/', IDLE, 5, injected_by='curator-loader'),
+    Library('curator', r'cdn\.curator\.io/[\d.]+/curator\.embed\.js', IDLE, 60, r'curator\.io/(\d[\d.]*)/',
+            globals=('Curator',)),
+    Library('reviews-badge', r'widget\.reviews\.io/badge-ribbon/', IDLE, globals=('reviewsBadgeRibbon',)),
+    Library('reviews-carousel', r'widget\.reviews\.co\.uk/carousel-inline', IDLE,
+            globals=('carouselInlineWidget',)),
+    Library('hotjar', r'static\.hotjar\.com/', IDLE, 3),
+]
+
+# Inline snippets recognised by their code: (name, regex, load)
+INLINE_SNIPPETS = [
+    ('vwo', r'_vwo_code', CRITICAL),  # anti-flicker: hides the body until the test variation is applied
+    ('google-tag-manager', r'googletagmanager\.com/gtm\.js', IDLE),
+    ('curator-loader', r'cdn\.curator\.io/published/', IDLE),
+]
+
+# Data-API markup that only one Bootstrap major version understands
+VERSION_USES = {
+    ('bootstrap', '4'): r'\sdata-toggle=',
+    ('bootstrap', '5'): r'\sdata-bs-toggle=',
+}
+
+PLAN_JS = r'''
+        // Idle loader (script_audit.py): the queued scripts load after the
+        // load event once the browser is idle; inline code that needs one
+        // of them waits in scriptPlan.ready()
+        window.scriptPlan = (function () {
+            const queue = __QUEUE__;
+            const loaded = {};
+            const waiting = {};
+            const tasks = [];
+            let started = false;
+            const schedule = window.requestIdleCallback
+                ? fn => requestIdleCallback(fn, { timeout: 4000 })
+                : fn => setTimeout(fn, 1);
+
+            function ready(names, fn) {
+                const missing = names.filter(name => !loaded[name]);
+                if (!missing.length) {
+                    fn();
+                    return;
+                }
+                const entry = { count: missing.length, fn: fn };
+                missing.forEach(name => (waiting[name] = waiting[name] || []).push(entry));
+            }
+
+            function markLoaded(name) {
+                if (loaded[name]) return;
+                loaded[name] = true;
+                (waiting[name] || []).splice(0).forEach(entry => {
+                    if (--entry.count === 0) entry.fn();
+                });
+            }
+
+            function idle(fn) {
+                if (started) schedule(fn);
+                else tasks.push(fn);
+            }
+
+            function start() {
+                started = true;
+                schedule(function () {
+                    const pending = {};
+                    queue.forEach(item => pending[item.name] = (pending[item.name] || 0) + 1);
+                    queue.forEach(item => {
+                        const script = document.createElement('script');
+                        Object.keys(item.attrs).forEach(name => script.setAttribute(name, item.attrs[name]));
+                        script.src = item.src;
+                        script.async = true;
+                        script.onload = () => {
+                            if (--pending[item.name] === 0) markLoaded(item.name);
+                        };
+                        document.head.appendChild(script);
+                    });
+                });
+                tasks.splice(0).forEach(schedule);
+            }
+
+            if (document.readyState === 'complete') start();
+            else window.addEventListener('load', start);
+            return { ready: ready, idle: idle };
+        })();
+    '''
+
+
+@dataclass
+class Script:
+    start: int
+    end: int
+    line: int
+    attrs: dict
+    code: str
+    src: str = ''
+    library: Library = None
+    name: str = ''
+    version: str = ''
+    load: str = DEFER
+    reason: str = ''
+    needs: list = field(default_factory=list)   # libraries inline code calls while parsing
+    waits: list = field(default_factory=list)   # idle libraries a wrapped script waits for
+    declares: list = field(default_factory=list)
+    wrap: str = ''                               # 'ready' / 'idle' / 'domready' for inline scripts
+
+    @property
+    def external(self) -> bool:
+        return bool(self.src)
+
+    @property
+    def blocking(self) -> bool:
+        """Holds up the parser: a classic external script without async/defer."""
+        return (self.external and 'async' not in self.attrs and 'defer' not in self.attrs
+                and self.attrs.get('type', '') != 'module')
+
+    @property
+    def kb(self) -> float:
+        if self.library:
+            return self.library.kb
+        return len(self.code.encode('utf-8')) / 1024 if not self.external else DEFAULT_KB
+
+
+def origin_of(src: str) -> str:
+    match = re.match(r'(?:https?:)?//([^/]+)', src)
+    return match.group(1).lower() if match else ''
+
+
+def skip_string(js: str, i: int) -> int:
+    """Offset after the string, template literal or regex literal starting at i."""
+    quote = js[i]
+    i += 1
+    in_class = False
+    while i < len(js):
+        ch = js[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if quote == '/':
+            if ch == '[':
+                in_class = True
+            elif ch == ']':
+                in_class = False
+            elif ch == '/' and not in_class:
+                return i + 1
+            elif ch == '\n':
+                return i
+        elif ch == quote:
+            return i + 1
+        i += 1
+    return i
+
+
+def opens_function(js: str, brace: int) -> bool:
+    """Whether the '{' at brace starts a function body (not a block or object literal)."""
+    before = js[:brace].rstrip()
+    if before.endswith('=>'):
+        return True
+    if not before.endswith(')'):
+        return False
+    depth = 0
+    for i in range(len(before) - 1, -1, -1):
+        if before[i] == ')':
+            depth += 1
+        elif before[i] == '(':
+            depth -= 1
+            if depth == 0:
+                word = WORD_BEFORE_RE.search(before[:i])
+                return bool(word) and word.group(1) not in BLOCK_KEYWORDS
+    return False
+
+
+def parse_time_code(js: str) -> tuple:
+    """(code that runs while the page parses, names declared at the top level).
+
+    Function bodies and the contents of strings and comments are dropped.
+    Braces of if/for/try blocks and object literals are kept, since what is
+    inside them runs straight away.
+    """
+    running = []
+    top = []
+    braces = []        # True for each open function body
+    function_depth = 0
+    last = ''
+    i = 0
+    while i < len(js):
+        ch = js[i]
+        if js.startswith('//', i):
+            end = js.find('\n', i)
+            i = len(js) if end == -1 else end
+            continue
+        if js.startswith('/*', i):
+            end = js.find('*/', i + 2)
+            i = len(js) if end == -1 else end + 2
+            continue
+        if ch in '"\'`' or (ch == '/' and last in REGEX_PREFIX):
+            i = skip_string(js, i)
+            if not function_depth:
+                running.append('""')
+                if not braces:
+                    top.append('""')
+            last = '"'
+            continue
+        if ch == '{':
+            is_function = opens_function(js, i)
+            braces.append(is_function)
+            function_depth += is_function
+        if not function_depth:
+            running.append(ch)
+            if not braces:
+                top.append(ch)
+        if ch == '}' and braces:
+            function_depth -= braces.pop()
+        if not ch.isspace():
+            last = ch
+        i += 1
+    return ''.join(running), DECLARATION_RE.findall(''.join(top))
+
+
+def uses_global(code: str, name: str) -> bool:
+    return re.search(r'(?<![\w$.])' + re.escape(name) + r'(?![\w$])', code) is not None
+
+
+def identify(script: Script):
+    """Fill in the library, name and version of an external script."""
+    for library in LIBRARIES:
+        if re.search(library.url, script.src, re.IGNORECASE):
+            script.library = library
+            script.name = library.name
+            if library.version:
+                match = re.search(library.version, script.src, re.IGNORECASE)
+                script.version = match.group(1) if match else ''
+            script.load = library.load
+            return
+    script.name = re.sub(r'[?#].*$', '', script.src).rstrip('/').rsplit('/', 1)[-1]
+    script.load = DEFER
+
+
+def find_scripts(content: str) -> list:
+    """Executable scripts of a page, in document order."""
+    scripts = []
+    line = 1
+    last = 0
+    for match in SCRIPT_RE.finditer(content):
+        attrs = parse_attrs(match.group(1))
+        if attrs.get('type', '').lower() not in JS_TYPES:
+            continue
+        line += content.count('\n', last, match.start())
+        last = match.start()
+        script = Script(match.start(), match.end(), line, attrs, match.group(2), attrs.get('src', '').strip())
+        if script.external:
+            identify(script)
+        else:
+            script.load = ''
+            for name, pattern, load in INLINE_SNIPPETS:
+                if re.search(pattern, script.code):
+                    script.name, script.load = name, load
+                    break
+            running, script.declares = parse_time_code(script.code)
+            script.needs = [library.name for library in LIBRARIES
+                            if any(uses_global(running, name) for name in library.globals)]
+        scripts.append(script)
+    return scripts
+
+
+def classify(scripts: list, content: str) -> dict:
+    """Sort scripts into buckets; returns {'conflicts': [...], 'unpinned': [...]}."""
+    present = {script.name for script in scripts if script.name}
+    loaded = {}
+    for script in scripts:
+        if not script.external:
+            continue
+        if script.library and script.library.injected_by in present:
+            script.load = LEFTOVER
+            script.reason = f"injected at runtime by {script.library.injected_by}"
+            continue
+        key = (script.name, script.version)
+        if key in loaded:
+            script.load = DUPLICATE
+            script.reason = f"already loaded at line {loaded[key].line}"
+            continue
+        loaded[key] = script
+
+    libraries = {}
+    for (name, _), script in loaded.items():
+        libraries.setdefault(name, script)
+
+    def make_critical(name: str, reason: str):
+        script = libraries.get(name)
+        if not script or script.load == CRITICAL:
+            return
+        script.load = CRITICAL
+        script.reason = reason
+        for required in script.library.requires if script.library else ():
+            make_critical(required, f"required by {name}")
+
+    for script in scripts:
+        if script.external:
+            continue
+        needs = [name for name in script.needs if name in libraries]
+        if script.load == IDLE:
+            if script.declares:
+                script.load = CRITICAL
+                script.reason = f"declares {', '.join(script.declares[:3])}"
+            elif not IDLE_WRAPPED_RE.match(script.code):
+                script.wrap = 'idle'
+            continue
+        if not needs or all(libraries[name].load == CRITICAL for name in needs):
+            continue
+        if script.declares:
+            for name in needs:
+                make_critical(name, f"inline script at line {script.line} calls it while parsing "
+                                    f"and declares {', '.join(script.declares[:3])}")
+        elif any(libraries[name].load == IDLE for name in needs):
+            script.wrap = 'ready'
+            script.waits = [name for name in needs if libraries[name].load == IDLE]
+        else:
+            script.wrap = 'domready'
+    for script in scripts:
+        if script.load == CRITICAL and script.library and not script.reason:
+            script.reason = 'needed before first render'
+
+    conflicts = []
+    versions = {}
+    for script in loaded.values():
+        if script.version:
+            versions.setdefault(script.name, []).append(script)
+    for name, group in versions.items():
+        if len(group) < 2:
+            continue
+        parts = []
+        for script in group:
+            pattern = VERSION_USES.get((name, script.version.split('.')[0]))
+            count = len(re.findall(pattern, content)) if pattern else 0
+            parts.append(f"{script.version} (line {script.line}" + (f", {count} uses in markup)" if pattern else ")"))
+        conflicts.append(f"{name}: " + ' vs '.join(parts))
+    bundle = next((s for s in loaded.values() if 'bootstrap.bundle' in s.src), None)
+    if bundle and 'popper' in libraries:
+        conflicts.append(f"popper {libraries['popper'].version} (line {libraries['popper'].line}) next to "
+                         f"bootstrap.bundle {bundle.version}, which includes Popper 2")
+    unpinned = [f"{script.name} ({script.src})" for script in loaded.values()
+                if script.library and script.library.version and not PINNED_RE.match(script.version)]
+    return {'conflicts': conflicts, 'unpinned': unpinned}
+
+
+def estimate(scripts: list, after: bool = False) -> dict:
+    """Requests before load, requests after load and parser-blocking ms for a page's scripts."""
+    kept = [s for s in scripts if s.load not in (DUPLICATE, LEFTOVER)] if after else scripts
+    idle = [s for s in kept if after and s.load == IDLE]
+    if after:
+        blocking = [s for s in kept if s.external and s.load == CRITICAL and s.blocking]
+    else:
+        blocking = [s for s in kept if s.blocking]
+    seen = set()
+    fetch = 0.0
+    for script in blocking:
+        origin = origin_of(script.src)
+        connect = CONNECT_MS if origin and origin not in seen else 0
+        seen.add(origin)
+        fetch = max(fetch, connect + RTT_MS + script.kb / KB_PER_MS)
+    blocking_ms = fetch + sum(s.kb * EXEC_MS_PER_KB for s in blocking)
+    # Inline code runs while parsing either way; idle inline snippets move after load
+    before_load = [s for s in kept if s not in idle and not (after and s.wrap == 'idle')]
+    return {
+        'requests': sum(1 for s in before_load if s.external),
+        'idle_requests': sum(1 for s in idle if s.external),
+        'blocking_ms': blocking_ms,
+        'script_ms': sum(s.kb * EXEC_MS_PER_KB for s in before_load),
+    }
+
+
+def script_tag(script: Script, extra: str = 'defer') -> str:
+    attrs = ''.join(f' {name}="{escape(script.attrs[name])}"' if script.attrs[name] else f' {name}'
+                    for name in KEPT_ATTRS if name in script.attrs
+                    and not (name == 'type' and script.attrs[name].lower() == 'text/javascript'))
+    return f'<script src="{escape(script.src)}"{attrs}{" " + extra if extra else ""}></script>'
+
+
+def defer_order(scripts: list) -> list:
+    """Deferred scripts in document order, each pulled after the libraries it requires."""
+    deferred = [s for s in scripts if s.external and s.load == DEFER]
+    by_name = {s.name: s for s in deferred}
+    ordered = []
+
+    def place(script, path=()):
+        if script in ordered or script.name in path:
+            return
+        for name in script.library.requires if script.library else ():
+            if name in by_name:
+                place(by_name[name], path + (script.name,))
+        ordered.append(script)
+
+    for script in deferred:
+        place(script)
+    return ordered
+
+
+def render_plan(scripts: list) -> str:
+    tags = ''.join(f'\n    {script_tag(s)}' for s in defer_order(scripts))
+    queue = [{'name': s.name, 'src': s.src,
+              'attrs': {k: s.attrs[k] for k in KEPT_ATTRS if k in s.attrs and k not in ('id', 'type')}}
+             for s in scripts if s.external and s.load == IDLE]
+    loader = PLAN_JS.replace('__QUEUE__', json.dumps(queue, ensure_ascii=False).replace('</', '<\\/'))
+    return f'    {PLAN_START}{tags}\n    <script>{loader}</script>\n    {PLAN_END}\n'
+
+
+def expand_plan(content: str) -> str:
+    """Turn a previous SCRIPT PLAN block back into plain tags for re-planning."""
+    match = PLAN_RE.search(content)
+    if not match:
+        return content
+    block = match.group(1)
+    tags = [m.group(0).strip() for m in SCRIPT_RE.finditer(block) if 'src=' in m.group(1)]
+    queue = PLAN_QUEUE_RE.search(block)
+    for item in json.loads(queue.group(1)) if queue else []:
+        attrs = ''.join(f' {name}="{escape(value)}"' for name, value in item['attrs'].items())
+        tags.append(f'<script src="{escape(item["src"])}"{attrs} async></script>')
+    return content[:match.start()] + ''.join(f'    {tag}\n' for tag in tags) + content[match.end():]
+
+
+def wrap_inline(script: Script, content: str) -> str:
+    """The script's tag with its code wrapped to run after what it needs."""
+    if script.wrap == 'domready':
+        opening = "document.addEventListener('DOMContentLoaded', function () {"
+    elif script.wrap == 'ready':
+        opening = f"scriptPlan.ready({json.dumps(script.waits)}, function () {{"
+    else:
+        opening = 'scriptPlan.idle(function () {'
+    tag = content[script.start:script.end]
+    code_start = tag.index('>') + 1
+    code_end = code_start + len(script.code)
+    return tag[:code_start] + f'\n        {opening}' + script.code + '\n        });\n    ' + tag[code_end:]
+
+
+def plan_page(content: str) -> tuple:
+    """Audit a page; returns (scripts, notes) with every script classified."""
+    scripts = find_scripts(content)
+    notes = classify(scripts, content)
+    return scripts, notes
+
+
+def rewrite(content: str) -> tuple:
+    """Apply the loading plan; returns (new content, scripts before, scripts after)."""
+    content = expand_plan(content)
+    scripts, _ = plan_page(content)
+    pieces = []
+    last = 0
+    for script in scripts:
+        moved = script.load in (DUPLICATE, LEFTOVER) or (script.external and script.load in (DEFER, IDLE))
+        if not moved and not script.wrap:
+            continue
+        pieces.append(content[last:script.start])
+        if script.wrap:
+            pieces.append(wrap_inline(script, content))
+        last = script.end
+    pieces.append(content[last:])
+    body = ''.join(pieces)
+
+    first_script = SCRIPT_RE.search(body)
+    head_end = HEAD_END_RE.search(body)
+    if head_end is None:
+        raise ValueError("Page has no </head>")
+    at = first_script.start() if first_script and first_script.start() < head_end.start() else head_end.start()
+    new_content = body[:at] + render_plan(scripts) + body[at:]
+    return new_content, scripts
+
+
+def print_report(path: str, scripts: list, notes: dict):
+    external = sum(1 for s in scripts if s.external)
+    print(f"📜 {os.path.basename(path)}: {external} external, {len(scripts) - external} inline scripts")
+    for load in (CRITICAL, DEFER, IDLE, DUPLICATE, LEFTOVER):
+        group = [s for s in scripts if s.load == load and (s.external or s.name)]
+        if not group:
+            continue
+        print(f"  {load}:")
+        for s in group:
+            label = f"{s.name} {s.version}".strip()
+            where = 'inline' if not s.external else ('blocking' if s.blocking else
+                                                     'async' if 'async' in s.attrs else 'defer')
+            print(f"    line {s.line:>6}  {label:<24} {where:<9}{'  ' + s.reason if s.reason else ''}")
+    wrapped = [s for s in scripts if s.wrap]
+    if wrapped:
+        print(f"  inline scripts to wrap: " + ', '.join(f"line {s.line} ({s.wrap})" for s in wrapped))
+    for conflict in notes['conflicts']:
+        print(f"  ⚠️  conflicting versions: {conflict}")
+    for item in notes['unpinned']:
+        print(f"  ⚠️  unpinned: {item}")
+    before, after = estimate(scripts), estimate(scripts, after=True)
+    print(f"  requests before load  {before['requests']} -> {after['requests']} "
+          f"(+{after['idle_requests']} after load)")
+    print(f"  parser-blocking       ~{before['blocking_ms']:,.0f} ms -> ~{after['blocking_ms']:,.0f} ms")
+    print(f"  script before load    ~{before['script_ms']:,.0f} ms -> ~{after['script_ms']:,.0f} ms")
+
+
+def main():
+    site_dir = os.path.dirname(DEALS_FILE)
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('pages', nargs='*', default=[os.path.join(site_dir, page) for page in SITE_PAGES])
+    parser.add_argument('--rewrite', action='store_true', help='apply the loading plan to the pages')
+    parser.add_argument('--dry-run', action='store_true', help='with --rewrite, report only')
+    args = parser.parse_args()
+
+    for path in args.pages:
+        if not os.path.exists(path):
+            print(f"⏭️  {path}: not found")
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            scripts, notes = plan_page(expand_plan(content))
+            print_report(path, scripts, notes)
+            if not args.rewrite:
+                continue
+            new_content, _ = rewrite(content)
+        except (OSError, ValueError) as e:
+            print(f"❌ {path}: {e}")
+            sys.exit(1)
+        if new_content == content:
+            print("  ✅ Already up to date")
+        elif args.dry_run:
+            print("  (dry run - nothing written)")
+        else:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            print(f"  ✅ Loading plan written to {path}")
+
+
+if __name__ == '__main__':
+    main()
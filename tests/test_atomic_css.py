@@ -0,0 +1,57 @@
+from atomic_css import STYLE_BLOCK_ID, compact, expand, verify
+from deal_cards import extract_cards
+
+PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+    <style>
+        .deal-card { padding: 8px; }
+        div[style*="display: none"] { opacity: 0; }
+    </style>
+</head>
+<body>
+    <article class="deal-card" data-deal-id="1" style="position: relative; padding: 0;">
+        <div style="position: absolute; top: 16px; left: 16px; color: red !important;">TOP DEAL</div>
+        <div style="display: none; color: #333;">hidden</div>
+        <h3 style="margin: 0; color: #333;">Caribbean Escape</h3>
+        <p style="margin: 0; margin-top: 4px;">per person</p>
+        <span style="text-decoration: line-through; color: #999;">£2,100</span>
+        <span style="color: #333;">£1,349</span>
+    </article>
+</body>
+</html>
+'''
+
+
+def test_compact_keeps_effective_styles():
+    compacted, stats = compact(PAGE)
+    assert f'<style id="{STYLE_BLOCK_ID}">' in compacted
+    assert stats['extracted'] > 0
+    assert verify(PAGE, compacted) == []
+    # Kept inline: !important, [style*=] targets and overlapping margins
+    assert 'color: red !important' in compacted
+    assert 'style="display: none;' in compacted
+    assert 'margin: 0; margin-top: 4px' in compacted
+
+
+def test_expand_restores_inline_styles():
+    compacted, _ = compact(PAGE)
+    expanded, elements = expand(compacted)
+    assert elements > 0
+    assert STYLE_BLOCK_ID not in expanded
+    assert verify(PAGE, expanded) == []
+    assert expand(PAGE) == (PAGE, 0)
+
+
+def test_compact_round_trip_is_stable():
+    compacted, _ = compact(PAGE)
+    assert compact(expand(compacted)[0])[0] == compacted
+    assert compact(compacted)[0] == compacted
+
+
+def test_cards_read_the_same_after_compaction():
+    before = extract_cards(PAGE)
+    after = extract_cards(compact(PAGE)[0])
+    assert after[0].badges == before[0].badges == ['TOP DEAL']
+    assert (after[0].title, after[0].old_price, after[0].new_price) == \
+        (before[0].title, before[0].old_price, before[0].new_price) == ('Caribbean Escape', 2100, 1349)
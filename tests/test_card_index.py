@@ -0,0 +1,49 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from card_index import CardIndex, build_index, index_path, load_index
+
+from conftest import ROOT
+
+
+@pytest.fixture
+def page(tmp_path):
+    path = str(tmp_path / 'deals.html')
+    shutil.copy(os.path.join(ROOT, 'deals.html'), path)
+    return path
+
+
+def test_replace_card_keeps_the_index_in_step(page):
+    cards = CardIndex(page)
+    first, second = cards.index['cards'][:2]
+    cards.replace_card(first, cards.read_card(first).replace('</article>', '<!-- edited --></article>'))
+
+    rebuilt = build_index(page)
+    assert [(e['start'], e['end'], e['hash']) for e in cards.index['cards']] == \
+        [(e['start'], e['end'], e['hash']) for e in rebuilt['cards']]
+    assert cards.read_card(second).startswith('<article')
+    assert load_index(page)['cards'] == rebuilt['cards']
+
+
+def test_replace_card_refuses_stale_offsets(page):
+    cards = CardIndex(page)
+    stale = CardIndex(page)
+    cards.replace_card(cards.index['cards'][0], cards.read_card(cards.index['cards'][0]) + '\n')
+
+    with open(page, 'rb') as f:
+        before = f.read()
+    with pytest.raises(ValueError):
+        stale.replace_card(stale.index['cards'][1], '<article data-deal-id="x"></article>')
+    with open(page, 'rb') as f:
+        assert f.read() == before
+
+
+def test_touch_refreshes_the_saved_mtime(page):
+    load_index(page)
+    os.utime(page, ns=(0, 10 ** 18))
+    load_index(page)
+    with open(index_path(page), 'r', encoding='utf-8') as f:
+        assert json.load(f)['mtime_ns'] == 10 ** 18
@@ -0,0 +1,28 @@
+import contextlib
+import io
+import os
+
+from deal_cards import extract_cards
+from deal_pipeline import DEFAULT_SEQUENCE, Document, check_idempotent, run_pipeline
+
+from conftest import ROOT
+
+
+def run_default(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        doc = Document(path, f.read())
+    with contextlib.redirect_stdout(io.StringIO()):
+        run_pipeline(doc, DEFAULT_SEQUENCE)
+    return doc
+
+
+def test_default_sequence_is_idempotent():
+    doc = run_default(os.path.join(ROOT, 'deals.html'))
+    assert check_idempotent(doc, DEFAULT_SEQUENCE) == ''
+
+
+def test_default_sequence_keeps_one_info_layout_per_card():
+    doc = run_default(os.path.join(ROOT, 'deals.html'))
+    for card in extract_cards(doc.content):
+        block = doc.content[card.start:card.end]
+        assert block.count('<!-- Vertical Info Layout') + block.count('<!-- Rich Info Box') == 1, card.deal_id
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Single-pass structural validator for deal pages
+
+Balances every tag on the page with a stack (no non-greedy
+<article>.*?</article> guessing), so a missing close tag is reported at
+the exact line/column where it was opened instead of silently merging two
+cards. While walking each <article data-deal-id> it also checks the card
+schema: pricing present, CTA buttons present, one title, no duplicated
+layout blocks, no reused deal id.
+
+Usage:
+    python3 validate_cards.py [deals.html ...]
+
+Exits 1 when any error is found, so it can gate a build.
+"""
+
+import bisect
+import re
+import sys
+import time
+from dataclasses import dataclass
+
+from deal_cards import DEALS_FILE, TOKEN_RE, parse_attrs
+
+VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link',
+    'meta', 'param', 'source', 'track', 'wbr',
+}
+# Elements whose end tag HTML lets you leave out
+OPTIONAL_END_TAGS = {
+    'p', 'li', 'dt', 'dd', 'option', 'optgroup', 'tr', 'td', 'th',
+    'thead', 'tbody', 'tfoot', 'colgroup', 'rt', 'rp',
+}
+RAW_TEXT_END = {
+    tag: re.compile(f'</{tag}', re.IGNORECASE)
+    for tag in ('script', 'style', 'textarea', 'title')
+}
+
+# Alternative info layouts: a card carries at most one of them in total
+INFO_LAYOUT_MARKERS = (
+    'Vertical Info Layout',
+    'Rich Info Box',
+    'Innovative Info Grid',
+)
+# Layout blocks that must appear at most once per card
+LAYOUT_MARKERS = INFO_LAYOUT_MARKERS + (
+    'Floating Price Card',
+    'Opulent Classic Luxury',
+    'Premium Features',
+)
+PRIMARY_CTA_TEXTS = ('view details', 'view cruise', 'book now')
+SECONDARY_CTA_TEXTS = ('inquire', 'enquire')
+
+
+@dataclass
+class Issue:
+    """One problem found on the page."""
+    severity: str  # 'error' or 'warning'
+    offset: int
+    message: str
+    deal_id: str = ''
+    line: int = 0
+    column: int = 0
+
+
+class _CardChecks:
+    """Per-card counters filled in while the balancer walks an article."""
+
+    def __init__(self, deal_id: str, offset: int, depth: int):
+        self.deal_id = deal_id
+        self.offset = offset
+        self.depth = depth  # stack depth of the <article> element
+        self.titles = 0
+        self.old_prices = 0
+        self.new_prices = 0
+        self.button_texts = []
+        self.markers = {}
+        self.in_button = False
+
+
+def check_card(card: _CardChecks) -> list:
+    """Schema issues for one finished card."""
+    issues = []
+
+    def add(severity, message):
+        issues.append(Issue(severity, card.offset, message, card.deal_id))
+
+    if card.new_prices == 0:
+        add('error', 'missing pricing block (no price)')
+    elif card.old_prices > 1 or card.new_prices > 1:
+        add('warning', f'duplicate pricing ({card.new_prices} prices)')
+
+    texts = [text.lower() for text in card.button_texts]
+    if not any(text in PRIMARY_CTA_TEXTS for text in texts):
+        add('error', 'missing primary CTA button')
+    if not any(text in SECONDARY_CTA_TEXTS for text in texts):
+        add('error', 'missing Inquire CTA button')
+
+    if card.titles == 0:
+        add('error', 'missing <h3> title')
+    elif card.titles > 1:
+        add('error', f'{card.titles} <h3> titles - merged or duplicated layout')
+
+    info_layouts = sum(card.markers.get(marker, 0) for marker in INFO_LAYOUT_MARKERS)
+    if info_layouts > 1:
+        found = ', '.join(f"'{marker}' x{card.markers[marker]}" for marker in INFO_LAYOUT_MARKERS
+                          if card.markers.get(marker))
+        add('error', f"duplicate layout: {info_layouts} info layouts ({found})")
+    for marker, count in card.markers.items():
+        if count > 1 and marker not in INFO_LAYOUT_MARKERS:
+            add('error', f"duplicate layout: '{marker}' appears {count} times")
+    return issues
+
+
+def validate(content: str) -> list:
+    """Validate a page in one pass; returns issues in page order."""
+    issues = []
+    stack = []  # (tag, offset, raw attributes)
+    card = None
+    seen_ids = {}  # deal id -> position of the first card using it
+    cards_seen = 0
+    pos = 0
+    length = len(content)
+
+    def unclosed(tag, offset):
+        issues.append(Issue('error', offset, f'<{tag}> is never closed', card.deal_id if card else ''))
+
+    while pos < length:
+        restart = None
+        for match in TOKEN_RE.finditer(content, pos):
+            closing, tag, attr_text, text = match.groups()
+
+            if text is not None:
+                if card is not None:
+                    if card.in_button:
+                        card.button_texts.append(' '.join(text.split()))
+                    elif '£' in text and stack and stack[-1][0] == 'span':
+                        if 'line-through' in stack[-1][2]:
+                            card.old_prices += 1
+                        elif text.strip() != 'pp':
+                            card.new_prices += 1
+                continue
+
+            if tag is None:
+                token = match.group(0).strip()
+                if card is not None and token.startswith('<!--'):
+                    for marker in LAYOUT_MARKERS:
+                        if marker in token:
+                            card.markers[marker] = card.markers.get(marker, 0) + 1
+                continue
+
+            tag = tag.lower()
+            offset = match.end() - len(match.group(0).lstrip())
+
+            if not closing:
+                if tag in VOID_TAGS or attr_text.rstrip().endswith('/'):
+                    continue
+                if tag in OPTIONAL_END_TAGS and stack and stack[-1][0] == tag:
+                    stack.pop()  # <li>..<li> implies </li>
+                stack.append((tag, offset, attr_text))
+
+                if tag == 'article':
+                    deal_id = parse_attrs(attr_text).get('data-deal-id')
+                    if deal_id is not None:
+                        cards_seen += 1
+                        if card is not None:
+                            issues.append(Issue('error', offset, f'card opens inside card {card.deal_id} (merged cards)', deal_id))
+                        if deal_id in seen_ids:
+                            issues.append(Issue('error', offset, f'duplicate data-deal-id (also used by card {seen_ids[deal_id]})', deal_id))
+                        seen_ids.setdefault(deal_id, cards_seen)
+                        if card is not None:
+                            issues.extend(check_card(card))
+                        card = _CardChecks(deal_id, offset, len(stack))
+                elif card is not None:
+                    if tag == 'h3':
+                        card.titles += 1
+                    elif tag == 'button':
+                        card.in_button = True
+
+                if tag in RAW_TEXT_END:
+                    # Skip script/style bodies; '<' in them is not markup
+                    end = RAW_TEXT_END[tag].search(content, match.end())
+                    restart = end.start() if end else length
+                    break
+                continue
+
+            # End tag
+            if card is not None and tag == 'button':
+                card.in_button = False
+            if tag in VOID_TAGS:
+                continue
+            if not any(entry[0] == tag for entry in stack):
+                issues.append(Issue('error', offset, f'stray </{tag}> with no open <{tag}>', card.deal_id if card else ''))
+                continue
+            while stack[-1][0] != tag:
+                open_tag, open_offset, _ = stack.pop()
+                if open_tag not in OPTIONAL_END_TAGS:
+                    unclosed(open_tag, open_offset)
+            stack.pop()
+
+            if card is not None and len(stack) < card.depth:
+                issues.extend(check_card(card))
+                card = None
+
+        if restart is None:
+            break
+        pos = restart
+
+    if card is not None:
+        issues.extend(check_card(card))
+    for open_tag, open_offset, _ in stack:
+        if open_tag not in OPTIONAL_END_TAGS:
+            unclosed(open_tag, open_offset)
+
+    issues.sort(key=lambda issue: issue.offset)
+    add_line_numbers(content, issues)
+    return issues
+
+
+def add_line_numbers(content: str, issues: list):
+    """Fill in 1-based line/column for each issue."""
+    if not issues:
+        return
+    line_starts = [0]
+    find = content.find
+    pos = find('\n')
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = find('\n', pos + 1)
+    for issue in issues:
+        line = bisect.bisect_right(line_starts, issue.offset)
+        issue.line = line
+        issue.column = issue.offset - line_starts[line - 1] + 1
+
+
+def main():
+    pages = sys.argv[1:] or [DEALS_FILE]
+    failed = False
+
+    for page in pages:
+        with open(page, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        start = time.perf_counter()
+        issues = validate(content)
+        elapsed = time.perf_counter() - start
+
+        errors = sum(1 for issue in issues if issue.severity == 'error')
+        warnings = len(issues) - errors
+        failed = failed or errors > 0
+
+        print(f"🔍 {page}: {errors} errors, {warnings} warnings ({elapsed * 1000:.1f} ms)")
+        for issue in issues:
+            icon = '❌' if issue.severity == 'error' else '⚠️ '
+            card = f" [card {issue.deal_id}]" if issue.deal_id else ''
+            print(f"  {icon} {page}:{issue.line}:{issue.column}{card} {issue.message}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()